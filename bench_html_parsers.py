@@ -0,0 +1,54 @@
+"""Parse throughput of each HTML backend over the saved category pages
+
+Parses every debug_page_source_*.html file with each available backend and
+reports pages per second, then re-reads the corpus through HtmlParser to
+show what the per-run parse cache saves.
+
+    python bench_html_parsers.py [--repeat 3]
+"""
+import argparse
+import glob
+import time
+
+from watts_html import HtmlParser, available_backends, parse_html
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--pattern', default='debug_page_source_*.html')
+    args = parser.parse_args()
+
+    pages = []
+    for path in sorted(glob.glob(args.pattern)):
+        with open(path, encoding='utf-8', errors='replace') as f:
+            pages.append((path, f.read()))
+    if not pages:
+        raise SystemExit(f"No pages match {args.pattern}")
+    size_mb = sum(len(html) for _, html in pages) / (1024 * 1024)
+    print(f"{len(pages)} pages, {size_mb:.1f} MB, best of {args.repeat}")
+
+    for backend in available_backends():
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for _, html in pages:
+                parse_html(html, backend)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"{backend:12s} {len(pages) / best:7.1f} pages/s  {size_mb / best:6.1f} MB/s")
+
+    # Each page read twice, as scrape_category used to do for subcategories
+    cache = HtmlParser(max_entries=len(pages))
+    start = time.perf_counter()
+    for _ in range(2):
+        for path, html in pages:
+            cache.parse(html, url=path)
+    elapsed = time.perf_counter() - start
+    summary = cache.summary()
+    print(f"{'cached x2':12s} {2 * len(pages) / elapsed:7.1f} pages/s  "
+          f"({summary['parses']} parses, {summary['cache_hits']} cache hits, backend {summary['backend']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Micro-benchmark: product code extraction over the saved category pages
+
+Compares the four-scan extraction get_product_links used to do with the
+single-walk ProductCodeExtractor on every debug_page_source_*.html file.
+
+    python bench_product_codes.py [--repeat 5] [--parser html.parser]
+"""
+import argparse
+import glob
+import re
+import statistics
+import time
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from watts_product_codes import ProductCodeExtractor
+
+BASE_URL = "https://www.watts.com"
+
+
+def legacy_extract(soup, base_url=BASE_URL):
+    """The previous get_product_links extraction, kept for comparison"""
+    all_links = soup.find_all('a', href=True)
+    product_links = []
+
+    product_containers = soup.find_all(['div', 'article'], attrs={
+        'class': lambda x: x and any(term in str(x).lower() for term in ['product', 'item', 'card', 'tile']),
+        'data-product-id': True
+    })
+    product_containers.extend(soup.find_all(attrs={
+        'data-product-id': True,
+        'data-model-number': True,
+        'data-item-number': True
+    }))
+    for container in product_containers:
+        model_match = None
+        for attr in ['data-model-number', 'data-product-id', 'data-item-number', 'id']:
+            if container.has_attr(attr):
+                model_match = re.search(r'(?:GRD|RD|FD|DS|FS|CO|TD)-\d+[A-Z]?', container[attr], re.IGNORECASE)
+                if model_match:
+                    break
+        if not model_match:
+            model_match = container.find(text=re.compile(r'(?:GRD|RD|FD|DS|FS|CO|TD)-\d+[A-Z]?', re.IGNORECASE))
+        if model_match:
+            model = re.search(r'(?:GRD|RD|FD|DS|FS|CO|TD)-\d+[A-Z]?', str(model_match), re.IGNORECASE).group(0)
+            link = container.find('a', href=lambda x: x and '/products/' in x)
+            if link:
+                product_url = urljoin(base_url, link['href'])
+                if (product_url, model.upper()) not in product_links:
+                    product_links.append((product_url, model.upper()))
+
+    for link in all_links:
+        href = link['href']
+        if '/products/' in href and '/drainage-solutions/' in href:
+            model_match = re.search(r'(?:GRD|RD|FD|DS|FS|CO|TD)-\d+[A-Z]?', href, re.IGNORECASE)
+            if model_match:
+                model = model_match.group(0)
+                product_url = urljoin(base_url, href)
+                if (product_url, model.upper()) not in product_links:
+                    product_links.append((product_url, model.upper()))
+
+    for script in soup.find_all('script', type='application/json'):
+        if script.string:
+            for model in re.findall(r'(?:GRD|RD|FD|DS|FS|CO|TD)-\d+[A-Z]?', script.string, re.IGNORECASE):
+                product_url = f"{base_url}/products/drainage-solutions/{model.lower()}"
+                if (product_url, model.upper()) not in product_links:
+                    product_links.append((product_url, model.upper()))
+
+    for model in re.findall(r'(?:GRD|RD|FD|DS|FS|CO|TD)-\d+[A-Z]?', soup.get_text(), re.IGNORECASE):
+        product_url = f"{base_url}/products/drainage-solutions/{model.lower()}"
+        if (product_url, model.upper()) not in product_links:
+            product_links.append((product_url, model.upper()))
+
+    return product_links
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--parser', default='html.parser')
+    parser.add_argument('--pattern', default='debug_page_source_*.html')
+    args = parser.parse_args()
+
+    extractor = ProductCodeExtractor(BASE_URL)
+    paths = sorted(glob.glob(args.pattern))
+    if not paths:
+        raise SystemExit(f"No pages match {args.pattern}")
+
+    parse_times, legacy_times, new_times = [], [], []
+    mismatches = 0
+    for path in paths:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            html = f.read()
+        parse_time, soup = best_of(lambda: BeautifulSoup(html, args.parser), args.repeat)
+        legacy_time, legacy = best_of(lambda: legacy_extract(soup), args.repeat)
+        new_time, hits = best_of(lambda: extractor.extract(soup), args.repeat)
+        parse_times.append(parse_time)
+        legacy_times.append(legacy_time)
+        new_times.append(new_time)
+        if {code for _, code in legacy} != {hit.product_code for hit in hits}:
+            mismatches += 1
+            print(f"  model sets differ: {path}")
+
+    def ms(values):
+        return f"mean {statistics.mean(values) * 1000:7.2f} ms  median {statistics.median(values) * 1000:7.2f} ms"
+
+    print(f"{len(paths)} pages, parser={args.parser}, best of {args.repeat}")
+    print(f"parse            {ms(parse_times)}")
+    print(f"extract (before) {ms(legacy_times)}")
+    print(f"extract (after)  {ms(new_times)}")
+    before = statistics.mean(p + e for p, e in zip(parse_times, legacy_times))
+    after = statistics.mean(p + e for p, e in zip(parse_times, new_times))
+    print(f"per page total   before {before * 1000:.2f} ms, after {after * 1000:.2f} ms "
+          f"({before / after:.2f}x)")
+    print(f"pages whose model sets differ: {mismatches}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""Offline end-to-end benchmark of WattsSpecScraper.run() on the saved pages
+
+Serves the debug_*.html snapshots and the fixture PDF from a local replay
+server, drives the scraper with ReplayDrivers instead of Chrome, and reports
+pages/sec, PDFs/sec, the scraper's p50/p95 span latency per stage and peak RSS.
+
+    python bench_replay.py [--category 0] [--workers 1] [--download-workers 4] [--json report.json]
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+import psutil
+
+from watts_replay import ReplayCorpus, ReplayServer, build_replay_scraper
+
+
+class PeakRss:
+    """Samples this process's resident memory in the background"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name='rss-sampler', daemon=True)
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._process.memory_info().rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self._process.memory_info().rss)
+
+
+def run_benchmark(category=0, workers=1, download_workers=4, rate=200.0, root='.'):
+    """Replay one (or every) category and return the report as a dict"""
+    corpus = ReplayCorpus(root)
+
+    with ReplayServer(corpus) as server, tempfile.TemporaryDirectory() as tmp:
+        output_dir = os.path.join(tmp, 'watts_specs')
+        scraper = build_replay_scraper(server, output_dir, rate=rate, workers=workers,
+                                       download_workers=download_workers)
+        try:
+            with PeakRss() as rss:
+                start = time.perf_counter()
+                scraper.run(category_index=category)
+                duration = time.perf_counter() - start
+        finally:
+            scraper.__del__()
+        pdfs = len(glob.glob(os.path.join(output_dir, '**', '*.pdf'), recursive=True))
+
+    pages = corpus.served['browser_page'] + corpus.served['page']
+    return {
+        'category': category,
+        'workers': workers,
+        'download_workers': download_workers,
+        'duration_s': round(duration, 2),
+        'pages': pages,
+        'pages_per_s': round(pages / duration, 2),
+        'pdfs': pdfs,
+        'pdfs_per_s': round(pdfs / duration, 2),
+        'peak_rss_mb': round(rss.peak / (1024 * 1024), 1),
+        'served': dict(corpus.served),
+        'stages': scraper.metrics.report()['spans'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--category', type=int, default=0,
+                        help="category index to replay (-1 replays every category)")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--download-workers', type=int, default=4)
+    parser.add_argument('--rate', type=float, default=200.0,
+                        help="requests per second allowed by the rate limiter")
+    parser.add_argument('--json', help="also write the report to this file")
+    args = parser.parse_args()
+
+    # Claim the root logger first so the scraper does not open a log file
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s - %(message)s')
+
+    report = run_benchmark(
+        category=None if args.category < 0 else args.category,
+        workers=args.workers,
+        download_workers=args.download_workers,
+        rate=args.rate,
+    )
+
+    print(f"duration   {report['duration_s']:.2f} s")
+    print(f"pages      {report['pages']:5d}  {report['pages_per_s']:.2f} pages/s")
+    print(f"pdfs       {report['pdfs']:5d}  {report['pdfs_per_s']:.2f} PDFs/s")
+    print(f"peak RSS   {report['peak_rss_mb']:.1f} MB")
+    for stage, stats in report['stages'].items():
+        print(f"{stage:16s} n={stats['count']:4d}  p50 {stats['p50_ms']:9.1f} ms  p95 {stats['p95_ms']:9.1f} ms")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
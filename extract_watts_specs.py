@@ -0,0 +1,53 @@
+"""Extract suffix/option attributes from every downloaded spec sheet
+
+Runs over watts_specs/ in a process pool (all cores by default), caching
+each result by the PDF's SHA-256 under watts_specs/.extract so only new or
+changed sheets are parsed again.  Writes one JSON line per PDF, and the
+flattened attribute rows as Parquet when pyarrow is installed.
+
+    python extract_watts_specs.py [--specs-dir watts_specs] [--jsonl out.jsonl] [--parquet out.parquet]
+"""
+import argparse
+import importlib.util
+import logging
+import time
+
+from watts_logging import setup_logging
+from watts_pdf_extract import SpecExtractor, write_jsonl, write_parquet
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--specs-dir', default='watts_specs')
+    parser.add_argument('--jsonl', default='watts_spec_attributes.jsonl')
+    parser.add_argument('--parquet', help="also write attribute rows to this Parquet file (needs pyarrow)")
+    parser.add_argument('--workers', type=int, help="worker processes (default: one per core)")
+    parser.add_argument('--with-pages', action='store_true',
+                        help="include per-page text and layout in the JSONL output")
+    parser.add_argument('--no-cache', action='store_true', help="re-extract every sheet")
+    parser.add_argument('--log-level', default="INFO",
+                        help="root log level plus per-module overrides, e.g. INFO,watts_pdf_extract=DEBUG")
+    parser.add_argument('--log-file', default="watts_extract.log",
+                        help="JSON-lines log file, rotated and gzipped as it grows")
+    args = parser.parse_args()
+
+    if args.parquet and importlib.util.find_spec('pyarrow') is None:
+        parser.error("--parquet needs pyarrow (pip install pyarrow)")
+
+    setup_logging(log_file=args.log_file, levels=args.log_level)
+
+    start = time.perf_counter()
+    extractor = SpecExtractor(args.specs_dir, workers=args.workers, use_cache=not args.no_cache)
+    records = extractor.run()
+    write_jsonl(records, args.jsonl, with_pages=args.with_pages)
+    if args.parquet:
+        write_parquet(records, args.parquet)
+
+    summary = extractor.summary()
+    attributes = sum(len(record['attributes']) for record in records)
+    logging.info(f"{len(records)} PDFs, {attributes} attributes in {time.perf_counter() - start:.2f} s "
+                 f"({summary['extracted']} extracted, {summary['cached']} cached, {summary['failed']} failed)")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,46 +1,106 @@
 import os
-import requests
-from bs4 import BeautifulSoup
 import time
 from urllib.parse import urljoin, quote
 import re
 import logging
-from datetime import datetime
+import threading
 import json
-from typing import Optional, List, Tuple
-import PyPDF2
-from io import BytesIO
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
+from typing import Callable, Optional, List, Tuple, Dict
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from watts_driver_pool import DriverPool
+from watts_blob_store import BlobStore
+from watts_browser_lifecycle import ManagedBrowser, is_browser_crash
+from watts_spec_links import find_spec_sheet_link
+from watts_crawl_state import CrawlState
+from watts_download_pipeline import DownloadPipeline
+from watts_rate_limiter import AdaptiveRateLimiter
+from watts_transport import HttpTransport
+from watts_session_bridge import SessionBridge
+from watts_readiness import PageReadiness, enable_performance_log
+from watts_browser_profile import LeanProfile, NetworkStats
+from watts_product_codes import ProductCodeExtractor, CONTAINER_TERMS, INTERCEPTOR_CONTAINER_TERMS
+from watts_html import HtmlParser
+from watts_logging import dump_page, setup_logging
+from watts_metrics import RunMetrics, report_paths
+from watts_pdf_check import NotPdfError, PdfCheckError, PdfStructureChecker, check_bytes, check_file
+from watts_resume import ResumableDownload
+from watts_catalog import CatalogDiff, feed_path
+from watts_scheduler import TaskGroup, WorkStealingScheduler
+from watts_frontier import Frontier
+from watts_listing_api import ListingApiClient, ListingApiError
+from watts_checkpoint import RunCheckpoint
+from watts_job_queue import JobQueue, worker_name
+
+# Elements that mean the category grid or product page has rendered
+PRODUCT_GRID_SELECTOR = ".grid-item, .product-tile, .product-card, [data-product-id]"
+SPEC_SECTION_XPATH = "//button[contains(text(), 'Specifications')] | //a[contains(@class, 'product-download__link')]"
+DOWNLOAD_LINK_XPATH = "//a[contains(@class, 'product-download__link')]"
+COOKIE_ACCEPT_ID = "onetrust-accept-btn-handler"
+
+class CategoryCrawl:
+    """One category's progress through the crawl task graph"""
+    
+    def __init__(self, name: str, directory: str, frontier: Frontier):
+        self.name = name
+        self.directory = directory
+        self.found = {}  # product URL -> (URL, code, description) from all its listing pages
+        self.frontier = frontier  # listing pages still to load, within the page budget
+        self.loading = 0  # listing pages queued or loading
+        self.results = {}  # product URL -> spec sheet fetched
+        self.total = 0
+        self.lock = threading.Lock()
 
 class WattsSpecScraper:
-    def __init__(self):
-        """Initialize the scraper"""
-        self.session = requests.Session()
-        self.base_url = "https://www.watts.com"
+    def __init__(self, workers: int = 1, max_concurrency: Optional[int] = None,
+                 refresh_after: float = 24 * 3600, recrawl_after: float = 7 * 24 * 3600,
+                 download_workers: int = 0, lean: bool = True,
+                 category_profiles: Optional[Dict[str, Optional[LeanProfile]]] = None,
+                 max_pages_per_browser: int = 200, max_browser_rss_mb: float = 1536,
+                 base_url: str = "https://www.watts.com", driver_factory: Optional[Callable] = None,
+                 openmetrics: bool = False, log_levels: str = "INFO",
+                 log_file: Optional[str] = "watts_scraper.log", dump_pages: bool = False,
+                 verify_pdfs: bool = False, catalog_diff: bool = True,
+                 max_listing_pages: int = 20, max_listing_depth: int = 2, listing_api: bool = True,
+                 session_max_age: float = 12 * 3600, checkpoint_interval: float = 30,
+                 max_attempts: int = 3, retry_backoff: float = 60, job_lease: float = 300):
+        """Initialize the scraper
+
+        Options mirror the command-line flags (see --help) and the classes
+        that implement each feature.  category_profiles overrides the lean
+        profile per category name (None turns blocking off); base_url and
+        driver_factory point the scraper at another site and browser, e.g.
+        the offline replay server and ReplayDriver.
+        """
+        self.base_url = base_url.rstrip('/')
+        self.driver_factory = driver_factory or self._create_driver
         self.logger = logging.getLogger(__name__)
         
-        # Set up headers to mimic a browser
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Referer': 'https://www.watts.com/',
-            'Origin': 'https://www.watts.com'
-        })
+        # Lean browser profile: what Chrome skips loading, optionally per category
+        self.lean_profile = LeanProfile() if lean else None
+        self.category_profiles = category_profiles or {}
+        self._category_local = threading.local()
+        self._applied_profiles = {}
+        self.network_stats = NetworkStats()
+        
+        # Per-stage span timings, tagged by category and product
+        self.metrics = RunMetrics()
+        self.openmetrics = openmetrics
+        
+        # Parsed pages, reused while their content is unchanged
+        self.html_parser = HtmlParser(metrics=self.metrics)
+        
+        # Browser lifecycle: warm sessions recycled by page count and memory
+        self.max_pages_per_browser = max_pages_per_browser
+        self.max_browser_rss_mb = max_browser_rss_mb
         
         # Initialize Selenium
         self._init_selenium()
         
-        # Initialize session
-        self._init_session()
-        
         # Updated URLs to match the website structure
         self.drainage_categories = [
             ("Floor & Area Drains", "drainage-solutions/floor-drains-channels-trench/floor-area-drains"),
@@ -53,77 +113,292 @@ class WattsSpecScraper:
         ]
         self.output_dir = "watts_specs"
         
-        # Setup logging with more detailed format
-        logging.basicConfig(
-            level=logging.DEBUG,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(f'watts_scraper_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
-                logging.StreamHandler()
-            ]
+        # Queued, rotated JSON-lines logging; page dumps only on request
+        setup_logging(log_file=log_file, levels=log_levels)
+        self.dump_pages = dump_pages
+        
+        # Adaptive rate limiting shared by the browser, the session and downloads
+        self.min_delay = 0.5  # fastest pace once responses stay healthy
+        self.max_delay = 15  # slowest pace after repeated backoffs
+        self.rate_limiter = AdaptiveRateLimiter(
+            min_delay=self.min_delay,
+            max_delay=self.max_delay,
+            initial_delay=3
         )
         
-        # Configure retry strategy
-        retry_strategy = Retry(
-            total=3,  # number of retries
-            backoff_factor=1,  # wait 1, 2, 4 seconds between retries
-            status_forcelist=[429, 500, 502, 503, 504]  # HTTP status codes to retry on
+        # One pooled keep-alive HTTP client for pages, API calls and downloads,
+        # paced by the rate limiter and retrying 429/5xx 1, 2 and 4 seconds apart
+        self.transport = HttpTransport(
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.9',
+                'Referer': f'{self.base_url}/',
+                'Origin': self.base_url
+            },
+            max_connections=max(1, workers) + 1,  # every worker thread plus the main one
+            rate_limiter=self.rate_limiter
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("https://", adapter)
-        self.session.mount("http://", adapter)
+        self.session = self.transport.client
         
         # Track failed downloads for retry
         self.failed_downloads = []
         
-        # Adaptive rate limiting
-        self.min_delay = 3  # minimum delay in seconds
-        self.max_delay = 15  # maximum delay in seconds
-        self.current_delay = self.min_delay
+        # Product model numbers found on category pages
+        self.code_extractor = ProductCodeExtractor(self.base_url)
+        
+        # Condition-based waits instead of fixed sleeps
+        self.readiness = PageReadiness(event_sink=self.network_stats.observe, metrics=self.metrics)
+        
+        # Concurrent product crawling
+        self.workers = max(1, workers)
+        self.max_concurrency = max_concurrency
+        self.pool = None
+        
+        # How each product's spec sheet URL was resolved
+        self.resolution_counts = {'static': 0, 'browser': 0, 'not_found': 0}
+        self._stats_lock = threading.Lock()
         
+        # Incremental re-runs
+        self.refresh_after = refresh_after
+        self.recrawl_after = recrawl_after
+        self.state = None
+        self.state_path = os.path.join(self.output_dir, "crawl_state.db")
+        
+        # Background PDF downloads
+        self.download_workers = download_workers
+        self.downloads = None
+        
+        # Content-addressed spec sheet storage, opened by setup_directories
+        self.blobs = None
+        
+        # Optional full PDF parse, off the download path
+        self.pdf_checker = PdfStructureChecker(metrics=self.metrics) if verify_pdfs else None
+        
+        # Listing snapshots and the change feed, opened by run()
+        self.catalog_diff = catalog_diff
+        self.catalog = None
+        
+        # Budgets for each category's subcategory discovery
+        self.max_listing_pages = max_listing_pages
+        self.max_listing_depth = max_listing_depth
+        
+        # Listing pages read from the grid's JSON endpoint, the browser as fallback
+        self.listing_api = ListingApiClient(self.session, self.base_url) if listing_api else None
+        self.listing_counts = {'api': 0, 'browser': 0}
+        
+        # Consent cookies, user agent and token shared by browsers and the
+        # HTTP client, saved between runs; set up when crawling starts
+        self.session_max_age = session_max_age
+        self.session_state_path = os.path.join(self.output_dir, "session_state.json")
+        self.session_bridge = None
+        
+        # Work-queue checkpoints of the run, opened by run()
+        self.checkpoint_interval = checkpoint_interval
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.checkpoint = None
+        
+        # Jobs shared with other scraper processes, opened by run_worker()
+        self.job_lease = job_lease
+        self.job_queue = None
+        self.worker_name = None  # names the worker's report and feed
+        
+    @property
+    def current_delay(self):
+        """Seconds between requests at the rate limiter's current pace"""
+        return self.rate_limiter.current_delay
+    
+    @property
+    def _active_category(self):
+        """Category the calling thread is crawling"""
+        return getattr(self._category_local, 'category', None)
+    
+    @property
+    def _active_profile(self):
+        """Browser profile for the calling thread's category"""
+        return getattr(self._category_local, 'profile', self.lean_profile)
+    
+    def _enter_category(self, category_name: str):
+        """Point the calling thread's page loads at a category and its profile"""
+        self._category_local.category = category_name
+        self._category_local.profile = self.category_profiles.get(category_name, self.lean_profile)
+    
+    @property
+    def current_browser(self):
+        """ManagedBrowser for the calling thread: the pool worker's, else the main one"""
+        pool_browser = self.pool.browser if self.pool else None
+        return pool_browser or self.browser
+    
+    @property
+    def driver(self):
+        """Browser for the calling thread: the pool worker's, else the main one"""
+        return self.current_browser.driver
+    
+    @driver.setter
+    def driver(self, value):
+        self.browser.quit()
+        self.browser = self._managed_browser(driver=value)
+    
+    @property
+    def wait(self):
+        """WebDriverWait matching self.driver"""
+        pool_wait = self.pool.wait if self.pool else None
+        if pool_wait:
+            return pool_wait
+        # Rebuilt when the main browser was recycled or restarted
+        if self._wait_driver is not self.driver:
+            self._wait_driver = self.driver
+            self._wait = WebDriverWait(self.driver, 10)  # 10 second timeout
+        return self._wait
+    
     def _init_selenium(self):
-        """Initialize Selenium WebDriver"""
+        """Set up the main browser; Chrome starts on first use"""
+        self.pool = None
+        self._wait = None
+        self._wait_driver = None
+        self.browser = self._managed_browser()
+    
+    def _managed_browser(self, driver=None):
+        return ManagedBrowser(
+            self.driver_factory,
+            warmup=self._warm_up_browser,
+            max_pages=self.max_pages_per_browser,
+            max_rss_mb=self.max_browser_rss_mb,
+            driver=driver
+        )
+    
+    def _warm_up_browser(self, driver):
+        """Load the home page once per launch and accept the cookie banner
+
+        Once a browser has dealt with the banner, later ones are given its
+        cookies instead of waiting for the banner again.
+        """
+        self._applied_profiles.pop(id(driver), None)
+        self._apply_profile(driver, self._active_profile)
+        self.rate_limiter.acquire()
+        with self.metrics.span('navigation'):
+            driver.get(self.base_url)
+        
+        bridge = self.session_bridge
+        if bridge and bridge.consent:
+            added = bridge.apply_to_browser(driver)
+            self.logger.debug(f"Restored {added} session cookies, skipping the consent banner")
+            return
+        
+        accepted = False
+        with self.metrics.span('cookie_consent'):
+            try:
+                accept = WebDriverWait(driver, 3).until(
+                    EC.element_to_be_clickable((By.ID, COOKIE_ACCEPT_ID))
+                )
+                driver.execute_script("arguments[0].click();", accept)
+                accepted = True
+                self.logger.info("Accepted cookie consent for new browser session")
+            except TimeoutException:
+                self.logger.debug("No cookie consent banner shown")
+        
+        if bridge:
+            # Accepted or never shown, the banner needs no more waiting for
+            bridge.capture_browser(driver, consent=True)
+            bridge.apply_to_client(self.session)
+            bridge.save()
+            self.logger.info(f"Saved browser session ({'consent accepted' if accepted else 'no banner'}) "
+                             f"to {bridge.path}")
+    
+    def _create_driver(self):
+        """Launch a headless Chrome instance"""
         chrome_options = Options()
         chrome_options.add_argument('--headless')  # Run in headless mode
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
         chrome_options.add_argument('--disable-gpu')
         chrome_options.add_argument('--window-size=1920,1080')
+        enable_performance_log(chrome_options)
+        if self.lean_profile:
+            self.lean_profile.apply_options(chrome_options)
         
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.wait = WebDriverWait(self.driver, 10)  # 10 second timeout
+        return webdriver.Chrome(options=chrome_options)
+    
+    def _apply_profile(self, driver, profile):
+        """Switch a browser's URL blocking to profile (None clears it)"""
+        if id(driver) in self._applied_profiles and self._applied_profiles[id(driver)] is profile:
+            return
+        try:
+            if profile:
+                profile.apply(driver)
+            else:
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+        except Exception as e:
+            self.logger.debug(f"Could not apply browser profile: {str(e)}")
+        self._applied_profiles[id(driver)] = profile
+    
+    def _load_page(self, url):
+        """Navigate the calling thread's browser, paced by the shared rate limiter
+
+        Recycles the browser first when it is over its page or memory budget,
+        and relaunches it once if it crashed since the last page.
+        """
+        browser = self.current_browser
+        browser.before_navigation()
+        profile = self._active_profile
+        self._apply_profile(self.driver, profile)
+        self.rate_limiter.acquire()
+        self.readiness.discard_events(self.driver)
+        self.network_stats.start_page(self.driver, url, self._active_category, lean=profile is not None)
+        start = time.monotonic()
+        with self.metrics.span('navigation'):
+            try:
+                self.driver.get(url)
+            except WebDriverException as e:
+                if not is_browser_crash(e):
+                    raise
+                browser.restart(f"crashed before loading {url}")
+                self._apply_profile(self.driver, profile)
+                start = time.monotonic()
+                self.driver.get(url)
+        self.rate_limiter.record(elapsed=time.monotonic() - start)
+    
+    def _get_pool(self):
+        """Create the product-page browser pool on first use"""
+        if self.pool is None:
+            self.pool = DriverPool(
+                self.driver_factory,
+                size=self.workers,
+                max_concurrency=self.max_concurrency,
+                wait_timeout=10,
+                warmup=self._warm_up_browser,
+                max_pages=self.max_pages_per_browser,
+                max_rss_mb=self.max_browser_rss_mb
+            )
+        return self.pool
     
     def _init_session(self):
-        """Initialize session with necessary cookies and tokens"""
+        """Initialize session with necessary cookies and tokens, reusing a saved one"""
+        if self.session_bridge is not None:
+            return
+        bridge = SessionBridge(self.session_state_path, self.base_url, max_age=self.session_max_age)
+        if bridge.load():
+            bridge.apply_to_client(self.session)
+            self.session_bridge = bridge
+            self.logger.info(f"Reusing session saved {time.time() - bridge.saved_at:.0f}s ago "
+                             f"({len(bridge.cookies)} cookies)")
+            return
+        
         try:
             # First visit the main page to get initial cookies
-            self.session.verify = False  # Disable SSL verification
-            self.session.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Sec-Fetch-Dest': 'document',
-                'Sec-Fetch-Mode': 'navigate',
-                'Sec-Fetch-Site': 'none',
-                'Sec-Fetch-User': '?1',
-                'Cache-Control': 'max-age=0'
-            })
-            
             response = self.session.get(self.base_url)
             response.raise_for_status()
             
             # Parse the page for any necessary tokens
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = self.html_parser.parse(response.text, url=self.base_url)
             
             # Look for anti-forgery token
             token_elem = soup.find('input', {'name': '__RequestVerificationToken'})
-            if token_elem:
-                self.session.headers.update({
-                    'RequestVerificationToken': token_elem.get('value', '')
-                })
+            bridge.capture_client(self.session, token=token_elem.get('value', '') if token_elem else None)
+            bridge.apply_to_client(self.session)
+            bridge.save()
+            self.session_bridge = bridge
             
             self.logger.info("Session initialized successfully")
             
@@ -136,10 +411,37 @@ class WattsSpecScraper:
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
             self.logger.info(f"Created main directory: {self.output_dir}")
+        if self.blobs is None or self.blobs.root != self.output_dir:
+            self.blobs = BlobStore(self.output_dir)
+    
+    def _start_downloads(self):
+        """Start the background download pipeline if it is enabled"""
+        if self.download_workers and self.downloads is None:
+            self.downloads = DownloadPipeline(
+                transport=self.transport,
+                workers=self.download_workers,
+                state=self.state,
+                rate_limiter=self.rate_limiter,
+                metrics=self.metrics,
+                blobs=self.blobs
+            ).start()
+    
+    def _finish_downloads(self):
+        """Wait for queued downloads and collect their failures"""
+        if self.downloads is not None:
+            self.downloads.close()
+            self.failed_downloads.extend(self.downloads.failed)
+            self.downloads = None
+    
+    def _init_state(self):
+        """Open the crawl-state database left by earlier runs"""
+        if self.state is None:
+            self.state = CrawlState(self.state_path)
+            self.logger.info(f"Using crawl state from {self.state_path}")
     
     def get_category_url(self, category):
         """Construct the URL for a category page."""
-        base_url = "https://www.watts.com/products"
+        base_url = f"{self.base_url}/products"
         category_mapping = {
             "Floor & Area Drains": "drainage-solutions/floor-drains-channels-trench/floor-area-drains",
             "Roof Drains": "drainage-solutions/roof-drains",
@@ -151,18 +453,75 @@ class WattsSpecScraper:
         }
         return f"{base_url}/{category_mapping.get(category, category.lower().replace(' ', '-'))}"
     
+    def _frontier(self, url):
+        """Listing frontier rooted at a category page, excluding the other categories' pages"""
+        return Frontier(
+            url,
+            max_depth=self.max_listing_depth,
+            max_pages=self.max_listing_pages,
+            exclude=[self.get_category_url(name) for name, _ in self.drainage_categories]
+        )
+    
     def get_product_links(self, url):
-        """Get all product links from a category page using Selenium"""
+        """Get all product links from a category page and its interceptor subcategories"""
+        frontier = self._frontier(url)
+        found = {}
+        page = frontier.pop()
+        while page is not None:
+            page_url, depth = page
+            if depth:
+                self.logger.info(f"Processing interceptors subcategory: {page_url}")
+            product_links, subcategory_urls = self._list_page(page_url)
+            for entry in product_links:
+                found.setdefault(entry[0], entry)
+            for subcategory_url in subcategory_urls:
+                frontier.add(subcategory_url, depth + 1)
+            page = frontier.pop()
+        self.logger.info(f"Listing pages for {url}: {json.dumps(frontier.summary())}")
+        return list(found.values())
+    
+    def _list_page(self, url, fallback: bool = False):
+        """Products listed on one category page, and the subcategory pages to list next
+
+        Tries the listing API first; a page it fails on or finds empty is
+        rendered in the browser.
+        """
+        if self.listing_api is not None:
+            try:
+                with self.metrics.span('listing_api'):
+                    product_links, subcategory_links = self.listing_api.list_page(url)
+                if product_links or subcategory_links:
+                    self._count_listing('api')
+                    return product_links, subcategory_links
+                self.logger.info(f"Listing API found nothing on {url}, loading it in the browser")
+            except ListingApiError as e:
+                self.logger.warning(f"Listing API failed, loading {url} in the browser: {str(e)}")
+        
+        self._count_listing('browser')
+        return self._list_page_browser(url, fallback=fallback)
+    
+    def _count_listing(self, path):
+        """Record whether a listing page was read from the API or the browser"""
+        with self._stats_lock:
+            self.listing_counts[path] += 1
+    
+    def _list_page_browser(self, url, fallback: bool = False):
+        """Products listed on one category page as rendered by the browser
+
+        Subcategories are the interceptor subcategory links; with fallback,
+        a page without any products or those offers every drainage-solutions
+        link on it instead.
+        """
         try:
             self.logger.info(f"Loading page: {url}")
-            self.driver.get(url)
+            self._load_page(url)
             
-            # Wait longer for dynamic content to load
-            time.sleep(15)  # Increased wait time
+            # Wait for the product grid's XHRs to settle
+            self.readiness.network_idle(self.driver, timeout=15, max_inflight=2, replaces=15)
             
             # Wait for specific product elements
             try:
-                self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".product-grid, .product-list, .product-tile, .product-card, [data-product-id]")))
+                self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, f".product-grid, .product-list, {PRODUCT_GRID_SELECTOR}")))
             except TimeoutException:
                 self.logger.warning("Product grid not found, trying alternative selectors")
                 try:
@@ -172,60 +531,32 @@ class WattsSpecScraper:
             
             # Execute JavaScript to ensure all dynamic content is loaded
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)  # Wait for any lazy-loaded content
+            self.readiness.stable_count(self.driver, PRODUCT_GRID_SELECTOR, timeout=2, settle=0.5, replaces=2)
             
             # Get the page source after JavaScript has rendered
             page_source = self.driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
+            soup = self.html_parser.parse(page_source, url=url)
             
             # Log all links for debugging
             all_links = soup.find_all('a', href=True)
             self.logger.debug(f"Found {len(all_links)} total links on the page")
             
-            product_links = []
+            # Containers, product URLs, JSON scripts and page text in one walk
+            interceptors = "interceptors" in url.lower()
+            with self.metrics.span('link_extraction'):
+                hits = self.code_extractor.extract(
+                    soup,
+                    container_terms=INTERCEPTOR_CONTAINER_TERMS if interceptors else CONTAINER_TERMS
+                )
+            found = {}
+            for hit in hits:
+                found[hit.product_url] = (hit.product_url, hit.product_code, hit.description)
+                self.logger.info(f"Found product from {hit.method}: {hit.model} at {hit.product_url}")
             
             # Special handling for interceptors category
-            if "interceptors" in url.lower():
-                # Look for product cards in the interceptors grid
-                product_containers = soup.find_all(['div', 'article'], attrs={
-                    'class': lambda x: x and any(term in str(x).lower() for term in ['product', 'item', 'card', 'tile', 'grid-item']),
-                    'data-product-id': True
-                })
-                
-                # Also look for elements with data attributes
-                product_containers.extend(soup.find_all(attrs={
-                    'data-product-id': True,
-                    'data-model-number': True,
-                    'data-item-number': True
-                }))
-                
-                for container in product_containers:
-                    # Look for model numbers in various attributes
-                    model_attrs = ['data-model-number', 'data-product-id', 'data-item-number', 'id']
-                    model_match = None
-                    
-                    for attr in model_attrs:
-                        if container.has_attr(attr):
-                            model_match = re.search(r'(?:GRD|RD|FD|DS|FS|CO|TD)-\d+[A-Z]?', container[attr], re.IGNORECASE)
-                            if model_match:
-                                break
-                    
-                    if not model_match:
-                        # Try finding model number in text content
-                        model_match = container.find(text=re.compile(r'(?:GRD|RD|FD|DS|FS|CO|TD)-\d+[A-Z]?', re.IGNORECASE))
-                    
-                    if model_match:
-                        model = re.search(r'(?:GRD|RD|FD|DS|FS|CO|TD)-\d+[A-Z]?', str(model_match), re.IGNORECASE).group(0)
-                        # Find the product link
-                        link = container.find('a', href=lambda x: x and '/products/' in x)
-                        if link:
-                            product_url = urljoin(self.base_url, link['href'])
-                            if (product_url, model.upper()) not in product_links:
-                                product_links.append((product_url, model.upper()))
-                                self.logger.info(f"Found product from container: {model} at {product_url}")
-                
+            subcategory_links = []
+            if interceptors:
                 # Look for subcategory links in interceptors
-                subcategory_links = []
                 for link in all_links:
                     href = link['href']
                     if '/products/drainage-solutions/floor-drains-channels-trench/interceptors/' in href:
@@ -233,104 +564,35 @@ class WattsSpecScraper:
                         if subcategory_url not in subcategory_links:
                             subcategory_links.append(subcategory_url)
                             self.logger.info(f"Found interceptors subcategory: {subcategory_url}")
-                
-                # Process each subcategory
-                for subcategory_url in subcategory_links:
-                    self.logger.info(f"Processing interceptors subcategory: {subcategory_url}")
-                    subcategory_products = self.get_product_links(subcategory_url)
-                    product_links.extend(subcategory_products)
             
-            # Regular product link detection for other categories
-            else:
-                # Method 1: Look for product cards/containers with data attributes
-                product_containers = soup.find_all(['div', 'article'], attrs={
-                    'class': lambda x: x and any(term in str(x).lower() for term in ['product', 'item', 'card', 'tile']),
-                    'data-product-id': True
-                })
-                
-                # Also look for elements with data attributes
-                product_containers.extend(soup.find_all(attrs={
-                    'data-product-id': True,
-                    'data-model-number': True,
-                    'data-item-number': True
-                }))
-                
-                for container in product_containers:
-                    # Look for model numbers in various attributes
-                    model_attrs = ['data-model-number', 'data-product-id', 'data-item-number', 'id']
-                    model_match = None
-                    
-                    for attr in model_attrs:
-                        if container.has_attr(attr):
-                            model_match = re.search(r'(?:GRD|RD|FD|DS|FS|CO|TD)-\d+[A-Z]?', container[attr], re.IGNORECASE)
-                            if model_match:
-                                break
-                    
-                    if not model_match:
-                        # Try finding model number in text content
-                        model_match = container.find(text=re.compile(r'(?:GRD|RD|FD|DS|FS|CO|TD)-\d+[A-Z]?', re.IGNORECASE))
-                    
-                    if model_match:
-                        model = re.search(r'(?:GRD|RD|FD|DS|FS|CO|TD)-\d+[A-Z]?', str(model_match), re.IGNORECASE).group(0)
-                        # Find the product link
-                        link = container.find('a', href=lambda x: x and '/products/' in x)
-                        if link:
-                            product_url = urljoin(self.base_url, link['href'])
-                            if (product_url, model.upper()) not in product_links:
-                                product_links.append((product_url, model.upper()))
-                                self.logger.info(f"Found product from container: {model} at {product_url}")
-            
-            # Method 2: Look for links containing product model numbers
-            for link in all_links:
-                href = link['href']
-                if '/products/' in href and '/drainage-solutions/' in href:
-                    # Check for model numbers in the URL
-                    model_match = re.search(r'(?:GRD|RD|FD|DS|FS|CO|TD)-\d+[A-Z]?', href, re.IGNORECASE)
-                    if model_match:
-                        model = model_match.group(0)
-                        product_url = urljoin(self.base_url, href)
-                        if (product_url, model.upper()) not in product_links:
-                            product_links.append((product_url, model.upper()))
-                            self.logger.info(f"Found product from URL: {model} at {product_url}")
-            
-            # Method 3: Look for product model numbers in scripts
-            scripts = soup.find_all('script', type='application/json')
-            for script in scripts:
-                if script.string:
-                    model_matches = re.findall(r'(?:GRD|RD|FD|DS|FS|CO|TD)-\d+[A-Z]?', script.string, re.IGNORECASE)
-                    for model in model_matches:
-                        product_url = f"{self.base_url}/products/drainage-solutions/{model.lower()}"
-                        if (product_url, model.upper()) not in product_links:
-                            product_links.append((product_url, model.upper()))
-                            self.logger.info(f"Found product from script: {model} at {product_url}")
-            
-            # Method 4: Look for product model numbers in any text content
-            text_content = soup.get_text()
-            model_matches = re.findall(r'(?:GRD|RD|FD|DS|FS|CO|TD)-\d+[A-Z]?', text_content, re.IGNORECASE)
-            for model in model_matches:
-                # Construct potential product URL
-                product_url = f"{self.base_url}/products/drainage-solutions/{model.lower()}"
-                if (product_url, model.upper()) not in product_links:
-                    product_links.append((product_url, model.upper()))
-                    self.logger.info(f"Found product from content: {model} at {product_url}")
+            product_links = list(found.values())
             
             if not product_links:
                 self.logger.warning(f"No product links found for category: {url}")
-                # Save the page source to a file for debugging
-                debug_file = f"debug_page_source_{int(time.time())}.html"
-                with open(debug_file, 'w', encoding='utf-8') as f:
-                    f.write(page_source)
-                self.logger.info(f"Saved page source to {debug_file} for debugging")
+                if self.dump_pages:
+                    debug_file = dump_page(page_source, "debug_page_source")
+                    self.logger.info(f"Saved page source to {debug_file} for debugging")
             else:
                 self.logger.info(f"Found {len(product_links)} unique product links")
             
-            return product_links
+            # Look for subcategories when the page lists nothing itself
+            if fallback and not product_links and not subcategory_links:
+                self.logger.info("No product links found, looking for subcategories...")
+                for link in all_links:
+                    href = link['href']
+                    subcategory_url = urljoin(self.base_url, href)
+                    if '/products/drainage-solutions/' in href and subcategory_url != url:
+                        if subcategory_url not in subcategory_links:
+                            subcategory_links.append(subcategory_url)
+                            self.logger.info(f"Found subcategory: {subcategory_url}")
+            
+            return product_links, subcategory_links
             
         except Exception as e:
             self.logger.error(f"Error getting product links from {url}: {str(e)}")
             import traceback
             self.logger.error(f"Traceback: {traceback.format_exc()}")
-            return []
+            return [], []
     
     def _is_valid_product_url(self, url):
         """Check if a URL is a valid product URL"""
@@ -368,17 +630,60 @@ class WattsSpecScraper:
         return any(re.search(pattern, url_lower) for pattern in product_patterns)
     
     def get_spec_sheet_url(self, product_url):
+        """Get the specification sheet URL, trying the static HTML before the browser"""
+        with self.metrics.span('spec_resolution'):
+            spec_url = self._get_spec_sheet_url_static(product_url)
+            if spec_url:
+                self._count_resolution('static')
+                return spec_url
+            
+            spec_url = self._get_spec_sheet_url_browser(product_url)
+            self._count_resolution('browser' if spec_url else 'not_found')
+            return spec_url
+    
+    def _count_resolution(self, path):
+        """Record which path resolved (or failed to resolve) a spec sheet"""
+        with self._stats_lock:
+            self.resolution_counts[path] += 1
+    
+    def _is_pdf_url(self, spec_url):
+        """Check with a HEAD request that a URL serves a PDF"""
+        try:
+            response = self.session.head(spec_url, timeout=5)
+            if response.status_code == 200:
+                content_type = response.headers.get('content-type', '').lower()
+                if 'pdf' in content_type or 'octet-stream' in content_type:
+                    return True
+                self.logger.debug(f"URL {spec_url} is not a PDF: {content_type}")
+        except Exception as e:
+            self.logger.debug(f"Error checking spec URL {spec_url}: {str(e)}")
+        return False
+    
+    def _get_spec_sheet_url_static(self, product_url):
+        """Find the spec sheet link in the server-rendered product page without a browser"""
+        try:
+            response = self.session.get(product_url, timeout=15)
+            response.raise_for_status()
+        except Exception as e:
+            self.logger.debug(f"Static fetch failed for {product_url}: {str(e)}")
+            return None
+        
+        spec_url = find_spec_sheet_link(self.html_parser.parse(response.text, url=product_url), self.base_url)
+        if spec_url and self._is_pdf_url(spec_url):
+            self.logger.info(f"Found spec sheet URL in static HTML: {spec_url}")
+            return spec_url
+        
+        self.logger.debug(f"No spec sheet link in static HTML for {product_url}, falling back to browser")
+        return None
+    
+    def _get_spec_sheet_url_browser(self, product_url):
         """Get the specification sheet URL for a product by expanding the Specifications section"""
         try:
             self.logger.info(f"Getting spec sheet URL for {product_url}")
             
             # Load the product page
-            self.driver.get(product_url)
-            time.sleep(5)  # Wait for page to load
-            
-            # Log the page source for debugging
-            self.logger.debug(f"Page source for {product_url}:")
-            self.logger.debug(self.driver.page_source)
+            self._load_page(product_url)
+            self.readiness.present(self.driver, SPEC_SECTION_XPATH, timeout=5, replaces=5)
             
             # Find and click the Specifications expand button
             try:
@@ -411,7 +716,7 @@ class WattsSpecScraper:
                 if expand_button:
                     # Click the expand button
                     self.driver.execute_script("arguments[0].click();", expand_button)
-                    time.sleep(2)  # Wait for content to expand
+                    self.readiness.present(self.driver, DOWNLOAD_LINK_XPATH, timeout=2, replaces=2)
                     
                     # Look for the specification sheet link with more specific selectors
                     spec_link_selectors = [
@@ -447,17 +752,9 @@ class WattsSpecScraper:
                                 spec_url = urljoin(self.base_url, spec_url)
                             
                             # Verify it's a PDF
-                            try:
-                                response = self.session.head(spec_url, timeout=5)
-                                if response.status_code == 200:
-                                    content_type = response.headers.get('content-type', '').lower()
-                                    if 'pdf' in content_type or 'octet-stream' in content_type:
-                                        self.logger.info(f"Found valid spec sheet URL: {spec_url}")
-                                        return spec_url
-                                    else:
-                                        self.logger.debug(f"URL {spec_url} is not a PDF: {content_type}")
-                            except Exception as e:
-                                self.logger.debug(f"Error checking spec URL {spec_url}: {str(e)}")
+                            if self._is_pdf_url(spec_url):
+                                self.logger.info(f"Found valid spec sheet URL: {spec_url}")
+                                return spec_url
                     else:
                         self.logger.warning("Could not find specification sheet link after expanding section")
                 else:
@@ -468,169 +765,734 @@ class WattsSpecScraper:
                 import traceback
                 self.logger.error(f"Traceback: {traceback.format_exc()}")
             
-            # Save the page source to a file for debugging
-            debug_file = f"debug_product_page_{int(time.time())}.html"
-            with open(debug_file, 'w', encoding='utf-8') as f:
-                f.write(self.driver.page_source)
-            self.logger.info(f"Saved page source to {debug_file} for debugging")
+            if self.dump_pages:
+                debug_file = dump_page(self.driver.page_source, "debug_product_page")
+                self.logger.info(f"Saved page source to {debug_file} for debugging")
             
             return None
             
         except Exception as e:
+            # The page never loaded: an error to retry, unlike a page without a spec sheet
             self.logger.error(f"Error getting spec sheet URL for {product_url}: {str(e)}")
-            import traceback
-            self.logger.error(f"Traceback: {traceback.format_exc()}")
-            return None
+            raise
     
     def verify_pdf(self, content: bytes) -> bool:
-        """Verify if content is a valid PDF"""
-        try:
-            # Try to read PDF content
-            PyPDF2.PdfReader(BytesIO(content))
-            return True
-        except:
-            return False
+        """Verify if content is a complete PDF (header, startxref and %%EOF)"""
+        with self.metrics.span('pdf_verify'):
+            try:
+                check_bytes(content)
+                return True
+            except PdfCheckError:
+                return False
             
     def download_pdf(self, url, output_path):
         """Download a PDF file with retry logic"""
-        max_retries = 3
-        retry_delay = 2
-        
-        for attempt in range(max_retries):
-            try:
-                response = self.session.get(url, stream=True)
-                response.raise_for_status()
-                
-                # Verify it's a PDF
-                content_type = response.headers.get('content-type', '').lower()
-                if 'pdf' not in content_type:
-                    self.logger.warning(f"URL {url} returned non-PDF content: {content_type}")
-                    return False
-                
-                # Create directory if it doesn't exist
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                
-                # Download the file
-                with open(output_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-                
-                self.logger.info(f"Successfully downloaded {url} to {output_path}")
-                return True
+        with self.metrics.span('download'):
+            max_retries = 3
+            retry_delay = 2
+            
+            for attempt in range(max_retries):
+                try:
+                    # Stream into the URL's .part file, resuming what an earlier
+                    # attempt left; verified content is committed to the blob store
+                    with ResumableDownload(self.blobs, url, self.state) as download:
+                        # Resume an interrupted download, else revalidate a stored copy
+                        headers = download.request_headers()
+                        if not headers and self.state and os.path.exists(output_path):
+                            headers = self.state.conditional_headers(url, output_path)
+                        
+                        with self.session.stream('GET', url, headers=headers, timeout=60) as response:
+                            if response.status_code == 304:
+                                self.state.touch_document(url)
+                                self.logger.info(f"Not modified since last run: {url}")
+                                return True
+                            download.begin(response.status_code, response.headers)
+                            response.raise_for_status()
+                            
+                            # Verify it's a PDF
+                            content_type = response.headers.get('content-type', '').lower()
+                            if 'pdf' not in content_type:
+                                self.logger.warning(f"URL {url} returned non-PDF content: {content_type}")
+                                return False
+                            
+                            if download.resumed_from:
+                                self.logger.info(f"Resuming {url} from byte {download.resumed_from}")
+                            for chunk in response.iter_bytes(chunk_size=65536):
+                                download.feed(chunk)
+                            content_hash = download.finish()
+                    self.blobs.link(content_hash, output_path, url)
+                    
+                    if self.state:
+                        self.state.record_document(
+                            url,
+                            output_path,
+                            response.headers.get('ETag'),
+                            response.headers.get('Last-Modified'),
+                            content_hash
+                        )
+                    
+                    self.logger.info(f"Successfully downloaded {url} to {output_path}")
+                    return True
                 
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    self.logger.warning(f"Attempt {attempt + 1} failed for {url}: {str(e)}")
-                    time.sleep(retry_delay)
-                else:
-                    self.logger.error(f"Failed to download {url} after {max_retries} attempts: {str(e)}")
+                except NotPdfError as e:
+                    self.logger.warning(f"URL {url} did not return a PDF: {str(e)}")
                     return False
+                    
+                except Exception as e:
+                    if attempt < max_retries - 1:
+                        self.logger.warning(f"Attempt {attempt + 1} failed for {url}: {str(e)}")
+                        time.sleep(retry_delay)
+                    else:
+                        self.logger.error(f"Failed to download {url} after {max_retries} attempts: {str(e)}")
+                        return False
     
     def clean_filename(self, filename):
         """Clean filename to be valid"""
         return re.sub(r'[<>:"/\\|?*]', '_', filename)
     
+    def _fetch_spec_sheet(self, spec_url: str, output_path: str, wait: bool = True) -> bool:
+        """Download a spec sheet, or revalidate it if an earlier run stored it
+
+        With the download pipeline running, wait=False only queues the
+        download and returns True straight away.
+        """
+        known = self.state and self.state.get_document(spec_url)
+        if os.path.exists(output_path) and not known:
+            try:
+                check_file(output_path)
+                self.logger.info(f"File already exists: {output_path}")
+                # Adopt it into the blob store so later copies link to it and the manifest lists it
+                self.blobs.put_file(output_path, spec_url)
+                return True
+            except PdfCheckError as e:
+                self.logger.warning(f"Replacing incomplete {output_path}: {str(e)}")
+        
+        # Same document already stored for another listing: link, don't download
+        if known and not os.path.exists(output_path) and self.blobs.has(known['content_hash']):
+            self.blobs.link(known['content_hash'], output_path, spec_url)
+            self.logger.info(f"Linked stored copy of {spec_url} to {output_path}")
+            return True
+        
+        # Any process working on the shared queue may download it; one job per output file,
+        # so products sharing a spec sheet each get their copy
+        if self.job_queue is not None and not wait:
+            path = os.path.relpath(output_path, self.output_dir)
+            if not self.job_queue.put('download', path, self._active_category, {'url': spec_url}):
+                queued = self.job_queue.get('download', path)
+                queued_url = json.loads(queued['payload'] or '{}').get('url')
+                if queued_url != spec_url:
+                    self.logger.warning(f"{path} is already queued from {queued_url}, not {spec_url}")
+                    return False
+            return True
+        
+        if self.downloads is not None:
+            tags = self.metrics.current_tags()
+            self._begin_download(spec_url, output_path)
+            future = self.downloads.submit(spec_url, output_path, tags=tags)
+            future.add_done_callback(lambda done: self._end_download(spec_url, done.result()))
+            if self.pdf_checker:
+                future.add_done_callback(
+                    lambda done: done.result() and self.pdf_checker.submit(output_path, spec_url, tags)
+                )
+            return future.result() if wait else True
+        
+        self._begin_download(spec_url, output_path)
+        success = self.download_pdf(spec_url, output_path)
+        self._end_download(spec_url, success)
+        if success and self.pdf_checker:
+            self.pdf_checker.submit(output_path, spec_url, self.metrics.current_tags())
+        return success
+    
+    def _begin_download(self, spec_url: str, output_path: str):
+        """Checkpoint a download as started"""
+        if self.checkpoint:
+            self.checkpoint.add('download', spec_url, self._active_category, {'output_path': output_path})
+            self.checkpoint.begin('download', spec_url)
+    
+    def _end_download(self, spec_url: str, success: bool):
+        if self.checkpoint:
+            if success:
+                self.checkpoint.done('download', spec_url)
+            else:
+                self.checkpoint.fail('download', spec_url, "Download failed")
+    
+    def _schedule_download_retries(self, scheduler: WorkStealingScheduler):
+        """Queue the downloads a resumed run left unfinished or failed, each once its back-off is over"""
+        for item in self.checkpoint.items('download'):
+            if not self.checkpoint.should_run('download', item['key']) or not item['payload'].get('output_path'):
+                continue
+            scheduler.spawn_after(self.checkpoint.retry_delay('download', item['key']), self._retry_download,
+                                  item['key'], item['category'], item['payload']['output_path'])
+    
+    def _retry_download(self, spec_url: str, category_name: Optional[str], output_path: str) -> bool:
+        """Task: fetch a spec sheet a resumed run still has to download"""
+        self._enter_category(category_name)
+        with self.metrics.tags(category=category_name):
+            return self._fetch_spec_sheet(spec_url, output_path, wait=False)
+    
+    def _output_path(self, category_dir: str, product_url: str) -> str:
+        """Where a product's spec sheet is saved"""
+        return os.path.join(category_dir, f"{self.clean_filename(product_url.split('/')[-1])}.pdf")
+    
+    def _needs_refresh(self, category_dir: str, product_url: str, previous) -> bool:
+        """Whether an unchanged listing entry is still due a visit"""
+        if not self.catalog_diff:
+            return True
+        return (not previous['spec_url']
+                or CrawlState.age(previous) >= self.recrawl_after
+                or not os.path.exists(self._output_path(category_dir, product_url)))
+    
+    def _process_product(self, category_name: str, category_dir: str, product_url: str, product_code: str,
+                         listing_changed: bool = False) -> Optional[bool]:
+        """Resolve and download the spec sheet for one product
+
+        True when the spec sheet was fetched (or queued), None when the
+        product page has none, False when fetching it failed; a product
+        page that cannot be loaded raises.
+        listing_changed (a new or changed catalog entry) always reloads the
+        product page instead of trusting what an earlier run resolved.
+        """
+        product_name = product_url.split('/')[-1]
+        with self.metrics.tags(category=category_name, product=product_name), self.metrics.span('product'):
+            output_path = self._output_path(category_dir, product_url)
+            
+            entry = self.state.get_product(product_url) if self.state and not listing_changed else None
+            age = CrawlState.age(entry)
+            known_spec_url = entry['spec_url'] if entry else None
+            
+            # Nothing to do for products an earlier run finished recently
+            if known_spec_url and age < self.refresh_after and os.path.exists(output_path):
+                self.logger.info(f"Skipping {product_code}: checked {age / 3600:.1f}h ago")
+                return True
+            
+            success = False
+            spec_url = None
+            
+            # Revalidate the stored spec sheet without loading the product page
+            if known_spec_url and age < self.recrawl_after:
+                success = self._fetch_spec_sheet(known_spec_url, output_path)
+                if success:
+                    spec_url = known_spec_url
+                else:
+                    self.logger.info(f"Stored spec URL failed for {product_code}, re-resolving")
+            
+            if not success:
+                spec_url = self.get_spec_sheet_url(product_url)
+                if spec_url:
+                    success = self._fetch_spec_sheet(spec_url, output_path, wait=False)
+                else:
+                    success = None
+            
+            if self.state:
+                self.state.record_product(category_name, product_url, product_code, spec_url)
+            
+            return success
+    
     def scrape_category(self, category_name: str, category_slug: str):
-        """Scrape a single category with enhanced error handling"""
+        """Scrape a single category, set up and reported like run()"""
+        self._run([(category_name, category_slug)])
+    
+    def _crawl_categories(self, categories: List[Tuple[str, str]], retry_downloads: bool = False):
+        """Crawl categories as one task graph on the worker browsers
+
+        Every category, subcategory and product page is a task; workers
+        steal from each other, so a small category never waits behind a
+        big one and Interceptors' subcategories spread over every browser.
+        retry_downloads adds a resumed run's unfinished downloads.
+        """
+        if self.workers > 1:
+            pool = self._get_pool()
+            scheduler = WorkStealingScheduler(self.workers, worker_init=pool.attach, worker_exit=pool.detach,
+                                              execute=pool.call, name="crawl-worker")
+            self.logger.info(f"Crawling {len(categories)} categories on {self.workers} browsers")
+        else:
+            scheduler = WorkStealingScheduler(1, execute=self.browser.run)
+        
+        for category_name, category_slug in categories:
+            self._schedule_category(scheduler, category_name)
+        if retry_downloads:
+            self._schedule_download_retries(scheduler)
+        scheduler.run()
+        self.logger.info(f"Crawl scheduler: {json.dumps(scheduler.summary())}")
+    
+    def _schedule_category(self, scheduler: WorkStealingScheduler, category_name: str):
+        """Queue a category's listing pages; its products follow once all are listed"""
         self.logger.info(f"\nStarting to scrape category: {category_name}")
         category_dir = os.path.join(self.output_dir, self.clean_filename(category_name))
         if not os.path.exists(category_dir):
             os.makedirs(category_dir)
             self.logger.info(f"Created category directory: {category_dir}")
         
-        category_url = self.get_category_url(category_name)
-        product_links = self.get_product_links(category_url)
-        
-        # If no product links found, try to find subcategories
+        crawl = CategoryCrawl(category_name, category_dir, self._frontier(self.get_category_url(category_name)))
+        if self.checkpoint:
+            category = self.checkpoint.add('category', category_name)
+            self.checkpoint.begin('category', category_name)
+            # Listed before the run was interrupted: only its products are left
+            if category['payload'].get('listed'):
+                self._resume_products(scheduler, crawl)
+                return
+        listing = TaskGroup(scheduler, on_done=lambda: self._schedule_products(scheduler, crawl))
+        self._queue_listings(listing, crawl)
+    
+    def _queue_listings(self, listing: TaskGroup, crawl: 'CategoryCrawl'):
+        """Hand the best pages left in the frontier to the workers, one per worker at most
+
+        Holding the rest back until a page finishes lets links it finds
+        outrank them before they use up the budget.
+        """
+        with crawl.lock:
+            while crawl.loading < self.workers:
+                page = crawl.frontier.pop()
+                if page is None:
+                    break
+                url, depth = page
+                crawl.loading += 1
+                if depth:
+                    self.logger.info(f"Queueing subcategory of {crawl.name}: {url}")
+                listing.spawn(self._crawl_listing, listing, crawl, url, depth)
+    
+    def _crawl_listing(self, listing: TaskGroup, crawl: 'CategoryCrawl', url: str, depth: int):
+        """Task: list one category or subcategory page and queue its subcategories"""
+        self._enter_category(crawl.name)
+        try:
+            with self.metrics.tags(category=crawl.name):
+                product_links, subcategory_urls = self._list_page(url, fallback=not depth)
+            with crawl.lock:
+                for entry in product_links:
+                    crawl.found.setdefault(entry[0], entry)
+            for subcategory_url in subcategory_urls:
+                crawl.frontier.add(subcategory_url, depth + 1)
+        finally:
+            with crawl.lock:
+                crawl.loading -= 1
+            self._queue_listings(listing, crawl)
+        return True
+    
+    def _schedule_products(self, scheduler: WorkStealingScheduler, crawl: 'CategoryCrawl'):
+        """Queue the products of a fully listed category"""
+        self.logger.info(f"Listing pages for {crawl.name}: {json.dumps(crawl.frontier.summary())}")
+        # Only visit what changed since the last crawl, or is due a refresh
+        product_links = self.catalog.compare(
+            crawl.name, list(crawl.found.values()),
+            refresh=lambda product_url, previous: self._needs_refresh(crawl.directory, product_url, previous)
+        )
+        self._queue_products(scheduler, crawl, [(product_url, product_code, self.catalog.changed(product_url))
+                                                for product_url, product_code, description in product_links])
+    
+    def _resume_products(self, scheduler: WorkStealingScheduler, crawl: 'CategoryCrawl'):
+        """Queue the products a resumed run still has to visit, without listing the category again"""
+        product_links = [(item['key'], item['payload'].get('code'), item['payload'].get('changed', False))
+                         for item in self.checkpoint.items('product', crawl.name)
+                         if self.checkpoint.should_run('product', item['key'])]
+        self.logger.info(f"Resuming {crawl.name}: {len(product_links)} products left")
+        self._queue_products(scheduler, crawl, product_links)
+    
+    def _queue_products(self, scheduler: WorkStealingScheduler, crawl: 'CategoryCrawl', product_links: List[Tuple[str, str, bool]]):
+        """Queue (URL, code, listing changed) products, checkpointed before any runs, or as queue jobs"""
+        if self.job_queue is not None:
+            queued = sum(self.job_queue.put('product', product_url, crawl.name,
+                                            {'code': product_code, 'changed': listing_changed})
+                         for product_url, product_code, listing_changed in product_links)
+            self.logger.info(f"Queued {queued} of {len(product_links)} products of {crawl.name} as jobs")
+            return
+        if self.checkpoint:
+            for product_url, product_code, listing_changed in product_links:
+                self.checkpoint.add('product', product_url, crawl.name, {'code': product_code, 'changed': listing_changed})
+            self.checkpoint.add('category', crawl.name, payload={'listed': True})
+            self.checkpoint.flush()
+        crawl.total = len(product_links)
         if not product_links:
-            self.logger.info("No product links found, looking for subcategories...")
-            self.driver.get(category_url)
-            time.sleep(3)
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
-            
-            # Look for subcategory links
-            subcategory_links = []
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                if '/products/drainage-solutions/' in href and href != category_url:
-                    subcategory_url = urljoin(self.base_url, href)
-                    if subcategory_url not in subcategory_links:
-                        subcategory_links.append(subcategory_url)
-                        self.logger.info(f"Found subcategory: {subcategory_url}")
-            
-            # Try each subcategory
-            for subcategory_url in subcategory_links:
-                self.logger.info(f"Trying subcategory: {subcategory_url}")
-                subcategory_products = self.get_product_links(subcategory_url)
-                if subcategory_products:
-                    product_links.extend(subcategory_products)
-        
-        successful_downloads = 0
-        total_products = len(product_links)
+            self._log_category_done(crawl)
+            return
+        products = TaskGroup(scheduler, on_done=lambda: self._log_category_done(crawl))
+        for product_url, product_code, listing_changed in product_links:
+            # Failures of a resumed run wait out their back-off while other products run
+            delay = self.checkpoint.retry_delay('product', product_url) if self.checkpoint else 0
+            products.spawn_after(delay, self._crawl_product, crawl, product_url, product_code, listing_changed)
+    
+    def _crawl_product(self, crawl: 'CategoryCrawl', product_url: str, product_code: str,
+                       listing_changed: bool) -> Optional[bool]:
+        """Task: resolve and fetch one product's spec sheet, with _process_product()'s outcome"""
+        self._enter_category(crawl.name)
+        if not self.checkpoint:
+            success = self._process_product(crawl.name, crawl.directory, product_url, product_code, listing_changed)
+        else:
+            self.checkpoint.begin('product', product_url)
+            try:
+                success = self._process_product(crawl.name, crawl.directory, product_url, product_code, listing_changed)
+            except Exception as e:
+                self.checkpoint.fail('product', product_url, str(e))
+                raise
+            # A product without a spec sheet is finished, not failed
+            if success is False:
+                self.checkpoint.fail('product', product_url, "Spec sheet download failed")
+            else:
+                self.checkpoint.done('product', product_url)
+        with crawl.lock:
+            crawl.results[product_url] = success
+        return success
+    
+    def _log_category_done(self, crawl: 'CategoryCrawl'):
+        if self.checkpoint:
+            self.checkpoint.done('category', crawl.name)
+            self.checkpoint.flush()
+        successful_downloads = sum(1 for result in crawl.results.values() if result)
+        if self.downloads is not None:
+            self.logger.info(f"Category {crawl.name} discovery complete. "
+                          f"Queued or refreshed {successful_downloads}/{crawl.total} specs.")
+        else:
+            self.logger.info(f"Category {crawl.name} complete. "
+                          f"Successfully downloaded {successful_downloads}/{crawl.total} specs.")
+
+    def _open_checkpoint(self, resume: bool) -> bool:
+        """Start checkpointing a new run, or reopen the last one's; True when resuming"""
+        options = dict(interval=self.checkpoint_interval, max_attempts=self.max_attempts, backoff=self.retry_backoff)
+        if resume:
+            self.checkpoint = RunCheckpoint.resume(self.state, **options)
+            if self.checkpoint:
+                self.logger.info(f"Resuming run {self.checkpoint.run_id}: "
+                                 f"{json.dumps(self.checkpoint.summary()['items'])}")
+                return True
+            self.logger.info("The last run left nothing to resume; starting a new run")
+        self.checkpoint = RunCheckpoint.start(self.state, self.metrics.started, **options)
+        return False
+    
+    def _left_to_run(self, category_name: str) -> bool:
+        """Whether a resumed run's category was not finished or has products to retry"""
+        return self.checkpoint.should_run('category', category_name) or any(
+            self.checkpoint.should_run('product', item['key']) for item in self.checkpoint.items('product', category_name)
+        )
+    
+    def run(self, category_index: Optional[int] = None, resume: bool = False):
+        """Run the scraper with enhanced reporting
+
+        resume=True continues the last run from its checkpoint: finished
+        categories and products are skipped, listed categories are not
+        listed again, and failed products and downloads are retried.
+        """
+        self._run(self._select_categories(category_index), resume)
+    
+    def _run(self, categories: List[Tuple[str, str]], resume: bool = False):
+        """Crawl categories with the run's state, checkpoint, catalog diff and report"""
+        self.setup_directories()
+        self._init_state()
+        self._init_session()
+        self.catalog = CatalogDiff(self.state, self.metrics.started)
+        resumed = self._open_checkpoint(resume)
+        start_time = time.time()
+        completed = False
         
-        for i, (product_url, product_code) in enumerate(product_links, 1):
-            self.logger.info(f"Processing product {i}/{total_products}")
-            spec_url = self.get_spec_sheet_url(product_url)
-            
-            if spec_url:
-                product_name = product_url.split('/')[-1]
-                output_path = os.path.join(category_dir, f"{self.clean_filename(product_name)}.pdf")
-                
-                if not os.path.exists(output_path):
-                    if self.download_pdf(spec_url, output_path):
-                        successful_downloads += 1
-                        time.sleep(self.current_delay)
-                else:
-                    self.logger.info(f"File already exists: {output_path}")
-                    successful_downloads += 1
+        try:
+            self._start_downloads()
             
-            time.sleep(self.current_delay)
+            if resumed:
+                categories = [(name, slug) for name, slug in categories if self._left_to_run(name)]
+            self._crawl_categories(categories, retry_downloads=resumed)
+            completed = True
         
-        self.logger.info(f"Category {category_name} complete. "
-                      f"Successfully downloaded {successful_downloads}/{total_products} specs.")
+        finally:
+            self._finish_downloads()
+            if self.pdf_checker:
+                for url, path, error in self.pdf_checker.close():
+                    self.failed_downloads.append((url, path))
+                    self.checkpoint.add('download', url, payload={'output_path': path})
+                    self.checkpoint.fail('download', url, str(error))
+            # A completed run can still be resumed to retry its failures
+            if completed:
+                self.checkpoint.finish()
+            else:
+                self.checkpoint.flush()
+            self.blobs.write_manifests()
+            pruned = self.blobs.prune()
+            self.catalog.finish()
+            self._log_summary(time.time() - start_time, pruned)
     
-    def run(self, category_index: Optional[int] = None):
-        """Run the scraper with enhanced reporting"""
+    def run_worker(self, queue_path: str, category_index: Optional[int] = None):
+        """Work through a job queue shared with other scraper processes until it is drained
+
+        Every worker joins the queue's current run, or starts a new one when
+        the last has finished, and queues the categories to crawl (only the
+        first worker does so in effect); it then leases whatever job is due:
+        listing a category queues its products, resolving a product queues
+        its spec sheet download.  Each job runs in one process at a time, its lease
+        renewed while it runs; jobs of a process that died are retried once
+        their lease expires.  Start one worker per process, on as many
+        processes as the site's rate limit allows; workers > 1 also leases
+        one job per pool browser.
+        """
         self.setup_directories()
+        self._init_state()
+        self._init_session()
+        self.catalog = CatalogDiff(self.state, self.metrics.started)
+        self.checkpoint = None  # the shared queue keeps track of the work instead
+        self.worker_name = worker_name()
+        self.job_queue = JobQueue(queue_path, lease=self.job_lease, max_attempts=self.max_attempts,
+                                  backoff=self.retry_backoff)
         start_time = time.time()
         
         try:
-            if category_index is not None:
-                if 0 <= category_index < len(self.drainage_categories):
-                    category_name, category_slug = self.drainage_categories[category_index]
-                    self.scrape_category(category_name, category_slug)
-                else:
-                    self.logger.error(f"Invalid category index: {category_index}")
-            else:
-                for category_name, category_slug in self.drainage_categories:
-                    self.scrape_category(category_name, category_slug)
-                    time.sleep(self.current_delay * 2)  # Double delay between categories
+            self._start_downloads()
+            if self.job_queue.begin_run():
+                self.logger.info(f"Started job queue run {self.job_queue.run_id}")
+            for category_name, category_slug in self._select_categories(category_index):
+                self.job_queue.put('category', category_name, category_name)
+            if not self.job_queue.outstanding():
+                raise RuntimeError(f"Job queue {queue_path} has nothing left to run in run {self.job_queue.run_id}")
+            self._work_jobs()
         
         finally:
-            # Report summary
-            duration = time.time() - start_time
-            self.logger.info("\nScraping Summary:")
-            self.logger.info(f"Total time: {duration:.2f} seconds")
-            self.logger.info(f"Failed downloads: {len(self.failed_downloads)}")
-            
-            if self.failed_downloads:
-                self.logger.info("\nFailed Downloads:")
-                for url, path in self.failed_downloads:
-                    self.logger.info(f"- {url} -> {path}")
+            self._finish_downloads()
+            if self.pdf_checker:
+                for url, path, error in self.pdf_checker.close():
+                    self.failed_downloads.append((url, path))
+            # Other workers may still be linking blobs, so nothing is pruned here
+            self.blobs.write_manifests()
+            self.catalog.finish()
+            self._log_summary(time.time() - start_time)
+            self.job_queue.close()
+    
+    def _work_jobs(self):
+        """Run a job loop on every worker browser"""
+        if self.workers > 1:
+            pool = self._get_pool()
+            scheduler = WorkStealingScheduler(self.workers, worker_init=pool.attach, worker_exit=pool.detach,
+                                              name="job-worker")
+            execute = pool.call
+        else:
+            scheduler = WorkStealingScheduler(1)
+            execute = self.browser.run
+        for _ in range(self.workers):
+            scheduler.spawn(self._job_loop, execute)
+        scheduler.run()
+    
+    def _job_loop(self, execute: Callable):
+        """Task: lease and run jobs until none are left in the queue, whoever runs them"""
+        queue = self.job_queue
+        while True:
+            job = queue.lease()
+            if job is None:
+                if not queue.outstanding():
+                    return True
+                # Other workers' jobs may still queue more, or fail and be retried
+                time.sleep(queue.poll_interval)
+                continue
+            
+            with queue.keep_alive(job):
+                try:
+                    success = execute(self._run_job, job)
+                except Exception as e:
+                    self.logger.error(f"{job['kind'].capitalize()} job {job['key']} failed: {str(e)}")
+                    queue.fail(job, str(e))
+                    continue
+            # None is a finished job with nothing to fetch, e.g. a product without a spec sheet
+            if success is False:
+                queue.fail(job, f"{job['kind'].capitalize()} job did not succeed")
+            else:
+                queue.complete(job)
+    
+    def _run_job(self, job: Dict) -> Optional[bool]:
+        """Run one leased job on the calling thread's browser
 
+        True when the job succeeded, None when it finished with nothing to
+        fetch (a product without a spec sheet), False when it should be
+        retried; errors propagate.
+        """
+        category_name = job['category']
+        self._enter_category(category_name)
+        if job['kind'] == 'category':
+            # Listed on this browser alone; the products it finds become jobs
+            scheduler = WorkStealingScheduler(1, execute=self.current_browser.run)
+            self._schedule_category(scheduler, category_name)
+            scheduler.run()
+            return True
+        
+        category_dir = os.path.join(self.output_dir, self.clean_filename(category_name))
+        os.makedirs(category_dir, exist_ok=True)
+        if job['kind'] == 'product':
+            return self._process_product(category_name, category_dir, job['key'], job['payload'].get('code'),
+                                         job['payload'].get('changed', False))
+        with self.metrics.tags(category=category_name):
+            return self._fetch_spec_sheet(job['payload']['url'], os.path.join(self.output_dir, job['key']))
+    
+    def _select_categories(self, category_index: Optional[int]) -> List[Tuple[str, str]]:
+        """Every category, or only the one at category_index"""
+        if category_index is None:
+            return self.drainage_categories
+        if 0 <= category_index < len(self.drainage_categories):
+            return [self.drainage_categories[category_index]]
+        self.logger.error(f"Invalid category index: {category_index}")
+        return []
+    
+    def _log_summary(self, duration: float, pruned: int = 0):
+        """Log the run's counters and write its report and change feed"""
+        self.logger.info("\nScraping Summary:")
+        self.logger.info(f"Total time: {duration:.2f} seconds")
+        self.logger.info(f"Failed downloads: {len(self.failed_downloads)}")
+        self.logger.info(f"Spec sheets resolved from static HTML: {self.resolution_counts['static']}")
+        self.logger.info(f"Spec sheets resolved with the browser: {self.resolution_counts['browser']}")
+        self.logger.info(f"Spec sheets not found: {self.resolution_counts['not_found']}")
+        self.logger.info(f"Listing pages read from the API: {self.listing_counts['api']}, "
+                         f"rendered in the browser: {self.listing_counts['browser']}")
+        self.logger.info(f"Rate limiter: {json.dumps(self.rate_limiter.metrics())}")
+        self.logger.info(f"Page readiness: {json.dumps(self.readiness.summary())}")
+        self.logger.info(f"Browser network: {json.dumps(self.network_stats.summary())}")
+        self.logger.info(f"HTML parsing: {json.dumps(self.html_parser.summary())}")
+        self.logger.info(f"Browser lifecycle: {json.dumps(self._browser_summary())}")
+        self.logger.info(f"Blob store: {json.dumps({**self.blobs.summary(), 'pruned': pruned})}")
+        self.logger.info(f"Catalog changes: {json.dumps(self.catalog.summary())}")
+        if self.checkpoint:
+            self.logger.info(f"Checkpoint: {json.dumps(self.checkpoint.summary())}")
+        if self.job_queue:
+            self.logger.info(f"Job queue: {json.dumps(self.job_queue.summary())}")
+        self._write_run_report()
+        self._write_change_feed()
+        
+        if self.failed_downloads:
+            self.logger.info("\nFailed Downloads:")
+            for url, path in self.failed_downloads:
+                self.logger.info(f"- {url} -> {path}")
+
+    def _write_run_report(self):
+        """Save the span timings beside the output directory"""
+        json_path, openmetrics_path = report_paths(self.output_dir, self.metrics.started, self.worker_name)
+        try:
+            self.metrics.write_report(json_path)
+            self.logger.info(f"Run report: {json_path}")
+            if self.openmetrics:
+                self.metrics.write_openmetrics(openmetrics_path)
+                self.logger.info(f"OpenMetrics: {openmetrics_path}")
+        except OSError as e:
+            self.logger.error(f"Could not write run report: {str(e)}")
+    
+    def _write_change_feed(self):
+        """Save the run's added, removed and changed products for the PIM import"""
+        path = feed_path(self.output_dir, self.metrics.started, self.worker_name)
+        try:
+            self.catalog.write_feed(path)
+            self.logger.info(f"Change feed: {path}")
+            # Only now that the changes are in the feed do the listings become the snapshots
+            self.catalog.commit()
+        except OSError as e:
+            self.logger.error(f"Could not write change feed: {str(e)}")
+    
+    def _browser_summary(self):
+        """Launches, recycles and restarts of the main browser and the pool"""
+        summary = {
+            'main': {
+                'launches': self.browser.launches,
+                'recycles': self.browser.recycles,
+                'restarts': self.browser.restarts,
+                'peak_rss_mb': round(self.browser.peak_rss_mb, 1),
+            }
+        }
+        if self.pool:
+            summary['pool'] = self.pool.summary()
+        return summary
+    
     def __del__(self):
         """Clean up Selenium resources"""
-        if hasattr(self, 'driver'):
-            self.driver.quit()
+        if getattr(self, 'pool', None):
+            self.pool.close()
+            self.pool = None
+        if getattr(self, 'browser', None):
+            self.browser.quit()
+        if getattr(self, 'state', None):
+            self.state.close()
+            self.state = None
+        if getattr(self, 'transport', None):
+            self.transport.close()
 
 if __name__ == "__main__":
-    scraper = WattsSpecScraper()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Download Watts drainage spec sheets")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="number of headless browsers crawling category and product pages")
+    parser.add_argument('--max-concurrency', type=int, default=None,
+                        help="maximum browsers loading pages at the same time")
+    parser.add_argument('--category', type=int, default=None,
+                        help="only scrape the category at this index")
+    parser.add_argument('--refresh-hours', type=float, default=24,
+                        help="skip products checked within this many hours")
+    parser.add_argument('--recrawl-days', type=float, default=7,
+                        help="reload product pages checked longer ago than this")
+    parser.add_argument('--download-workers', type=int, default=4,
+                        help="concurrent background PDF downloads (0 downloads inline)")
+    parser.add_argument('--no-lean', action='store_true',
+                        help="let Chrome load images, fonts and third-party scripts")
+    parser.add_argument('--max-pages-per-browser', type=int, default=200,
+                        help="replace each browser after loading this many pages")
+    parser.add_argument('--max-browser-mb', type=float, default=1536,
+                        help="replace a browser whose Chrome processes use more memory than this")
+    parser.add_argument('--openmetrics', action='store_true',
+                        help="also write the run's stage timings in OpenMetrics text format")
+    parser.add_argument('--log-level', default="INFO",
+                        help="root log level plus per-module overrides, e.g. INFO,watts_readiness=DEBUG")
+    parser.add_argument('--log-file', default="watts_scraper.log",
+                        help="JSON-lines log file, rotated and gzipped as it grows")
+    parser.add_argument('--dump-pages', action='store_true',
+                        help="save the page source of pages where no products or spec sheet were found")
+    parser.add_argument('--verify-pdfs', action='store_true',
+                        help="also parse every downloaded PDF in a worker process")
+    parser.add_argument('--full-refresh', action='store_true',
+                        help="visit every listed product, not just those changed since the last run")
+    parser.add_argument('--max-listing-pages', type=int, default=20,
+                        help="most category and subcategory pages to load per category")
+    parser.add_argument('--max-listing-depth', type=int, default=2,
+                        help="follow subcategory links at most this many pages deep")
+    parser.add_argument('--no-listing-api', action='store_true',
+                        help="render every category page in the browser instead of reading the grid's JSON")
+    parser.add_argument('--session-hours', type=float, default=12,
+                        help="reuse the saved cookie consent and session for this long (0 starts a new one)")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue the last run from its checkpoint, retrying only what failed or did not finish")
+    parser.add_argument('--checkpoint-seconds', type=float, default=30,
+                        help="write the run's work queue to the crawl state this often")
+    parser.add_argument('--max-attempts', type=int, default=3,
+                        help="give up on a product or download after this many failed attempts")
+    parser.add_argument('--queue', default=None,
+                        help="work on jobs from this SQLite queue, shared with scraper processes on this host")
+    parser.add_argument('--lease-seconds', type=float, default=300,
+                        help="how long a queued job is held before another process may take it over")
+    args = parser.parse_args()
+    
+    log_file = args.log_file
+    if args.queue and log_file:
+        # Log rotation is not safe across processes: one log file per worker
+        root, ext = os.path.splitext(log_file)
+        log_file = f"{root}_{worker_name()}{ext}"
+    
+    scraper = WattsSpecScraper(
+        workers=args.workers,
+        max_concurrency=args.max_concurrency,
+        refresh_after=args.refresh_hours * 3600,
+        recrawl_after=args.recrawl_days * 24 * 3600,
+        download_workers=args.download_workers,
+        lean=not args.no_lean,
+        max_pages_per_browser=args.max_pages_per_browser,
+        max_browser_rss_mb=args.max_browser_mb,
+        openmetrics=args.openmetrics,
+        log_levels=args.log_level,
+        log_file=log_file,
+        dump_pages=args.dump_pages,
+        verify_pdfs=args.verify_pdfs,
+        catalog_diff=not args.full_refresh,
+        max_listing_pages=args.max_listing_pages,
+        max_listing_depth=args.max_listing_depth,
+        listing_api=not args.no_listing_api,
+        session_max_age=args.session_hours * 3600,
+        checkpoint_interval=args.checkpoint_seconds,
+        max_attempts=args.max_attempts,
+        job_lease=args.lease_seconds
+    )
     
     try:
         # Run the scraper for all categories
         print("\nStarting to scrape all categories...")
-        scraper.run()
+        if args.queue:
+            scraper.run_worker(args.queue, category_index=args.category)
+        else:
+            scraper.run(category_index=args.category, resume=args.resume)
         print("\nScraping completed!")
     
     except Exception as e:
@@ -3,34 +3,64 @@ import time
 from urllib.parse import urljoin
 import re
 import logging
-from datetime import datetime
+import threading
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from bs4 import BeautifulSoup
-import requests
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
+from watts_driver_pool import DriverPool
+from watts_product_codes import ProductCodeExtractor
+from watts_html import HtmlParser
+from watts_logging import dump_page, setup_logging
+from watts_spec_links import find_spec_sheet_link
+from watts_rate_limiter import AdaptiveRateLimiter
+from watts_transport import HttpTransport
+from watts_readiness import PageReadiness, enable_performance_log
+
+# Elements that mean the category grid or product page has rendered
+PRODUCT_GRID_SELECTOR = ".grid-item, .product-tile, .product-card, [data-product-id]"
+SPEC_SECTION_XPATH = "//button[contains(text(), 'Specifications')] | //a[contains(@class, 'product-download__link')]"
+DOWNLOAD_LINK_XPATH = "//a[contains(@class, 'product-download__link')]"
 
 class WattsSpecScraper:
-    def __init__(self):
+    def __init__(self, workers=1, max_concurrency=None, log_levels="INFO", dump_pages=False):
         """Initialize the scraper with web scraping only"""
         self.base_url = "https://www.watts.com"
         self.logger = logging.getLogger(__name__)
         
         # Setup logging
-        logging.basicConfig(
-            level=logging.DEBUG,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(f'watts_scraper_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
-                logging.StreamHandler()
-            ]
+        setup_logging(log_file="watts_scraper.log", levels=log_levels)
+        self.dump_pages = dump_pages
+        
+        # Adaptive rate limiting shared by the browser and the session
+        self.min_delay = 0.5
+        self.max_delay = 15
+        self.rate_limiter = AdaptiveRateLimiter(
+            min_delay=self.min_delay,
+            max_delay=self.max_delay,
+            initial_delay=3
         )
         
+        # Parsed pages, reused while their content is unchanged
+        self.html_parser = HtmlParser()
+        
+        # Product model numbers found on category pages
+        self.code_extractor = ProductCodeExtractor(self.base_url)
+        
+        # Condition-based waits instead of fixed sleeps
+        self.readiness = PageReadiness()
+        
+        # Concurrent product crawling
+        self.workers = max(1, workers)
+        self.max_concurrency = max_concurrency
+        self.pool = None
+        
+        # How each product's spec sheet URL was resolved
+        self.resolution_counts = {'static': 0, 'browser': 0, 'not_found': 0}
+        self._stats_lock = threading.Lock()
+        
         # Initialize Selenium
         self._init_selenium()
         
@@ -50,40 +80,86 @@ class WattsSpecScraper:
         
         self.output_dir = "watts_specs"
         self.failed_downloads = []
-        self.min_delay = 3
-        self.max_delay = 15
-        self.current_delay = self.min_delay
+    
+    @property
+    def current_delay(self):
+        """Seconds between requests at the rate limiter's current pace"""
+        return self.rate_limiter.current_delay
+    
+    @property
+    def driver(self):
+        """Browser for the calling thread: the pool worker's, else the main one"""
+        pool_driver = self.pool.driver if self.pool else None
+        return pool_driver or self._driver
+    
+    @driver.setter
+    def driver(self, value):
+        self._driver = value
+    
+    @property
+    def wait(self):
+        """WebDriverWait matching self.driver"""
+        pool_wait = self.pool.wait if self.pool else None
+        return pool_wait or self._wait
+    
+    @wait.setter
+    def wait(self, value):
+        self._wait = value
     
     def _init_selenium(self):
         """Initialize Selenium WebDriver"""
+        self.driver = self._create_driver()
+        self.wait = WebDriverWait(self.driver, 10)
+        self.logger.info("Selenium WebDriver initialized")
+    
+    def _create_driver(self):
+        """Launch a headless Chrome instance"""
         chrome_options = Options()
         chrome_options.add_argument('--headless')
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
         chrome_options.add_argument('--disable-gpu')
         chrome_options.add_argument('--window-size=1920,1080')
+        enable_performance_log(chrome_options)
         
-        self.driver = webdriver.Chrome(options=chrome_options)
-        self.wait = WebDriverWait(self.driver, 10)
-        self.logger.info("Selenium WebDriver initialized")
+        return webdriver.Chrome(options=chrome_options)
+    
+    def _load_page(self, url):
+        """Navigate the calling thread's browser, paced by the shared rate limiter"""
+        pool_browser = self.pool.browser if self.pool else None
+        if pool_browser:
+            pool_browser.before_navigation()  # recycle pool browsers over budget
+        self.rate_limiter.acquire()
+        self.readiness.discard_events(self.driver)
+        start = time.monotonic()
+        self.driver.get(url)
+        self.rate_limiter.record(elapsed=time.monotonic() - start)
+    
+    def _get_pool(self):
+        """Create the product-page browser pool on first use"""
+        if self.pool is None:
+            self.pool = DriverPool(
+                self._create_driver,
+                size=self.workers,
+                max_concurrency=self.max_concurrency,
+                wait_timeout=10
+            )
+        return self.pool
     
     def _init_session(self):
-        """Initialize session for PDF downloads"""
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504]
+        """Initialize the HTTP client for product pages and PDF downloads"""
+        # Pooled keep-alive client shared by every worker thread, paced by the
+        # rate limiter and retrying 429/5xx 1, 2 and 4 seconds apart
+        self.transport = HttpTransport(
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                'Accept-Language': 'en-US,en;q=0.9'
+            },
+            max_connections=self.workers + 1,  # every worker thread plus the main one
+            rate_limiter=self.rate_limiter
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("https://", adapter)
-        self.session.mount("http://", adapter)
-        
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9'
-        })
+        self.session = self.transport.client
         self.logger.info("Session initialized for PDF downloads")
     
     def setup_directories(self):
@@ -109,51 +185,27 @@ class WattsSpecScraper:
         """Get product links from a category page using Selenium"""
         try:
             self.logger.info(f"Loading page: {url}")
-            self.driver.get(url)
-            time.sleep(5)  # Wait for initial load
+            self._load_page(url)
+            self.readiness.network_idle(self.driver, timeout=5, max_inflight=2, replaces=5)
             
             # Scroll to load all content
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(3)
+            self.readiness.stable_count(self.driver, PRODUCT_GRID_SELECTOR, timeout=3, settle=0.5, replaces=3)
             
-            # Get page source and parse with BeautifulSoup
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            # Get page source and parse it
+            soup = self.html_parser.parse(self.driver.page_source, url=url)
             product_links = []
             
-            # Find product containers
-            product_containers = soup.find_all(['div', 'article'], attrs={
-                'class': lambda x: x and any(term in str(x).lower() for term in ['product', 'item', 'card', 'tile']),
-                'data-product-id': True
-            })
-            
-            for container in product_containers:
-                # Look for model numbers
-                model_match = None
-                for attr in ['data-model-number', 'data-product-id', 'data-item-number', 'id']:
-                    if container.has_attr(attr):
-                        model_match = re.search(r'(?:GRD|RD|FD|DS|FS|CO|TD)-\d+[A-Z]?', container[attr], re.IGNORECASE)
-                        if model_match:
-                            break
-                
-                if not model_match:
-                    model_match = container.find(text=re.compile(r'(?:GRD|RD|FD|DS|FS|CO|TD)-\d+[A-Z]?', re.IGNORECASE))
-                
-                if model_match:
-                    model = re.search(r'(?:GRD|RD|FD|DS|FS|CO|TD)-\d+[A-Z]?', str(model_match), re.IGNORECASE).group(0)
-                    link = container.find('a', href=lambda x: x and '/products/' in x)
-                    if link:
-                        product_url = urljoin(self.base_url, link['href'])
-                        if (product_url, model.upper()) not in product_links:
-                            product_links.append((product_url, model.upper()))
-                            self.logger.info(f"Found product: {model} at {product_url}")
+            # Product cards only; the full scraper also mines URLs, scripts and text
+            for hit in self.code_extractor.extract(soup, methods=('container',)):
+                product_links.append((hit.product_url, hit.product_code))
+                self.logger.info(f"Found product: {hit.product_code} at {hit.product_url}")
             
             if not product_links:
                 self.logger.warning(f"No product links found for category: {url}")
-                # Save page source for debugging
-                debug_file = f"debug_page_source_{int(time.time())}.html"
-                with open(debug_file, 'w', encoding='utf-8') as f:
-                    f.write(self.driver.page_source)
-                self.logger.info(f"Saved page source to {debug_file}")
+                if self.dump_pages:
+                    debug_file = dump_page(self.driver.page_source, "debug_page_source")
+                    self.logger.info(f"Saved page source to {debug_file}")
             
             return product_links
             
@@ -162,11 +214,57 @@ class WattsSpecScraper:
             return []
     
     def get_spec_sheet_url(self, product_url):
+        """Get specification sheet URL, trying the static HTML before Selenium"""
+        spec_url = self._get_spec_sheet_url_static(product_url)
+        if spec_url:
+            self._count_resolution('static')
+            return spec_url
+        
+        spec_url = self._get_spec_sheet_url_browser(product_url)
+        self._count_resolution('browser' if spec_url else 'not_found')
+        return spec_url
+    
+    def _count_resolution(self, path):
+        """Record which path resolved (or failed to resolve) a spec sheet"""
+        with self._stats_lock:
+            self.resolution_counts[path] += 1
+    
+    def _is_pdf_url(self, spec_url):
+        """Check with a HEAD request that a URL serves a PDF"""
+        try:
+            response = self.session.head(spec_url, timeout=5)
+            if response.status_code == 200:
+                content_type = response.headers.get('content-type', '').lower()
+                if 'pdf' in content_type or 'octet-stream' in content_type:
+                    return True
+                self.logger.debug(f"URL {spec_url} is not a PDF: {content_type}")
+        except Exception as e:
+            self.logger.debug(f"Error checking spec URL {spec_url}: {str(e)}")
+        return False
+    
+    def _get_spec_sheet_url_static(self, product_url):
+        """Find the spec sheet link in the server-rendered product page"""
+        try:
+            response = self.session.get(product_url, timeout=15)
+            response.raise_for_status()
+        except Exception as e:
+            self.logger.debug(f"Static fetch failed for {product_url}: {str(e)}")
+            return None
+        
+        spec_url = find_spec_sheet_link(self.html_parser.parse(response.text, url=product_url), self.base_url)
+        if spec_url and self._is_pdf_url(spec_url):
+            self.logger.info(f"Found spec sheet URL in static HTML: {spec_url}")
+            return spec_url
+        
+        self.logger.debug(f"No spec sheet link in static HTML for {product_url}, falling back to browser")
+        return None
+    
+    def _get_spec_sheet_url_browser(self, product_url):
         """Get specification sheet URL using Selenium"""
         try:
             self.logger.info(f"Getting spec sheet URL for {product_url}")
-            self.driver.get(product_url)
-            time.sleep(5)
+            self._load_page(product_url)
+            self.readiness.present(self.driver, SPEC_SECTION_XPATH, timeout=5, replaces=5)
             
             # Try to find and click the Specifications section
             expand_button = None
@@ -186,7 +284,7 @@ class WattsSpecScraper:
             
             if expand_button:
                 self.driver.execute_script("arguments[0].click();", expand_button)
-                time.sleep(2)
+                self.readiness.present(self.driver, DOWNLOAD_LINK_XPATH, timeout=2, replaces=2)
                 
                 # Look for PDF link
                 for selector in [
@@ -218,18 +316,17 @@ class WattsSpecScraper:
     def download_pdf(self, url, output_path):
         """Download a PDF file"""
         try:
-            response = self.session.get(url, stream=True)
-            response.raise_for_status()
-            
-            if 'pdf' not in response.headers.get('content-type', '').lower():
-                self.logger.warning(f"URL {url} returned non-PDF content")
-                return False
-            
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            
-            with open(output_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
+            with self.session.stream('GET', url) as response:
+                response.raise_for_status()
+                
+                if 'pdf' not in response.headers.get('content-type', '').lower():
+                    self.logger.warning(f"URL {url} returned non-PDF content")
+                    return False
+                
+                os.makedirs(os.path.dirname(output_path), exist_ok=True)
+                
+                with open(output_path, 'wb') as f:
+                    for chunk in response.iter_bytes(chunk_size=65536):
                         f.write(chunk)
             
             self.logger.info(f"Successfully downloaded {url} to {output_path}")
@@ -243,6 +340,22 @@ class WattsSpecScraper:
         """Clean filename to be valid"""
         return re.sub(r'[<>:"/\\|?*]', '_', filename)
     
+    def _process_product(self, category_dir, product_url, product_code):
+        """Resolve and download the spec sheet for one product"""
+        success = False
+        spec_url = self.get_spec_sheet_url(product_url)
+        
+        if spec_url:
+            output_path = os.path.join(category_dir, f"{self.clean_filename(product_code)}.pdf")
+            if not os.path.exists(output_path):
+                if self.download_pdf(spec_url, output_path):
+                    success = True
+            else:
+                self.logger.info(f"File already exists: {output_path}")
+                success = True
+        
+        return success
+    
     def scrape_category(self, category_name, category_slug):
         """Scrape a single category"""
         self.logger.info(f"\nStarting to scrape category: {category_name}")
@@ -252,23 +365,21 @@ class WattsSpecScraper:
         category_url = self.get_category_url(category_name)
         product_links = self.get_product_links(category_url)
         
-        successful_downloads = 0
         total_products = len(product_links)
         
-        for i, (product_url, product_code) in enumerate(product_links, 1):
-            self.logger.info(f"Processing product {i}/{total_products}")
-            spec_url = self.get_spec_sheet_url(product_url)
-            
-            if spec_url:
-                output_path = os.path.join(category_dir, f"{self.clean_filename(product_code)}.pdf")
-                if not os.path.exists(output_path):
-                    if self.download_pdf(spec_url, output_path):
-                        successful_downloads += 1
-                else:
-                    self.logger.info(f"File already exists: {output_path}")
-                    successful_downloads += 1
-            
-            time.sleep(self.current_delay)
+        if self.workers > 1 and total_products > 1:
+            self.logger.info(f"Crawling {total_products} products on {self.workers} browsers")
+            results = self._get_pool().map(
+                product_links,
+                lambda product_url, product_code: self._process_product(category_dir, product_url, product_code)
+            )
+        else:
+            results = []
+            for i, (product_url, product_code) in enumerate(product_links, 1):
+                self.logger.info(f"Processing product {i}/{total_products}")
+                results.append(self._process_product(category_dir, product_url, product_code))
+        
+        successful_downloads = sum(1 for result in results if result)
         
         self.logger.info(f"Category {category_name} complete. "
                       f"Successfully downloaded {successful_downloads}/{total_products} specs.")
@@ -281,12 +392,17 @@ class WattsSpecScraper:
         try:
             for category_name, category_slug in self.drainage_categories:
                 self.scrape_category(category_name, category_slug)
-                time.sleep(self.current_delay * 2)
         
         finally:
             duration = time.time() - start_time
             self.logger.info(f"\nScraping completed in {duration:.2f} seconds")
             self.logger.info(f"Failed downloads: {len(self.failed_downloads)}")
+            self.logger.info(f"Spec sheets resolved from static HTML: {self.resolution_counts['static']}")
+            self.logger.info(f"Spec sheets resolved with the browser: {self.resolution_counts['browser']}")
+            self.logger.info(f"Spec sheets not found: {self.resolution_counts['not_found']}")
+            self.logger.info(f"Rate limiter: {self.rate_limiter.metrics()}")
+            self.logger.info(f"Page readiness: {self.readiness.summary()}")
+            self.logger.info(f"HTML parsing: {self.html_parser.summary()}")
             
             if self.failed_downloads:
                 self.logger.info("\nFailed Downloads:")
@@ -295,11 +411,32 @@ class WattsSpecScraper:
     
     def __del__(self):
         """Clean up resources"""
-        if hasattr(self, 'driver'):
-            self.driver.quit()
+        if getattr(self, 'pool', None):
+            self.pool.close()
+            self.pool = None
+        if getattr(self, '_driver', None):
+            self._driver.quit()
+            self._driver = None
+        if getattr(self, 'transport', None):
+            self.transport.close()
+            self.transport = None
 
 if __name__ == "__main__":
-    scraper = WattsSpecScraper()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Download Watts drainage spec sheets")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="number of headless browsers crawling product pages")
+    parser.add_argument('--max-concurrency', type=int, default=None,
+                        help="maximum browsers loading pages at the same time")
+    parser.add_argument('--log-level', default="INFO",
+                        help="root log level plus per-module overrides, e.g. INFO,watts_readiness=DEBUG")
+    parser.add_argument('--dump-pages', action='store_true',
+                        help="save the page source of category pages where no products were found")
+    args = parser.parse_args()
+    
+    scraper = WattsSpecScraper(workers=args.workers, max_concurrency=args.max_concurrency,
+                               log_levels=args.log_level, dump_pages=args.dump_pages)
     
     try:
         print("\nStarting to scrape all categories...")
@@ -3,7 +3,6 @@ import time
 from urllib.parse import urljoin
 import re
 import logging
-from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
@@ -17,6 +16,8 @@ from requests.packages.urllib3.util.retry import Retry
 from selenium.webdriver.support.ui import Select
 import unittest
 from unittest.mock import patch, MagicMock
+from watts_logging import setup_logging
+from watts_replay import ReplayCorpus, ReplayDriver
 
 class WattsSpecScraper:
     def __init__(self):
@@ -25,14 +26,7 @@ class WattsSpecScraper:
         self.logger = logging.getLogger(__name__)
         
         # Setup logging
-        logging.basicConfig(
-            level=logging.DEBUG,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(f'watts_scraper_test_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'),
-                logging.StreamHandler()
-            ]
-        )
+        setup_logging(log_file="watts_scraper_test.log", levels="DEBUG")
         
         # Initialize Selenium
         self._init_selenium()
@@ -430,9 +424,22 @@ class WattsSpecScraper:
             self.driver.quit()
 
 class TestWattsSpecScraper(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Create one scraper shared by every test, replaying saved pages instead of Chrome"""
+        corpus = ReplayCorpus()
+        with patch('selenium.webdriver.Chrome', side_effect=lambda *args, **kwargs: ReplayDriver(corpus)):
+            cls.scraper = WattsSpecScraper()
+        cls.browser = cls.scraper.driver
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Quit the shared browser"""
+        cls.scraper.driver = cls.browser
+        cls.scraper.driver.quit()
+    
     def setUp(self):
         """Set up test environment"""
-        self.scraper = WattsSpecScraper()
         self.test_category = "Floor & Area Drains"
         self.test_url = "https://www.watts.com/products/drainage-solutions/floor-drains-channels-trench/floor-area-drains"
         
@@ -442,15 +449,17 @@ class TestWattsSpecScraper(unittest.TestCase):
             os.makedirs(self.test_output_dir)
     
     def tearDown(self):
-        """Clean up after tests"""
-        if hasattr(self, 'scraper') and hasattr(self.scraper, 'driver'):
-            self.scraper.driver.quit()
+        """Put the shared browser back if a test swapped in a mock"""
+        self.scraper.driver = self.browser
     
     def test_cookie_consent(self):
         """Test cookie consent handling"""
         # Mock the driver and cookie button
         self.scraper.driver = MagicMock()
         mock_button = MagicMock()
+        # element_to_be_clickable compares these with True, which a bare MagicMock never equals
+        mock_button.is_displayed.return_value = True
+        mock_button.is_enabled.return_value = True
         self.scraper.driver.find_element.return_value = mock_button
         
         # Test successful cookie consent
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from watts_blob_store import BLOB_DIR, COPIES_MARKER, BlobStore, MANIFEST_NAME
+
+PDF_BYTES = b"%PDF-1.4\n% Watts spec sheet\n%%EOF\n"
+
+
+class TestBlobStore(unittest.TestCase):
+    def setUp(self):
+        """Open a blob store in a temporary output directory"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = BlobStore(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def store_pdf(self, content, output_path, url=None):
+        with self.store.writer() as blob:
+            blob.write(content[:10])
+            blob.write(content[10:])
+            digest = blob.commit()
+        self.store.link(digest, output_path, url)
+        return digest
+
+    def test_duplicates_share_one_blob(self):
+        """Test the same PDF in two categories is stored once and hard-linked twice"""
+        roof = os.path.join(self.tmp.name, "Roof Drains", "rd-100.pdf")
+        floor = os.path.join(self.tmp.name, "Floor & Area Drains", "rd-100.pdf")
+        digest = self.store_pdf(PDF_BYTES, roof)
+        self.assertEqual(self.store_pdf(PDF_BYTES, floor), digest)
+
+        self.assertEqual(digest, hashlib.sha256(PDF_BYTES).hexdigest())
+        self.assertTrue(os.path.samefile(roof, floor))
+        self.assertEqual(os.stat(self.store.blob_path(digest)).st_nlink, 3)
+        self.assertEqual(self.store.summary(),
+                         {'stored': 1, 'duplicates': 1, 'bytes_saved': len(PDF_BYTES), 'copies': 0})
+        self.assertEqual(os.listdir(self.store.tmp_dir), [])
+
+    def test_failed_write_leaves_nothing(self):
+        """Test an aborted download removes its scratch file"""
+        with self.assertRaises(IOError):
+            with self.store.writer() as blob:
+                blob.write(PDF_BYTES)
+                raise IOError("connection reset")
+        self.assertEqual(os.listdir(self.store.tmp_dir), [])
+
+    def test_manifests_per_directory(self):
+        """Test each category folder gets a manifest of its files"""
+        path = os.path.join(self.tmp.name, "Roof Drains", "rd-100.pdf")
+        digest = self.store_pdf(PDF_BYTES, path, url="https://www.watts.com/rd-100-pdf")
+        self.store.write_manifests()
+
+        with open(os.path.join(self.tmp.name, "Roof Drains", MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+        self.assertEqual(manifest, {'rd-100.pdf': {'sha256': digest, 'size': len(PDF_BYTES),
+                                                   'url': "https://www.watts.com/rd-100-pdf"}})
+
+        reopened = BlobStore(self.tmp.name)
+        reopened.put_file(os.path.join(self.tmp.name, "Roof Drains", "rd-100.pdf"))
+        reopened.write_manifests()
+        with open(os.path.join(self.tmp.name, "Roof Drains", MANIFEST_NAME)) as f:
+            self.assertEqual(json.load(f)['rd-100.pdf']['sha256'], digest)
+
+    def test_prune_replaced_blobs(self):
+        """Test a blob no file links to any more is pruned"""
+        path = os.path.join(self.tmp.name, "Cleanouts", "co-100.pdf")
+        old = self.store_pdf(PDF_BYTES, path)
+        new = self.store_pdf(PDF_BYTES.replace(b"Watts", b"WATTS"), path)
+        self.assertEqual(self.store.prune(), 1)
+        self.assertFalse(self.store.has(old))
+        self.assertTrue(self.store.has(new))
+
+    def test_blobs_copied_out_by_an_earlier_run_are_kept(self):
+        """Test a later run does not prune blobs whose files an earlier run had to copy"""
+        path = os.path.join(self.tmp.name, "Cleanouts", "co-100.pdf")
+        with patch('os.link', side_effect=OSError("Invalid cross-device link")):
+            digest = self.store_pdf(PDF_BYTES, path)
+        self.store.write_manifests()
+
+        later = BlobStore(self.tmp.name)
+        self.assertEqual(later.prune(), 0)
+        self.assertTrue(later.has(digest))
+
+        # Without the marker the manifest still shows the file is a copy
+        os.remove(os.path.join(self.tmp.name, BLOB_DIR, COPIES_MARKER))
+        self.assertEqual(BlobStore(self.tmp.name).prune(), 0)
+        self.assertTrue(later.has(digest))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import unittest
+from unittest.mock import MagicMock, PropertyMock
+
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
+
+from watts_browser_lifecycle import ManagedBrowser, is_browser_crash
+from watts_driver_pool import DriverPool
+
+
+class TestManagedBrowser(unittest.TestCase):
+    def setUp(self):
+        """Set up a managed browser backed by mock drivers"""
+        self.launched = []
+        self.warmed = []
+
+        def factory():
+            driver = MagicMock()
+            driver.service.process.pid = os.getpid()
+            self.launched.append(driver)
+            return driver
+
+        self.browser = ManagedBrowser(factory, warmup=self.warmed.append, max_pages=3, check_every=1)
+
+    def test_launch_is_lazy_and_warm(self):
+        """Test Chrome starts on first use and is warmed once per launch"""
+        self.assertEqual(self.launched, [])
+        driver = self.browser.driver
+        self.assertIs(self.browser.driver, driver)
+        self.assertEqual(self.warmed, [driver])
+
+    def test_recycle_after_max_pages(self):
+        """Test the browser is replaced before the page past its budget"""
+        self.browser.driver
+        for _ in range(4):
+            self.browser.before_navigation()
+        self.assertEqual(len(self.launched), 2)
+        self.launched[0].quit.assert_called_once()
+        self.assertEqual(self.browser.recycles, 1)
+        self.assertEqual(self.browser.pages, 1)
+
+    def test_recycle_over_memory_ceiling(self):
+        """Test a process tree above max_rss_mb is recycled"""
+        self.browser.max_pages = 100
+        self.browser.max_rss_mb = 1
+        self.browser.driver
+        self.browser.before_navigation()
+        self.browser.before_navigation()
+        self.assertEqual(self.browser.recycles, 1)
+        self.assertGreater(self.browser.peak_rss_mb, 1)
+
+    def test_crash_retries_same_item(self):
+        """Test a crashed browser is restarted and the item retried"""
+        calls = []
+
+        def handler(code):
+            calls.append(code)
+            if len(calls) == 1:
+                raise InvalidSessionIdException("invalid session id")
+            return code
+
+        self.browser.driver
+        self.assertEqual(self.browser.run(handler, "FD-100"), "FD-100")
+        self.assertEqual(calls, ["FD-100", "FD-100"])
+        self.assertEqual(self.browser.restarts, 1)
+
+    def test_dead_browser_after_swallowed_error(self):
+        """Test a falsy result from a dead browser counts as a crash"""
+        self.browser.driver
+        type(self.launched[0]).current_url = PropertyMock(side_effect=WebDriverException("disconnected"))
+        results = iter([False, True])
+        self.assertTrue(self.browser.run(lambda: next(results)))
+        self.assertEqual(self.browser.restarts, 1)
+
+    def test_other_errors_are_not_crashes(self):
+        """Test ordinary WebDriver errors are raised, not retried"""
+        self.assertTrue(is_browser_crash(WebDriverException("chrome not reachable")))
+        self.assertFalse(is_browser_crash(WebDriverException("element not interactable")))
+        with self.assertRaises(WebDriverException):
+            self.browser.run(MagicMock(side_effect=WebDriverException("element not interactable")))
+
+
+class TestPoolLifecycle(unittest.TestCase):
+    def test_pool_restarts_crashed_worker_browser(self):
+        """Test a pool item survives its browser crashing"""
+        crashed = []
+
+        def handler(url, code):
+            if code == "FD-2" and not crashed:
+                crashed.append(code)
+                raise WebDriverException("session deleted because of page crash")
+            return code
+
+        pool = DriverPool(MagicMock, size=2, max_pages=50)
+        results = pool.map([(str(n), f"FD-{n}") for n in range(5)], handler)
+        summary = pool.summary()
+        pool.close()
+        self.assertEqual(results, [f"FD-{n}" for n in range(5)])
+        self.assertEqual(summary['restarts'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from unittest.mock import MagicMock
+
+from watts_browser_profile import LeanProfile, NetworkStats
+
+
+class TestLeanProfile(unittest.TestCase):
+    def test_blocks_tracking_and_fonts(self):
+        """Test the default profile blocks analytics hosts and web fonts"""
+        patterns = LeanProfile().url_patterns()
+        self.assertIn("*://assets.adobedtm.com/*", patterns)
+        self.assertIn("*://fast.fonts.net/*", patterns)
+        self.assertIn("*.woff2", patterns)
+        self.assertNotIn("*://ajax.googleapis.com/*", patterns)
+
+    def test_allowed_hosts_are_never_blocked(self):
+        """Test allow-listed hosts are dropped from the block list"""
+        profile = LeanProfile(allowed_hosts=["geolocation.onetrust.com"])
+        self.assertNotIn("*://geolocation.onetrust.com/*", profile.url_patterns())
+
+    def test_images_are_blocked_per_category(self):
+        """Test images, including extension-less /dfsmedia/ renditions, are blocked by URL, not at launch"""
+        options = MagicMock()
+        LeanProfile().apply_options(options)
+        arguments = [call.args[0] for call in options.add_argument.call_args_list]
+        self.assertNotIn("--blink-settings=imagesEnabled=false", arguments)
+        options.add_experimental_option.assert_not_called()
+        self.assertIn("*/dfsmedia/*-500*", LeanProfile().url_patterns())
+        self.assertNotIn("*/dfsmedia/*-500*", LeanProfile(block_images=False).url_patterns())
+
+    def test_apply_uses_cdp(self):
+        """Test blocking is installed through Network.setBlockedURLs"""
+        driver = MagicMock()
+        profile = LeanProfile(block_images=False, block_fonts=False, block_media=False, blocked_hosts=["x.test"])
+        profile.apply(driver)
+        driver.execute_cdp_cmd.assert_called_with('Network.setBlockedURLs', {'urls': ["*://x.test/*"]})
+
+
+class TestNetworkStats(unittest.TestCase):
+    def load(self, stats, driver, category, lean, requests, blocked, size):
+        stats.start_page(driver, f"https://www.watts.com/{category}", category, lean=lean)
+        for n in range(requests):
+            stats.observe(driver, {'method': 'Network.requestWillBeSent', 'params': {'requestId': str(n)}})
+            stats.observe(driver, {'method': 'Network.loadingFinished', 'params': {'encodedDataLength': size}})
+        for n in range(blocked):
+            stats.observe(driver, {'method': 'Network.loadingFailed', 'params': {'blockedReason': 'inspector'}})
+        stats.finish_page(driver)
+
+    def test_savings_against_full_pages(self):
+        """Test lean pages are compared with pages loaded without blocking"""
+        stats = NetworkStats()
+        driver = MagicMock()
+        self.load(stats, driver, "roof-drains", False, 60, 0, 4096)
+        self.load(stats, driver, "cleanouts", True, 20, 15, 4096)
+
+        summary = stats.summary()
+        self.assertEqual(summary['categories']['cleanouts']['blocked_per_page'], 15)
+        self.assertEqual(summary['requests_saved_per_page'], 40)
+        self.assertEqual(summary['kb_saved_per_page'], 160)
+
+
+if __name__ == '__main__':
+    unittest.main()
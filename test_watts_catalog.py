@@ -0,0 +1,107 @@
+import json
+import os
+import tempfile
+import unittest
+
+from watts_catalog import CatalogDiff
+from watts_crawl_state import CrawlState
+
+CATEGORY = "Floor & Area Drains"
+BASE = "https://www.watts.com/products/drainage-solutions/floor-area-drains"
+LISTING = [
+    (f"{BASE}/fd-100-a", "FD-100", "Floor Drain with Round Strainer"),
+    (f"{BASE}/fd-100-b", "FD-100", "Floor Drain with Square Strainer"),
+    (f"{BASE}/fd-200", "FD-200", "Floor Drain"),
+]
+
+
+class TestCatalogDiff(unittest.TestCase):
+    def setUp(self):
+        """Open a crawl state holding the first crawl of LISTING"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state = CrawlState(os.path.join(self.tmp.name, "crawl_state.db"))
+        first = CatalogDiff(self.state)
+        for product_url, product_code, _ in first.compare(CATEGORY, LISTING):
+            spec_url = f"{product_url}-pdf"
+            self.state.record_product(CATEGORY, product_url, product_code, spec_url)
+            self.state.record_document(spec_url, "x.pdf", None, None, f"hash-{product_code}")
+        self.first_events = first.finish()
+        first.commit()
+
+    def tearDown(self):
+        self.state.close()
+        self.tmp.cleanup()
+
+    def test_first_crawl_adds_everything(self):
+        """Test every product of the first crawl is added with its spec sheet"""
+        self.assertEqual([event['change'] for event in self.first_events], ['added'] * 3)
+        self.assertEqual(self.first_events[0]['spec_url'], f"{BASE}/fd-100-a-pdf")
+        self.assertEqual(self.first_events[0]['content_hash'], "hash-FD-100")
+
+    def test_only_changes_are_visited(self):
+        """Test added and changed products are visited and removed ones reported"""
+        listing = [
+            LISTING[0],
+            (LISTING[1][0], "FD-100", "Floor Drain with Square Nickel Bronze Strainer"),
+            (f"{BASE}/fd-300", "FD-300", "Floor Sink"),
+        ]
+        diff = CatalogDiff(self.state)
+        visit = diff.compare(CATEGORY, listing)
+
+        self.assertEqual([entry[0] for entry in visit], [LISTING[1][0], f"{BASE}/fd-300"])
+        self.assertEqual(diff.summary(), {'added': 1, 'removed': 1, 'changed': 1, 'unchanged': 1})
+        changed = next(event for event in diff.events if event['change'] == 'changed')
+        self.assertEqual(changed['fields'], ['description'])
+        self.assertEqual(changed['previous']['description'], "Floor Drain with Square Strainer")
+        removed = next(event for event in diff.events if event['change'] == 'removed')
+        self.assertEqual((removed['product_url'], removed['spec_url']), (LISTING[2][0], f"{LISTING[2][0]}-pdf"))
+        diff.commit()
+        self.assertEqual(set(self.state.get_catalog(CATEGORY)), {entry[0] for entry in listing})
+
+    def test_uncommitted_listing_is_compared_again(self):
+        """Test a run stopped before its feed was written reports the same changes next time"""
+        listing = [LISTING[0], LISTING[1], (f"{BASE}/fd-300", "FD-300", "Floor Sink")]
+        CatalogDiff(self.state).compare(CATEGORY, listing)
+        self.assertEqual(set(self.state.get_catalog(CATEGORY)), {entry[0] for entry in LISTING})
+
+        rerun = CatalogDiff(self.state)
+        self.assertEqual([entry[0] for entry in rerun.compare(CATEGORY, listing)], [f"{BASE}/fd-300"])
+        self.assertEqual(rerun.summary(), {'added': 1, 'removed': 1, 'changed': 0, 'unchanged': 2})
+
+    def test_whitespace_in_descriptions_is_not_a_change(self):
+        """Test descriptions read with different spacing or line breaks compare unchanged"""
+        listing = [(url, code, f"  {description.replace(' ', chr(10) + '  ')} ") for url, code, description in LISTING]
+        diff = CatalogDiff(self.state)
+        self.assertEqual(diff.compare(CATEGORY, listing), [])
+        self.assertEqual(diff.summary(), {'added': 0, 'removed': 0, 'changed': 0, 'unchanged': 3})
+
+    def test_refreshed_product_with_new_spec_sheet(self):
+        """Test a revisited product whose PDF content changed is reported as changed"""
+        diff = CatalogDiff(self.state)
+        visit = diff.compare(CATEGORY, LISTING, refresh=lambda url, previous: url == LISTING[0][0])
+        self.assertEqual(visit, [LISTING[0]])
+        self.assertEqual(diff.events, [])
+
+        self.state.record_document(f"{LISTING[0][0]}-pdf", "x.pdf", None, None, "hash-new")
+        events = diff.finish()
+        self.assertEqual([(event['change'], event['fields']) for event in events], [('changed', ['content_hash'])])
+        self.assertEqual(events[0]['previous']['content_hash'], "hash-FD-100")
+        self.assertEqual(diff.summary()['unchanged'], 2)
+
+        path = os.path.join(self.tmp.name, "changes.jsonl")
+        diff.write_feed(path)
+        with open(path, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(lines[0]['content_hash'], "hash-new")
+        self.assertIn('run', lines[0])
+
+    def test_empty_listing_keeps_snapshot(self):
+        """Test a category page that listed nothing does not remove every product"""
+        diff = CatalogDiff(self.state)
+        self.assertEqual(diff.compare(CATEGORY, []), [])
+        self.assertEqual(diff.events, [])
+        self.assertEqual(len(self.state.get_catalog(CATEGORY)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+
+from watts_checkpoint import DONE, IN_FLIGHT, PENDING, RunCheckpoint
+from watts_crawl_state import CrawlState
+
+PRODUCT = "https://www.watts.com/products/drainage-solutions/fd-100-a"
+SPEC = "https://www.watts.com/dfsmedia/abc/es-wd-fd-100-a-pdf"
+
+
+class TestRunCheckpoint(unittest.TestCase):
+    def setUp(self):
+        """Open a state database in a temporary directory"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "crawl_state.db")
+        self.state = CrawlState(self.path)
+
+    def tearDown(self):
+        """Remove the temporary database"""
+        self.state.close()
+        self.tmp.cleanup()
+
+    def reopen(self, **kwargs):
+        """Resume the latest run from a fresh connection, as a new process would"""
+        self.state.close()
+        self.state = CrawlState(self.path)
+        return RunCheckpoint.resume(self.state, **kwargs)
+
+    def test_flushes_are_periodic(self):
+        """Test transitions are only written once the interval has passed or on flush()"""
+        checkpoint = RunCheckpoint.start(self.state, interval=3600)
+        checkpoint.add('product', PRODUCT, "Floor & Area Drains", {'code': "FD-100-A"})
+        self.assertEqual(self.state.get_work_items(checkpoint.run_id), [])
+
+        checkpoint.flush()
+        items = self.state.get_work_items(checkpoint.run_id)
+        self.assertEqual([(item['key'], item['status'], item['payload']) for item in items],
+                         [(PRODUCT, PENDING, {'code': "FD-100-A"})])
+
+    def test_interrupted_items_are_resumed(self):
+        """Test in-flight items go back to pending and done items are not run again"""
+        checkpoint = RunCheckpoint.start(self.state, interval=0)
+        checkpoint.add('product', PRODUCT, "Floor & Area Drains")
+        checkpoint.add('download', SPEC, "Floor & Area Drains")
+        checkpoint.begin('product', PRODUCT)
+        checkpoint.begin('download', SPEC)
+        checkpoint.done('download', SPEC)
+
+        resumed = self.reopen()
+        self.assertEqual(resumed.run_id, checkpoint.run_id)
+        self.assertEqual(resumed.get('product', PRODUCT)['status'], PENDING)
+        self.assertEqual(resumed.get('product', PRODUCT)['attempts'], 1)
+        self.assertTrue(resumed.should_run('product', PRODUCT))
+        self.assertFalse(resumed.should_run('download', SPEC))
+
+    def test_failures_back_off_and_give_up(self):
+        """Test failed items wait twice as long after each attempt and stop after max_attempts"""
+        checkpoint = RunCheckpoint.start(self.state, interval=0, max_attempts=2, backoff=10)
+        checkpoint.add('download', SPEC)
+        checkpoint.begin('download', SPEC)
+        checkpoint.fail('download', SPEC, "HTTP 503")
+        self.assertAlmostEqual(checkpoint.retry_delay('download', SPEC), 10, delta=1)
+
+        resumed = self.reopen(interval=0, max_attempts=2, backoff=10)
+        self.assertEqual(resumed.failures('download')[0]['last_error'], "HTTP 503")
+        self.assertTrue(resumed.should_run('download', SPEC))
+        resumed.begin('download', SPEC)
+        self.assertEqual(resumed.get('download', SPEC)['status'], IN_FLIGHT)
+        resumed.fail('download', SPEC, "HTTP 503")
+        self.assertAlmostEqual(resumed.retry_delay('download', SPEC), 20, delta=1)
+        self.assertFalse(resumed.should_run('download', SPEC))
+        self.assertIsNone(self.reopen(max_attempts=2))
+
+    def test_finished_run_has_nothing_to_resume(self):
+        """Test a run whose items all finished is not resumed"""
+        checkpoint = RunCheckpoint.start(self.state)
+        checkpoint.add('category', "Roof Drains")
+        checkpoint.begin('category', "Roof Drains")
+        checkpoint.done('category', "Roof Drains")
+        checkpoint.finish()
+        self.assertEqual(checkpoint.summary()['items'], {'category': {DONE: 1}})
+        self.assertIsNone(self.reopen())
+        self.assertIsNotNone(self.state.latest_run()['finished'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+
+from watts_crawl_state import CrawlState
+
+
+class TestCrawlState(unittest.TestCase):
+    def setUp(self):
+        """Open a state database in a temporary directory"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state = CrawlState(os.path.join(self.tmp.name, "crawl_state.db"))
+        self.product_url = "https://www.watts.com/products/drainage-solutions/fd-100-a"
+        self.spec_url = "https://www.watts.com/dfsmedia/abc/es-wd-fd-100-a-pdf"
+        self.output_path = os.path.join(self.tmp.name, "fd-100-a.pdf")
+
+    def tearDown(self):
+        """Remove the temporary database"""
+        self.state.close()
+        self.tmp.cleanup()
+
+    def test_unknown_product_is_stale(self):
+        """Test products never seen before are infinitely old"""
+        self.assertIsNone(self.state.get_product(self.product_url))
+        self.assertEqual(CrawlState.age(None), float('inf'))
+
+    def test_record_and_update_product(self):
+        """Test product rows are upserted"""
+        self.state.record_product("Floor & Area Drains", self.product_url, "FD-100-A", None)
+        self.state.record_product("Floor & Area Drains", self.product_url, "FD-100-A", self.spec_url)
+        entry = self.state.get_product(self.product_url)
+        self.assertEqual(entry['spec_url'], self.spec_url)
+        self.assertLess(CrawlState.age(entry), 5)
+
+    def test_conditional_headers(self):
+        """Test validators are only offered for the same output file"""
+        self.assertEqual(self.state.conditional_headers(self.spec_url, self.output_path), {})
+
+        self.state.record_document(self.spec_url, self.output_path, '"abc"',
+                                   "Wed, 16 Apr 2025 21:00:00 GMT", "deadbeef")
+        self.assertEqual(
+            self.state.conditional_headers(self.spec_url, self.output_path),
+            {'If-None-Match': '"abc"', 'If-Modified-Since': "Wed, 16 Apr 2025 21:00:00 GMT"}
+        )
+        self.assertEqual(self.state.conditional_headers(self.spec_url, "elsewhere.pdf"), {})
+
+    def test_state_survives_reopen(self):
+        """Test a second run sees what the first one stored"""
+        self.state.record_document(self.spec_url, self.output_path, None, None, "deadbeef")
+        self.state.close()
+        self.state = CrawlState(os.path.join(self.tmp.name, "crawl_state.db"))
+        self.assertEqual(self.state.get_document(self.spec_url)['content_hash'], "deadbeef")
+
+
+if __name__ == '__main__':
+    unittest.main()
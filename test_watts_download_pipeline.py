@@ -0,0 +1,148 @@
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from watts_blob_store import BlobStore
+from watts_crawl_state import CrawlState
+from watts_download_pipeline import DownloadPipeline
+
+PDF_BYTES = b"%PDF-1.4\n" + b"0" * 200000 + b"\nstartxref\n9\n%%EOF\n"
+
+
+class PdfHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/html"):
+            body = b"<html><body>An error has occurred.</body></html>"
+            self.send_response(200)
+            self.send_header("Content-Type", "application/pdf" if "pdf" in self.path else "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        if self.path.startswith("/truncated"):
+            body = PDF_BYTES[:1000]
+            self.send_response(200)
+            self.send_header("Content-Type", "application/pdf")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(PDF_BYTES)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(PDF_BYTES)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestDownloadPipeline(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Serve PDFs from a local HTTP server"""
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), PdfHandler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """Create a scratch output directory and crawl state"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state = CrawlState(os.path.join(self.tmp.name, "crawl_state.db"))
+
+    def tearDown(self):
+        self.state.close()
+        self.tmp.cleanup()
+
+    def test_concurrent_downloads_land_atomically(self):
+        """Test queued PDFs are all written in place with no temp files left"""
+        pipeline = DownloadPipeline(workers=3, state=self.state).start()
+        paths = [os.path.join(self.tmp.name, "Roof Drains", f"rd-{n}.pdf") for n in range(6)]
+        futures = [pipeline.submit(f"{self.base}/rd-{n}.pdf", path) for n, path in enumerate(paths)]
+        pipeline.close()
+
+        self.assertTrue(all(future.result() for future in futures))
+        for path in paths:
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), PDF_BYTES)
+        self.assertEqual(sorted(os.listdir(os.path.dirname(paths[0]))), sorted(os.path.basename(p) for p in paths))
+        self.assertEqual(pipeline.succeeded, 6)
+
+    def test_unchanged_pdf_is_revalidated(self):
+        """Test a stored PDF with a matching ETag is not downloaded again"""
+        path = os.path.join(self.tmp.name, "fd-100.pdf")
+        url = f"{self.base}/fd-100.pdf"
+
+        pipeline = DownloadPipeline(state=self.state).start()
+        self.assertTrue(pipeline.submit(url, path).result())
+        mtime = os.path.getmtime(path)
+        self.assertTrue(pipeline.submit(url, path).result())
+        pipeline.close()
+
+        self.assertEqual(os.path.getmtime(path), mtime)
+        self.assertEqual(self.state.get_document(url)['etag'], '"v1"')
+
+    def test_blob_store_links_duplicates(self):
+        """Test identical PDFs are stored once and linked into each folder"""
+        blobs = BlobStore(self.tmp.name)
+        paths = [os.path.join(self.tmp.name, category, "rd-1.pdf") for category in ("Roof Drains", "Cleanouts")]
+        pipeline = DownloadPipeline(state=self.state, blobs=blobs).start()
+        futures = [pipeline.submit(f"{self.base}/rd-1.pdf", path) for path in paths]
+        pipeline.close()
+
+        self.assertTrue(all(future.result() for future in futures))
+        self.assertTrue(os.path.samefile(*paths))
+        self.assertEqual(blobs.summary()['stored'], 1)
+
+    def test_html_error_page_rejected(self):
+        """Test a non-PDF response is reported as a failure"""
+        path = os.path.join(self.tmp.name, "broken.pdf")
+        pipeline = DownloadPipeline(state=self.state).start()
+        future = pipeline.submit(f"{self.base}/html", path)
+        pipeline.close()
+
+        self.assertFalse(future.result())
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(pipeline.failed, [(f"{self.base}/html", path)])
+
+    def test_error_page_served_as_pdf_rejected(self):
+        """Test an HTML body is caught by its first bytes despite a PDF content type"""
+        path = os.path.join(self.tmp.name, "mislabelled.pdf")
+        pipeline = DownloadPipeline(state=self.state, max_retries=1).start()
+        future = pipeline.submit(f"{self.base}/html-as-pdf", path)
+        pipeline.close()
+
+        self.assertFalse(future.result())
+        self.assertFalse(os.path.exists(path))
+
+    def test_truncated_pdf_rejected(self):
+        """Test a PDF without its trailer is never moved into place"""
+        blobs = BlobStore(self.tmp.name)
+        path = os.path.join(self.tmp.name, "Roof Drains", "rd-9.pdf")
+        pipeline = DownloadPipeline(state=self.state, blobs=blobs, max_retries=1).start()
+        future = pipeline.submit(f"{self.base}/truncated.pdf", path)
+        pipeline.close()
+
+        self.assertFalse(future.result())
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(blobs.summary()['stored'], 0)
+        self.assertEqual(os.listdir(blobs.tmp_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
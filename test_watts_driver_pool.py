@@ -0,0 +1,79 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from watts_driver_pool import DriverPool
+
+
+class TestDriverPool(unittest.TestCase):
+    def setUp(self):
+        """Set up a pool backed by mock browsers"""
+        self.launched = []
+
+        def factory():
+            driver = MagicMock()
+            self.launched.append(driver)
+            return driver
+
+        self.pool = DriverPool(factory, size=3)
+
+    def tearDown(self):
+        """Quit the mock browsers"""
+        self.pool.close()
+
+    def test_results_keep_input_order(self):
+        """Test results come back in the order items were queued"""
+        items = [(f"https://example.com/p/{n}", f"FD-{n}") for n in range(10)]
+        results = self.pool.map(items, lambda url, code: code)
+        self.assertEqual(results, [code for _, code in items])
+        self.assertLessEqual(len(self.launched), 3)
+
+    def test_each_worker_uses_its_own_driver(self):
+        """Test the thread-local driver belongs to the running worker"""
+        seen = {}
+        lock = threading.Lock()
+
+        def handler(url, code):
+            time.sleep(0.01)
+            with lock:
+                seen.setdefault(threading.current_thread().name, set()).add(id(self.pool.driver))
+            return True
+
+        self.pool.map([(str(n), str(n)) for n in range(9)], handler)
+        for drivers in seen.values():
+            self.assertEqual(len(drivers), 1)
+        self.assertIsNone(self.pool.driver)
+
+    def test_concurrency_limit(self):
+        """Test no more than max_concurrency handlers run at once"""
+        pool = DriverPool(MagicMock, size=4, max_concurrency=2)
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def handler(url, code):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+
+        pool.map([(str(n), str(n)) for n in range(8)], handler)
+        pool.close()
+        self.assertLessEqual(max(peak), 2)
+
+    def test_handler_errors_do_not_stop_pool(self):
+        """Test a failing item yields None without losing the rest"""
+        def handler(url, code):
+            if code == "bad":
+                raise ValueError("boom")
+            return code
+
+        results = self.pool.map([("a", "ok"), ("b", "bad"), ("c", "fine")], handler)
+        self.assertEqual(results, ["ok", None, "fine"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+
+from watts_frontier import Frontier, canonicalize, is_product_page
+
+SITE = "https://www.watts.com/products/drainage-solutions"
+ROOT = f"{SITE}/interceptors"
+
+
+class TestCanonicalize(unittest.TestCase):
+    def test_spellings_of_one_page(self):
+        """Test case, port, query, fragment, dot segments and slashes do not make new pages"""
+        spellings = [
+            f"{ROOT}/grease",
+            f"{ROOT}/grease/",
+            f"HTTPS://WWW.Watts.com:443/products/drainage-solutions/interceptors/grease?sort=az#grid",
+            f"{SITE}//interceptors/./solids/../grease",
+        ]
+        self.assertEqual({canonicalize(url) for url in spellings}, {f"{ROOT}/grease"})
+
+    def test_relative_links(self):
+        """Test hrefs are resolved against the page they were found on"""
+        self.assertEqual(canonicalize("grease", f"{ROOT}/"), f"{ROOT}/grease")
+        self.assertEqual(canonicalize("/products/x", ROOT), "https://www.watts.com/products/x")
+
+    def test_product_pages(self):
+        """Test product pages are told apart from listings"""
+        self.assertTrue(is_product_page(f"{SITE}/roof-drains/rd-100-a"))
+        self.assertFalse(is_product_page(f"{SITE}/roof-drains"))
+        self.assertFalse(is_product_page(f"{SITE}/floor-drains-channels-trench/floor-area-drains"))
+
+
+class TestFrontier(unittest.TestCase):
+    def drain(self, frontier, links):
+        """Pop every page, adding the links listed for it; the pages in load order"""
+        loaded = []
+        page = frontier.pop()
+        while page is not None:
+            url, depth = page
+            loaded.append(url)
+            for link in links.get(url, ()):
+                frontier.add(link, depth + 1)
+            page = frontier.pop()
+        return loaded
+
+    def test_cycles_are_loaded_once(self):
+        """Test pages linking back to each other and the root end the crawl"""
+        frontier = Frontier(ROOT)
+        links = {
+            ROOT: [f"{ROOT}/grease", f"{ROOT}/solids/"],
+            f"{ROOT}/grease": [ROOT, f"{ROOT}/solids?page=2"],
+            f"{ROOT}/solids": [f"{ROOT}/grease#top"],
+        }
+        self.assertEqual(self.drain(frontier, links), [ROOT, f"{ROOT}/grease", f"{ROOT}/solids"])
+        self.assertEqual(frontier.summary()['duplicates'], 3)
+
+    def test_own_subpages_first(self):
+        """Test subpages of the category outrank siblings and unrelated pages found earlier"""
+        frontier = Frontier(ROOT)
+        links = {ROOT: [f"{SITE}/fixture-carriers", "https://www.watts.com/products/plumbing", f"{ROOT}/oil"]}
+        self.assertEqual(self.drain(frontier, links)[:3],
+                         [ROOT, f"{ROOT}/oil", f"{SITE}/fixture-carriers"])
+
+    def test_navigation_is_not_crawled(self):
+        """Test other categories, product pages and off-site links are never queued"""
+        frontier = Frontier(f"{SITE}/roof-drains", exclude=[f"{SITE}/roof-drains", f"{SITE}/roof-drains/green-roof-drains"])
+        links = {f"{SITE}/roof-drains": [
+            f"{SITE}/roof-drains/green-roof-drains/",
+            f"{SITE}/roof-drains/rd-100",
+            "https://example.com/products/roof-drains",
+            "https://www.watts.com/about-us",
+        ]}
+        self.assertEqual(self.drain(frontier, links), [f"{SITE}/roof-drains"])
+        self.assertEqual(frontier.summary()['skipped'], 3)
+
+    def test_depth_and_page_budgets(self):
+        """Test links past max_depth are dropped and at most max_pages pages are loaded"""
+        chain = {f"{ROOT}/{n}": [f"{ROOT}/{n + 1}"] for n in range(5)}
+        chain[ROOT] = [f"{ROOT}/0"]
+        frontier = Frontier(ROOT, max_depth=2)
+        self.assertEqual(len(self.drain(frontier, chain)), 3)
+        self.assertEqual(frontier.summary()['too_deep'], 1)
+
+        wide = {ROOT: [f"{ROOT}/{n}" for n in range(10)]}
+        frontier = Frontier(ROOT, max_pages=4)
+        self.assertEqual(len(self.drain(frontier, wide)), 4)
+        self.assertEqual(frontier.summary()['over_budget'], 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from watts_html import BACKENDS, HtmlParser, available_backends
+
+PAGE = '<html><body><a class="product-download__link" href="/x-pdf">Specification Sheet</a></body></html>'
+
+
+class TestHtmlParser(unittest.TestCase):
+    def setUp(self):
+        """Set up a parser with a small cache"""
+        self.parser = HtmlParser(max_entries=2)
+
+    def test_html_parser_always_available(self):
+        """Test the pure-Python fallback is always offered, and last"""
+        backends = available_backends()
+        self.assertEqual(backends[-1], 'html.parser')
+        self.assertTrue(set(backends) <= set(BACKENDS))
+
+    def test_same_content_parsed_once(self):
+        """Test an unchanged page reuses its first parse"""
+        first = self.parser.parse(PAGE, url="https://www.watts.com/a")
+        second = self.parser.parse(PAGE, url="https://www.watts.com/a")
+        self.assertIs(first, second)
+        self.assertEqual(self.parser.summary()['parses'], 1)
+        self.assertEqual(self.parser.summary()['cache_hits'], 1)
+
+    def test_changed_content_is_reparsed(self):
+        """Test the content hash, not just the URL, keys the cache"""
+        first = self.parser.parse(PAGE, url="https://www.watts.com/a")
+        second = self.parser.parse(PAGE + "<p></p>", url="https://www.watts.com/a")
+        self.assertIsNot(first, second)
+
+    def test_cache_is_bounded(self):
+        """Test the oldest document is evicted and parsed again when read"""
+        for n in (0, 1, 2, 2, 0):
+            self.parser.parse(f"{PAGE}<i>{n}</i>", url=f"https://www.watts.com/{n}")
+        self.assertEqual(self.parser.summary()['parses'], 4)
+        self.assertEqual(self.parser.summary()['cache_hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from watts_checkpoint import DONE, FAILED, IN_FLIGHT
+from watts_job_queue import JobQueue
+
+PRODUCT = "https://www.watts.com/products/drainage-solutions/fd-100-a"
+
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        """Open a queue in a temporary directory, as one of several processes"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "jobs.db")
+        self.queues = []
+
+    def tearDown(self):
+        """Close every connection and remove the database"""
+        for queue in self.queues:
+            queue.close()
+        self.tmp.cleanup()
+
+    def open(self, **kwargs):
+        """Another worker's connection to the same queue"""
+        queue = JobQueue(self.path, **kwargs)
+        self.queues.append(queue)
+        return queue
+
+    def test_jobs_are_queued_once(self):
+        """Test putting a job twice, from any process, queues it once"""
+        first, second = self.open(), self.open()
+        self.assertTrue(first.put('product', PRODUCT, "Floor & Area Drains", {'code': "FD-100-A"}))
+        self.assertFalse(second.put('product', PRODUCT, "Floor & Area Drains", {'code': "FD-100-A"}))
+        self.assertEqual(first.counts(), {'product': {'pending': 1}})
+
+        job = second.lease()
+        self.assertEqual((job['key'], job['payload'], job['attempts']), (PRODUCT, {'code': "FD-100-A"}, 1))
+        self.assertIsNone(first.lease())
+        self.assertEqual(first.outstanding(), 1)
+
+    def test_concurrent_workers_take_each_job_once(self):
+        """Test workers on separate connections never lease the same job"""
+        self.open().put('category', "Roof Drains", "Roof Drains")
+        for n in range(40):
+            self.queues[0].put('product', f"{PRODUCT}-{n}", "Roof Drains")
+        taken = []
+        lock = threading.Lock()
+
+        def work(queue):
+            job = queue.lease()
+            while job is not None:
+                with lock:
+                    taken.append(job['key'])
+                queue.complete(job)
+                job = queue.lease()
+
+        workers = [threading.Thread(target=work, args=(self.open(),)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(len(taken), 41)
+        self.assertEqual(len(set(taken)), 41)
+        self.assertEqual(self.queues[0].counts(), {'category': {DONE: 1}, 'product': {DONE: 40}})
+
+    def test_expired_lease_is_retried_and_completion_is_idempotent(self):
+        """Test a job whose worker stopped heartbeating goes to another worker, and completes once"""
+        stalled, healthy = self.open(lease=0.2, backoff=0), self.open(lease=0.2, backoff=0)
+        stalled.put('download', PRODUCT)
+        job = stalled.lease()
+        time.sleep(0.3)
+
+        retry = healthy.lease()
+        self.assertEqual(retry['attempts'], 2)
+        self.assertFalse(stalled.heartbeat(job))
+        self.assertFalse(stalled.fail(job, "too late"))
+        self.assertTrue(healthy.complete(retry))
+        self.assertFalse(stalled.complete(job))
+        self.assertEqual(healthy.get('download', PRODUCT)['status'], DONE)
+        self.assertEqual(healthy.outstanding(), 0)
+
+    def test_heartbeats_keep_the_lease(self):
+        """Test keep_alive() renews a lease that would otherwise expire"""
+        worker, other = self.open(lease=0.3), self.open(lease=0.3)
+        worker.put('product', PRODUCT)
+        job = worker.lease()
+        with worker.keep_alive(job):
+            time.sleep(0.5)
+            self.assertIsNone(other.lease())
+        self.assertEqual(other.get('product', PRODUCT)['status'], IN_FLIGHT)
+
+    def test_failures_back_off_and_give_up(self):
+        """Test failed jobs wait out their back-off and stop after max_attempts"""
+        queue = self.open(max_attempts=2, backoff=0.2)
+        queue.put('product', PRODUCT)
+        queue.fail(queue.lease(), "No spec sheet")
+        self.assertIsNone(queue.lease())
+        time.sleep(0.25)
+        job = queue.lease()
+        self.assertEqual(job['attempts'], 2)
+        queue.fail(job, "No spec sheet")
+        time.sleep(0.45)
+        self.assertIsNone(queue.lease())
+        self.assertEqual(queue.outstanding(), 0)
+        self.assertEqual(queue.get('product', PRODUCT)['status'], FAILED)
+
+    def test_finished_run_is_followed_by_a_new_one(self):
+        """Test a queue reused after its run finished starts a new run instead of doing nothing"""
+        first = self.open()
+        self.assertFalse(first.begin_run())
+        first.put('category', "Roof Drains", "Roof Drains")
+        first.complete(first.lease())
+
+        late = self.open()
+        self.assertTrue(late.begin_run())
+        self.assertTrue(late.put('category', "Roof Drains", "Roof Drains"))
+        self.assertEqual(late.outstanding(), 1)
+        self.assertEqual(first.counts(), {'category': {DONE: 1}})
+
+        joining = self.open()
+        self.assertFalse(joining.begin_run())
+        self.assertEqual(joining.run_id, late.run_id)
+        self.assertFalse(joining.put('category', "Roof Drains", "Roof Drains"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+import requests
+
+from watts_listing_api import ListingApiClient, ListingApiError, find_listing_source
+from watts_replay import ReplayCorpus, ReplayServer
+
+FLOOR_DRAINS = "/products/drainage-solutions/floor-drains-channels-trench/floor-area-drains"
+
+
+class TestListingSource(unittest.TestCase):
+    def test_results_container(self):
+        """Test the endpoint and parent ID are read from the grid's results container"""
+        page = ('<div class="js-filter-buttons__container"></div>'
+                '<div class="js-results results" data-pagenum="1" data-endpoint="/api/watts/series/search" '
+                'data-parent="{243AB82C-504D-412C-9ECB-62AA6B5BC233}">')
+        self.assertEqual(find_listing_source(page),
+                         ("/api/watts/series/search", "{243AB82C-504D-412C-9ECB-62AA6B5BC233}"))
+        self.assertIsNone(find_listing_source('<div class="results" data-parent="{x}">'))
+
+    def test_results_map_to_listing_entries(self):
+        """Test products keep the grid's (URL, code, description) and the rest are subcategories"""
+        client = ListingApiClient(None, "https://www.watts.com")
+        product, subcategory = client.entry({'Url': f"{FLOOR_DRAINS}/fd-100-a", 'Name': "FD-100-A",
+                                             'Description': " Floor Drain with\nRound Strainer "})
+        self.assertEqual(product, (f"https://www.watts.com{FLOOR_DRAINS}/fd-100-a", "FD-100",
+                                   "Floor Drain with Round Strainer"))
+        self.assertIsNone(subcategory)
+        self.assertEqual(client.entry({'Url': "/products/drainage-solutions/interceptors/grease", 'Name': "Grease"}),
+                         (None, "https://www.watts.com/products/drainage-solutions/interceptors/grease"))
+
+
+class TestListingApiClient(unittest.TestCase):
+    def test_pages_through_results(self):
+        """Test a category is listed one page of results per request"""
+        corpus = ReplayCorpus()
+        with ReplayServer(corpus) as server:
+            corpus.add_category("Floor & Area Drains", f"{server.base_url}{FLOOR_DRAINS}")
+            client = ListingApiClient(requests.Session(), server.base_url, page_size=12)
+            products, subcategories = client.list_page(f"{server.base_url}{FLOOR_DRAINS}")
+            client.list_page(f"{server.base_url}{FLOOR_DRAINS}")
+
+            self.assertEqual(len(products), 30)
+            self.assertEqual(subcategories, [])
+            self.assertEqual(products[0][1:], ("FD-100", "Floor Drain with Round Strainer"))
+            self.assertEqual(corpus.served['search'], 6)
+            self.assertEqual(corpus.served['page'], 1)
+
+    def test_page_without_grid(self):
+        """Test pages the endpoint cannot list raise instead of listing nothing"""
+        with ReplayServer(ReplayCorpus()) as server:
+            client = ListingApiClient(requests.Session(), server.base_url)
+            with self.assertRaises(ListingApiError):
+                client.list_page(f"{server.base_url}/products/nothing-here")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import gzip
+import json
+import logging
+import os
+import tempfile
+import unittest
+
+from watts_logging import (JsonFormatter, SamplingFilter, compressing_file_handler, parse_levels,
+                           setup_logging, stop_logging)
+
+
+def make_record(msg, level=logging.DEBUG, lineno=1, **extra):
+    record = logging.LogRecord('watts.test', level, 'scraper.py', lineno, msg, None, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestFormattingAndSampling(unittest.TestCase):
+    def test_json_lines(self):
+        """Test records become single-line JSON objects with their extras"""
+        line = JsonFormatter().format(make_record("Found\nproduct", level=logging.INFO, category="Roof Drains"))
+        self.assertNotIn("\n", line)
+        entry = json.loads(line)
+        self.assertEqual(entry['msg'], "Found\nproduct")
+        self.assertEqual(entry['level'], "INFO")
+        self.assertEqual(entry['category'], "Roof Drains")
+
+    def test_debug_sampled_per_call_site(self):
+        """Test repeated DEBUG lines are thinned per line, INFO never is"""
+        sampler = SamplingFilter(every=5)
+        kept = [sampler.filter(make_record("selector", lineno=10)) for _ in range(10)]
+        self.assertEqual(kept.count(True), 2)
+        self.assertTrue(kept[0])
+        self.assertTrue(sampler.filter(make_record("other line", lineno=11)))
+        self.assertTrue(all(sampler.filter(make_record("info", level=logging.INFO)) for _ in range(10)))
+        self.assertEqual(sampler.dropped, 8)
+
+    def test_parse_levels(self):
+        """Test a root level with per-logger overrides"""
+        self.assertEqual(parse_levels("warning, watts_readiness=DEBUG"),
+                         (logging.WARNING, {'watts_readiness': logging.DEBUG}))
+        with self.assertRaises(ValueError):
+            parse_levels("LOUD")
+
+
+class TestLogFiles(unittest.TestCase):
+    def setUp(self):
+        """Set up a temporary log directory"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "scraper.log")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_rotated_files_are_gzipped(self):
+        """Test rotation compresses the old file and keeps the live one plain"""
+        handler = compressing_file_handler(self.path, max_bytes=200, backups=2)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        for n in range(20):
+            handler.emit(make_record(f"line {n:02d} " + "x" * 20, level=logging.INFO))
+        handler.close()
+        self.assertTrue(os.path.exists(f"{self.path}.1.gz"))
+        self.assertFalse(os.path.exists(f"{self.path}.3.gz"))
+        with gzip.open(f"{self.path}.1.gz", 'rt') as f:
+            self.assertIn("line", f.read())
+
+    def test_queued_setup(self):
+        """Test setup_logging writes through its listener with per-logger levels"""
+        root = logging.getLogger()
+        saved = (root.handlers[:], root.level)
+        try:
+            listener = setup_logging(log_file=self.path, levels="INFO,watts.quiet=ERROR",
+                                     console=False, force=True)
+            self.assertIsNotNone(listener)
+            self.assertIsNone(setup_logging(log_file=self.path))
+            logging.getLogger('watts.loud').info("kept")
+            logging.getLogger('watts.quiet').warning("dropped")
+            logging.getLogger('watts.loud').debug("below root level")
+        finally:
+            stop_logging()
+            root.handlers[:], _ = saved
+            root.setLevel(saved[1])
+        with open(self.path) as f:
+            messages = [json.loads(line)['msg'] for line in f]
+        self.assertEqual(messages, ["kept"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from watts_metrics import Histogram, RunMetrics, report_paths
+
+
+class TestHistogram(unittest.TestCase):
+    def test_buckets_and_quantiles(self):
+        """Test observations land in their bucket and quantiles stay within range"""
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for seconds in (0.05, 0.05, 0.5, 2.0):
+            histogram.observe(seconds)
+        self.assertEqual(histogram.counts, [2, 1, 1])
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.total, 2.6)
+        self.assertLessEqual(histogram.quantile(0.5), 0.1)
+        self.assertEqual(histogram.quantile(1.0), 2.0)
+        self.assertEqual(Histogram().quantile(0.5), 0.0)
+
+
+class TestRunMetrics(unittest.TestCase):
+    def setUp(self):
+        """Set up empty run metrics"""
+        self.metrics = RunMetrics()
+
+    def test_tags_apply_per_thread(self):
+        """Test spans pick up the calling thread's tags only"""
+        with self.metrics.tags(category="Roof Drains"):
+            with self.metrics.tags(product="RD-100"):
+                self.metrics.record('navigation', 0.2)
+            worker = threading.Thread(target=self.metrics.record, args=('navigation', 0.3))
+            worker.start()
+            worker.join()
+            self.metrics.record('html_parse', 0.01)
+
+        report = self.metrics.report()
+        self.assertEqual(report['spans']['navigation']['count'], 2)
+        self.assertEqual(report['categories']['Roof Drains']['navigation']['count'], 1)
+        self.assertEqual(report['categories']['Roof Drains']['html_parse']['count'], 1)
+        self.assertEqual(report['products'], 1)
+        self.assertEqual(self.metrics.current_tags(), {})
+
+    def test_span_records_on_error(self):
+        """Test a span is recorded even when its block raises"""
+        with self.assertRaises(ValueError):
+            with self.metrics.span('download', category="Cleanouts"):
+                raise ValueError("boom")
+        self.assertEqual(self.metrics.report()['categories']['Cleanouts']['download']['count'], 1)
+
+    def test_openmetrics_text(self):
+        """Test histograms are exported as cumulative OpenMetrics buckets"""
+        self.metrics.record('download', 0.2, category='Floor "A" Drains')
+        self.metrics.record('download', 3.0)
+        text = self.metrics.openmetrics()
+        self.assertIn('# TYPE watts_span_seconds histogram', text)
+        self.assertIn('watts_span_seconds_bucket{span="download",le="+Inf"} 2', text)
+        self.assertIn('watts_span_seconds_count{span="download",category="Floor \\"A\\" Drains"} 1', text)
+        self.assertTrue(text.endswith('# EOF\n'))
+
+    def test_report_beside_output_dir(self):
+        """Test the report files are written next to the output directory"""
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path, openmetrics_path = report_paths(os.path.join(tmp, "watts_specs/"), self.metrics.started)
+            self.assertEqual(os.path.dirname(json_path), tmp)
+            self.assertTrue(openmetrics_path.endswith('.prom'))
+            self.metrics.record('spec_resolution', 0.4)
+            self.metrics.write_report(json_path)
+            with open(json_path) as f:
+                self.assertEqual(json.load(f)['spans']['spec_resolution']['count'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
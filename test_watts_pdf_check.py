@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+from watts_pdf_check import (NotPdfError, PdfCheckError, PdfStreamCheck, PdfStructureChecker,
+                             check_bytes, check_file, expected_length)
+
+FIXTURE_PDF = os.path.join('watts_specs', 'test', 'fd-100-a.pdf')
+
+
+def feed_in_chunks(content, chunk_size, expected=None):
+    check = PdfStreamCheck(expected)
+    for start in range(0, len(content), chunk_size):
+        check.feed(content[start:start + chunk_size])
+    check.finish()
+    return check
+
+
+class TestPdfStreamCheck(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Load the saved spec sheet"""
+        with open(FIXTURE_PDF, 'rb') as f:
+            cls.pdf = f.read()
+
+    def test_complete_pdf_passes(self):
+        """Test a real spec sheet passes however it is chunked"""
+        for chunk_size in (3, 8192, len(self.pdf)):
+            self.assertEqual(feed_in_chunks(self.pdf, chunk_size, len(self.pdf)).size, len(self.pdf))
+
+    def test_error_page_rejected_on_first_chunk(self):
+        """Test an HTML body is rejected before the rest is read"""
+        check = PdfStreamCheck()
+        with self.assertRaises(NotPdfError):
+            check.feed(b"  <!DOCTYPE html><html><body>404</body></html>")
+
+    def test_truncated_pdf_rejected(self):
+        """Test missing trailers and short bodies are reported"""
+        with self.assertRaises(PdfCheckError):
+            check_bytes(self.pdf[:len(self.pdf) // 2])
+        with self.assertRaises(PdfCheckError):
+            check_bytes(self.pdf, expected=len(self.pdf) + 10)
+
+    def test_saved_file_head_and_tail(self):
+        """Test a half-written file left on disk is recognised as incomplete"""
+        check_file(FIXTURE_PDF)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "fd-100-a.pdf")
+            with open(path, 'wb') as f:
+                f.write(self.pdf[:len(self.pdf) // 3])
+            with self.assertRaises(PdfCheckError):
+                check_file(path)
+
+    def test_expected_length_ignores_encoded_bodies(self):
+        """Test Content-Length is only trusted for identity encoding"""
+        self.assertEqual(expected_length({'Content-Length': '10'}), 10)
+        self.assertIsNone(expected_length({'Content-Length': '10', 'Content-Encoding': 'gzip'}))
+        self.assertIsNone(expected_length({}))
+
+
+class TestPdfStructureChecker(unittest.TestCase):
+    def test_parse_in_worker_process(self):
+        """Test files that PyPDF2 cannot parse are collected as invalid"""
+        with tempfile.TemporaryDirectory() as tmp:
+            broken = os.path.join(tmp, "broken.pdf")
+            with open(broken, 'wb') as f:
+                f.write(b"%PDF-1.4\nnot really\nstartxref\n0\n%%EOF\n")
+            checker = PdfStructureChecker()
+            checker.submit(FIXTURE_PDF, "https://www.watts.com/fd-100-a-pdf")
+            checker.submit(broken, "https://www.watts.com/broken-pdf")
+            invalid = checker.close()
+
+        self.assertEqual(checker.checked, 2)
+        self.assertEqual([(url, path) for url, path, _ in invalid], [("https://www.watts.com/broken-pdf", broken)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from watts_pdf_extract import (SpecExtractor, attribute_rows, extract_suffix_tables, extract_tabular_data,
+                               file_sha256, write_jsonl)
+
+FIXTURE_PDF = os.path.join('watts_specs', 'test', 'fd-100-a.pdf')
+
+
+class TestPatterns(unittest.TestCase):
+    def test_matches_backend_extract_tabular_data(self):
+        """Test the ported patterns name and classify suffixes like process-pdf.js"""
+        text = "2 | 2\" Pipe Size\nA5: Nickel Bronze Strainer\nNH | No Hub\n-7 Trap Primer Tapping\n-F4-1 Funnel"
+        self.assertEqual(extract_tabular_data(text), [
+            {'name': 'Pipe Size Suffix: 2', 'value': '2" Pipe Size'},
+            {'name': 'Strainer Suffix: A5', 'value': 'Nickel Bronze Strainer'},
+            {'name': 'Outlet Type Suffix: NH', 'value': 'No Hub'},
+            {'name': 'Options Suffix: -7', 'value': 'Trap Primer Tapping'},
+            {'name': 'Options Suffix: -F4-1', 'value': 'Funnel'},
+        ])
+
+    def test_suffix_tables_join_wrapped_rows(self):
+        """Test "Suffix Description" tables keep their section and wrapped descriptions"""
+        text = ("Outlet Type\nSuffix Description\nNH No Hub (MJ)\nP Push On\nNOTICE\n"
+                "the product.Options\nSuffix Description\n-8 Backwater Valve \n(2, 3, 4\" Only)\n-SO Side Outlet")
+        self.assertEqual(extract_suffix_tables(text), [
+            {'name': 'Outlet Type Suffix: NH', 'value': 'No Hub (MJ)', 'section': 'Outlet Type'},
+            {'name': 'Outlet Type Suffix: P', 'value': 'Push On', 'section': 'Outlet Type'},
+            {'name': 'Options Suffix: -8', 'value': 'Backwater Valve (2, 3, 4" Only)', 'section': 'Options'},
+            {'name': 'Options Suffix: -SO', 'value': 'Side Outlet', 'section': 'Options'},
+        ])
+
+
+class TestSpecExtractor(unittest.TestCase):
+    def setUp(self):
+        """Lay the fixture sheet out as two categories sharing one document"""
+        self.tmp = tempfile.TemporaryDirectory()
+        for category in ("Floor Drains", "Trench Drains"):
+            os.makedirs(os.path.join(self.tmp.name, category))
+            shutil.copyfile(FIXTURE_PDF, os.path.join(self.tmp.name, category, "fd-100-a.pdf"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_extracts_fixture_sheet(self):
+        """Test pages, layout and attributes come out of the saved spec sheet"""
+        records = SpecExtractor(self.tmp.name, workers=2).run()
+
+        self.assertEqual([(r['category'], r['product']) for r in records],
+                         [("Floor Drains", "fd-100-a"), ("Trench Drains", "fd-100-a")])
+        record = records[0]
+        self.assertIsNone(record['error'])
+        self.assertEqual(record['sha256'], file_sha256(FIXTURE_PDF))
+        self.assertIn("FD-100-A", record['pages'][0]['text'])
+        self.assertTrue(record['pages'][0]['runs'])
+        values = {a['name']: a['value'] for a in record['attributes']}
+        self.assertEqual(values['Pipe Size Suffix: 4'], '4"(102) Pipe Size')
+        self.assertEqual(values['Strainer Suffix: A10'], '10"(254) Dia., Nickel Bronze')
+        self.assertEqual(values['Options Suffix: -7'], 'Trap Primer Tapping')
+
+        rows = list(attribute_rows(records))
+        self.assertEqual(len(rows), 2 * len(record['attributes']))
+
+        path = os.path.join(self.tmp.name, "attributes.jsonl")
+        write_jsonl(records, path)
+        with open(path, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(lines[0]['pages'], 1)
+
+    def test_only_changed_sheets_are_extracted(self):
+        """Test a second run is served from the content-hash cache"""
+        first = SpecExtractor(self.tmp.name)
+        first.run()
+        self.assertEqual(first.summary(), {'extracted': 1, 'cached': 0, 'failed': 0})
+
+        second = SpecExtractor(self.tmp.name)
+        records = second.run()
+        self.assertEqual(second.summary(), {'extracted': 0, 'cached': 1, 'failed': 0})
+        self.assertTrue(records[1]['attributes'])
+
+        with open(os.path.join(self.tmp.name, "Trench Drains", "fd-100-a.pdf"), 'wb') as f:
+            f.write(b"%PDF-1.4\nchanged\n%%EOF\n")
+        third = SpecExtractor(self.tmp.name)
+        records = third.run()
+        self.assertEqual(third.summary(), {'extracted': 1, 'cached': 1, 'failed': 1})
+        self.assertIsNotNone(records[1]['error'])
+
+        # A failed extraction is not cached, so the next run tries it again
+        fourth = SpecExtractor(self.tmp.name)
+        fourth.run()
+        self.assertEqual(fourth.summary(), {'extracted': 1, 'cached': 1, 'failed': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+
+from bs4 import BeautifulSoup
+
+from watts_product_codes import INTERCEPTOR_CONTAINER_TERMS, ProductCodeExtractor
+
+BASE_URL = "https://www.watts.com"
+
+CATEGORY_PAGE = """
+<html><body>
+  <div class="product-card" data-product-id="FD-100-A">
+    <a href="/products/drainage-solutions/floor-drains/fd-100-a-floor-drain">Floor drain</a>
+  </div>
+  <article class="product-tile" data-product-id="sku-9">
+    <span>Model RD-200</span>
+    <a href="/products/drainage-solutions/roof-drains/rd-200">Roof drain</a>
+  </article>
+  <a href="/products/drainage-solutions/cleanouts/co-300">CO-300</a>
+  <a href="/products/drainage-solutions/floor-drains/fd-100-a-floor-drain">Duplicate</a>
+  <script type="application/json">{"models": ["TD-400", "co-300"]}</script>
+  <script>var ignored = "FS-999";</script>
+  <p>Also see GRD-110 and fd-100.</p>
+</body></html>
+"""
+
+
+class TestProductCodeExtractor(unittest.TestCase):
+    def setUp(self):
+        """Set up an extractor and a parsed category page"""
+        self.extractor = ProductCodeExtractor(BASE_URL)
+        self.soup = BeautifulSoup(CATEGORY_PAGE, 'html.parser')
+
+    def test_methods_and_order(self):
+        """Test hits come back in method order, each recording its method"""
+        hits = self.extractor.extract(self.soup)
+        self.assertEqual(
+            [(hit.product_code, hit.method) for hit in hits],
+            [("FD-100", "container"), ("RD-200", "container"), ("CO-300", "url"),
+             ("TD-400", "script"), ("GRD-110", "text")]
+        )
+
+    def test_first_method_decides_url(self):
+        """Test a model seen by several methods keeps the container's link"""
+        hits = {hit.product_code: hit for hit in self.extractor.extract(self.soup)}
+        self.assertEqual(hits["FD-100"].model, "FD-100-A-FLOOR-DRAIN")
+        self.assertEqual(hits["FD-100"].product_url,
+                         f"{BASE_URL}/products/drainage-solutions/floor-drains/fd-100-a-floor-drain")
+        self.assertEqual(hits["TD-400"].product_url, f"{BASE_URL}/products/drainage-solutions/td-400")
+
+    def test_variants_are_separate_products(self):
+        """Test variants sharing a base code are kept, and the bare code is dropped"""
+        soup = BeautifulSoup(
+            '<a href="/products/drainage-solutions/floor-area-drains/fd-100-a">A</a>'
+            '<a href="/products/drainage-solutions/floor-area-drains/fd-100-b">B</a>'
+            '<p>FD-100 family</p>', 'html.parser')
+        hits = self.extractor.extract(soup)
+        self.assertEqual([hit.model for hit in hits], ["FD-100-A", "FD-100-B"])
+        self.assertEqual({hit.product_code for hit in hits}, {"FD-100"})
+
+    def test_plain_scripts_are_not_page_text(self):
+        """Test non-JSON script bodies are not mined for models"""
+        codes = {hit.product_code for hit in self.extractor.extract(self.soup)}
+        self.assertNotIn("FS-999", codes)
+
+    def test_interceptor_grid_items(self):
+        """Test interceptor grids also treat grid-item classes as containers"""
+        soup = BeautifulSoup(
+            '<div class="grid-item" data-product-id="x"><b>IN-1</b> <i>FD-500</i>'
+            '<a href="/products/interceptors/fd-500">FD</a></div>', 'html.parser')
+        hits = self.extractor.extract(soup, container_terms=INTERCEPTOR_CONTAINER_TERMS)
+        self.assertEqual(hits[0].method, "container")
+        self.assertEqual(hits[0].product_url, f"{BASE_URL}/products/interceptors/fd-500")
+
+    def test_grid_card_description(self):
+        """Test the description line of a grid card is kept with its product"""
+        soup = BeautifulSoup(
+            '<a href="/products/drainage-solutions/floor-area-drains/fd-100-a" class="grid-item">'
+            '<p class="grid-item__heading">FD-100-A</p>'
+            '<p class="grid-item__paragraph">\n  Floor Drain with Round Strainer\n</p></a>'
+            '<a href="/products/drainage-solutions/floor-area-drains/fd-100-b">FD-100-B</a>', 'html.parser')
+        hits = self.extractor.extract(soup)
+        self.assertEqual([(hit.model, hit.description) for hit in hits],
+                         [("FD-100-A", "Floor Drain with Round Strainer"), ("FD-100-B", "")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import email.utils
+import time
+import unittest
+
+from watts_rate_limiter import AdaptiveRateLimiter, parse_retry_after
+
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+    def setUp(self):
+        """Set up a limiter starting at one request every 3 seconds"""
+        self.limiter = AdaptiveRateLimiter(min_delay=0.5, max_delay=15, initial_delay=3)
+
+    def test_speeds_up_while_healthy(self):
+        """Test healthy responses raise the rate up to 1/min_delay"""
+        for _ in range(200):
+            self.limiter.record(status=200, elapsed=0.2)
+        self.assertAlmostEqual(self.limiter.current_delay, 0.5)
+        self.assertEqual(self.limiter.backoffs, 0)
+
+    def test_backs_off_on_throttling(self):
+        """Test 429/503 halve the rate without dropping below 1/max_delay"""
+        self.limiter.record(status=429)
+        self.assertAlmostEqual(self.limiter.current_delay, 6)
+        for _ in range(10):
+            self.limiter.record(status=503)
+        self.assertAlmostEqual(self.limiter.current_delay, 15)
+        self.assertEqual(self.limiter.metrics()['throttled_responses'], 11)
+
+    def test_backs_off_on_slow_pages(self):
+        """Test slow browser page loads count as a backoff signal"""
+        self.limiter.record(elapsed=30)
+        self.assertEqual(self.limiter.slow_responses, 1)
+        self.assertAlmostEqual(self.limiter.current_delay, 6)
+
+    def test_client_errors_do_not_speed_up(self):
+        """Test a 404 neither speeds up nor backs off"""
+        delay = self.limiter.current_delay
+        self.limiter.record(status=404)
+        self.assertEqual(self.limiter.current_delay, delay)
+
+    def test_reservations_are_spaced_by_rate(self):
+        """Test back-to-back reservations wait one interval each"""
+        limiter = AdaptiveRateLimiter(min_delay=0.1, max_delay=1, initial_delay=0.5)
+        self.assertEqual(limiter.reserve(), 0)
+        self.assertAlmostEqual(limiter.reserve(), 0.5, places=1)
+        self.assertAlmostEqual(limiter.reserve(), 1.0, places=1)
+
+    def test_retry_after_blocks_requests(self):
+        """Test a Retry-After header delays the next reservation"""
+        self.limiter.record(status=503, retry_after=4)
+        self.assertGreaterEqual(self.limiter.reserve(), 3.5)
+        self.assertEqual(self.limiter.retry_after_waits, 1)
+
+
+class TestParseRetryAfter(unittest.TestCase):
+    def test_seconds(self):
+        self.assertEqual(parse_retry_after("120"), 120)
+
+    def test_http_date(self):
+        when = email.utils.formatdate(time.time() + 60, usegmt=True)
+        self.assertAlmostEqual(parse_retry_after(when), 60, delta=2)
+
+    def test_missing_or_invalid(self):
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import json
+import unittest
+from unittest.mock import MagicMock
+
+from watts_readiness import PageReadiness
+
+
+def perf_entry(method, request_id):
+    return {'message': json.dumps({'message': {'method': method, 'params': {'requestId': request_id}}})}
+
+
+class TestPageReadiness(unittest.TestCase):
+    def setUp(self):
+        """Set up a fast-polling readiness helper and a mock driver"""
+        self.readiness = PageReadiness(poll=0.01)
+        self.driver = MagicMock()
+
+    def test_network_idle_after_requests_finish(self):
+        """Test idle is reported once every started request has finished"""
+        self.driver.get_log.side_effect = [
+            [perf_entry('Network.requestWillBeSent', '1'), perf_entry('Network.requestWillBeSent', '2')],
+            [perf_entry('Network.loadingFinished', '1')],
+            [perf_entry('Network.loadingFailed', '2')],
+        ] + [[]] * 100
+
+        self.assertTrue(self.readiness.network_idle(self.driver, timeout=2, idle_time=0.05, replaces=15))
+        self.assertEqual(self.readiness.timeouts, 0)
+        self.assertGreater(self.readiness.saved_seconds, 13)
+
+    def test_network_idle_times_out_with_pending_request(self):
+        """Test a request that never finishes keeps the page busy"""
+        self.driver.get_log.side_effect = [[perf_entry('Network.requestWillBeSent', '1')]] + [[]] * 100
+        self.assertFalse(self.readiness.network_idle(self.driver, timeout=0.2, idle_time=0.05))
+        self.assertEqual(self.readiness.timeouts, 1)
+
+    def test_network_idle_falls_back_to_ready_state(self):
+        """Test drivers without a performance log fall back to readyState"""
+        self.driver.get_log.side_effect = Exception("performance log not enabled")
+        self.driver.execute_script.return_value = 'complete'
+        self.assertTrue(self.readiness.network_idle(self.driver, timeout=1))
+
+    def test_stable_count_waits_for_grid_to_settle(self):
+        """Test the element count must stop changing before returning"""
+        self.driver.find_elements.side_effect = [[]] * 2 + [[1] * 10] * 2 + [[1] * 30] * 100
+        count = self.readiness.stable_count(self.driver, ".grid-item", timeout=2, settle=0.05)
+        self.assertEqual(count, 30)
+
+    def test_present(self):
+        """Test presence waits return as soon as the element exists"""
+        self.driver.find_elements.side_effect = [[], [], [MagicMock()]]
+        self.assertTrue(self.readiness.present(self.driver, "//a", timeout=1, replaces=5))
+        self.assertEqual(self.readiness.summary()['waits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
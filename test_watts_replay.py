@@ -0,0 +1,328 @@
+import glob
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import requests
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from watts_job_queue import JobQueue
+from watts_replay import ReplayCorpus, ReplayDriver, ReplayServer, build_replay_scraper, css_to_xpath
+
+FLOOR_DRAINS = "/products/drainage-solutions/floor-drains-channels-trench/floor-area-drains"
+
+
+class TestReplayCorpus(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Index the saved pages once"""
+        cls.corpus = ReplayCorpus()
+        cls.corpus.add_category("Floor & Area Drains", f"https://www.watts.com{FLOOR_DRAINS}")
+
+    def test_category_uses_richest_snapshot(self):
+        """Test the rendered grid is preferred over empty template snapshots"""
+        status, page = self.corpus.page(FLOOR_DRAINS)
+        self.assertEqual(status, 200)
+        self.assertIn(f"{FLOOR_DRAINS}/fd-100-a", page)
+
+    def test_unsaved_products_use_template(self):
+        """Test product pages without a snapshot swap the model into the saved one"""
+        status, page = self.corpus.page(f"{FLOOR_DRAINS}/fd-1200-a")
+        self.assertEqual(status, 200)
+        self.assertIn("es-wd-fd-1200-a-pdf", page)
+        self.assertNotIn("es-wd-fd-100-a-pdf", page)
+
+    def test_unknown_paths_are_not_found(self):
+        """Test other paths get the saved 404 page"""
+        status, page = self.corpus.page("/products/nothing-here")
+        self.assertEqual(status, 404)
+        self.assertIn("404", page)
+
+
+class TestReplayDriver(unittest.TestCase):
+    def setUp(self):
+        """Load a saved product page into a replay driver"""
+        self.driver = ReplayDriver(ReplayCorpus())
+        self.driver.get(f"https://www.watts.com{FLOOR_DRAINS}/fd-100-a")
+
+    def test_xpath_and_css(self):
+        """Test the locators the scrapers use work on saved pages"""
+        links = self.driver.find_elements(By.XPATH, "//a[contains(@class, 'product-download__link')]")
+        self.assertIn("Specification Sheet - FD-100-A", [link.text for link in links])
+        self.assertTrue(all(link.get_attribute('href').startswith("https://www.watts.com/") for link in links))
+        self.assertTrue(self.driver.find_elements(By.CSS_SELECTOR, "[class*='product-'], [id*='product-']"))
+        with self.assertRaises(NoSuchElementException):
+            self.driver.find_element(By.ID, "no-such-id")
+
+    def test_css_to_xpath(self):
+        """Test simple selector groups translate to XPath unions"""
+        self.assertEqual(
+            css_to_xpath("a.x, [data-id]"),
+            "descendant-or-self::a[contains(concat(' ', normalize-space(@class), ' '), ' x ')]"
+            " | descendant-or-self::*[@data-id]"
+        )
+        with self.assertRaises(NotImplementedError):
+            css_to_xpath("div > a")
+
+
+class TestReplayRun(unittest.TestCase):
+    def test_full_run_offline(self):
+        """Test run() crawls a saved category and downloads every spec sheet offline"""
+        with ReplayServer(ReplayCorpus()) as server, tempfile.TemporaryDirectory() as tmp:
+            output_dir = os.path.join(tmp, "watts_specs")
+            scraper = build_replay_scraper(server, output_dir, rate=500, download_workers=4)
+            self.assertEqual(requests.get(f"{server.base_url}{FLOOR_DRAINS}").status_code, 200)
+            try:
+                scraper.run(category_index=0)
+            finally:
+                scraper.__del__()
+
+            pdfs = glob.glob(os.path.join(output_dir, "Floor & Area Drains", "*.pdf"))
+            self.assertEqual(len(pdfs), 30)
+            self.assertEqual(scraper.resolution_counts['static'], 30)
+            self.assertEqual(scraper.listing_counts, {'api': 1, 'browser': 0})
+            self.assertEqual(server.corpus.served['browser_page'], 0)
+            self.assertEqual(scraper.failed_downloads, [])
+            self.assertEqual(scraper.blobs.summary()['stored'], 1)
+
+            reports = glob.glob(os.path.join(tmp, "watts_specs_run_*.json"))
+            self.assertEqual(len(reports), 1)
+            with open(reports[0]) as f:
+                report = json.load(f)
+            self.assertEqual(report['products'], 30)
+            self.assertEqual(report['spans']['spec_resolution']['count'], 30)
+            self.assertEqual(report['categories']['Floor & Area Drains']['download']['count'], 30)
+
+    def test_scrape_category_alone(self):
+        """Test scrape_category() sets up, crawls and reports one category like run()"""
+        with ReplayServer(ReplayCorpus()) as server, tempfile.TemporaryDirectory() as tmp:
+            output_dir = os.path.join(tmp, "watts_specs")
+            scraper = build_replay_scraper(server, output_dir, rate=500)
+            try:
+                scraper.scrape_category(*scraper.drainage_categories[0])
+            finally:
+                scraper.__del__()
+
+            self.assertEqual(len(glob.glob(os.path.join(output_dir, "Floor & Area Drains", "*.pdf"))), 30)
+            self.assertEqual(scraper.catalog.summary()['added'], 30)
+            self.assertTrue(os.path.exists(os.path.join(output_dir, "Floor & Area Drains", "manifest.json")))
+            self.assertEqual(len(glob.glob(os.path.join(tmp, "watts_specs_changes_*.jsonl"))), 1)
+
+    def test_browser_listing_without_api(self):
+        """Test the category is rendered in the browser when the listing API is off"""
+        with ReplayServer(ReplayCorpus()) as server, tempfile.TemporaryDirectory() as tmp:
+            output_dir = os.path.join(tmp, "watts_specs")
+            scraper = build_replay_scraper(server, output_dir, rate=500, download_workers=4, listing_api=False)
+            try:
+                scraper.run(category_index=0)
+            finally:
+                scraper.__del__()
+
+            self.assertEqual(len(glob.glob(os.path.join(output_dir, "Floor & Area Drains", "*.pdf"))), 30)
+            self.assertEqual(scraper.listing_counts, {'api': 0, 'browser': 1})
+            self.assertEqual(server.corpus.served['search'], 0)
+            self.assertIn('cookie_consent', scraper.metrics.spans)
+
+            # The next run's browsers start from the saved session
+            pages = server.corpus.served['page']
+            rerun = build_replay_scraper(server, output_dir, rate=500)
+            try:
+                rerun._init_session()
+                rerun.browser.driver
+            finally:
+                rerun.__del__()
+            self.assertTrue(rerun.session_bridge.consent)
+            self.assertNotIn('cookie_consent', rerun.metrics.spans)
+            self.assertEqual(server.corpus.served['page'], pages)
+
+    def test_full_run_on_worker_pool(self):
+        """Test the category's listing and product tasks are shared by pool browsers"""
+        with ReplayServer(ReplayCorpus()) as server, tempfile.TemporaryDirectory() as tmp:
+            output_dir = os.path.join(tmp, "watts_specs")
+            scraper = build_replay_scraper(server, output_dir, rate=500, workers=3, download_workers=4)
+            try:
+                scraper.run(category_index=0)
+            finally:
+                summary = scraper._browser_summary()
+                scraper.__del__()
+
+            self.assertEqual(len(glob.glob(os.path.join(output_dir, "Floor & Area Drains", "*.pdf"))), 30)
+            self.assertEqual(scraper.failed_downloads, [])
+            self.assertEqual(summary['main']['launches'], 0)
+            self.assertEqual(summary['pool']['browsers'], 3)
+
+    def test_interrupted_run_resumes(self):
+        """Test --resume finishes an interrupted category without listing it or visiting done products again"""
+        with ReplayServer(ReplayCorpus()) as server, tempfile.TemporaryDirectory() as tmp:
+            output_dir = os.path.join(tmp, "watts_specs")
+            scraper = build_replay_scraper(server, output_dir, rate=500, download_workers=4)
+            process_product = scraper._process_product
+
+            def interrupt_after_ten(*args):
+                if sum(scraper.resolution_counts.values()) == 10:
+                    raise KeyboardInterrupt
+                return process_product(*args)
+
+            scraper._process_product = interrupt_after_ten
+            try:
+                with self.assertRaises(KeyboardInterrupt):
+                    scraper.run(category_index=0)
+            finally:
+                scraper.__del__()
+            self.assertEqual(scraper.checkpoint.summary()['items']['product'], {'done': 10, 'in_flight': 1, 'pending': 19})
+
+            searches = server.corpus.served['search']
+            resumed = build_replay_scraper(server, output_dir, rate=500, download_workers=4)
+            try:
+                resumed.run(category_index=0, resume=True)
+            finally:
+                resumed.__del__()
+
+            self.assertEqual(resumed.checkpoint.run_id, scraper.checkpoint.run_id)
+            self.assertEqual(sum(resumed.resolution_counts.values()), 20)
+            self.assertEqual(server.corpus.served['search'], searches)
+            self.assertEqual(len(glob.glob(os.path.join(output_dir, "Floor & Area Drains", "*.pdf"))), 30)
+            self.assertEqual(resumed.checkpoint.summary()['items'],
+                             {'category': {'done': 1}, 'product': {'done': 30}, 'download': {'done': 30}})
+
+    def test_queue_workers_share_the_crawl(self):
+        """Test two queue workers split the category's products and downloads, each done once"""
+        with ReplayServer(ReplayCorpus()) as server, tempfile.TemporaryDirectory() as tmp:
+            output_dir = os.path.join(tmp, "watts_specs")
+            queue_path = os.path.join(tmp, "jobs.db")
+            workers = [build_replay_scraper(server, output_dir, rate=500, download_workers=2) for _ in range(2)]
+            threads = [threading.Thread(target=worker.run_worker, args=(queue_path, 0)) for worker in workers]
+            try:
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            finally:
+                for worker in workers:
+                    worker.__del__()
+
+            self.assertEqual(len(glob.glob(os.path.join(output_dir, "Floor & Area Drains", "*.pdf"))), 30)
+            self.assertEqual(sum(sum(worker.resolution_counts.values()) for worker in workers), 30)
+            self.assertEqual(sum(worker.listing_counts['api'] for worker in workers), 1)
+            self.assertEqual(server.corpus.served['pdf'], 30)
+            queue = JobQueue(queue_path)
+            try:
+                self.assertEqual(queue.counts(),
+                                 {'category': {'done': 1}, 'product': {'done': 30}, 'download': {'done': 30}})
+            finally:
+                queue.close()
+            with open(os.path.join(output_dir, "Floor & Area Drains", "manifest.json")) as f:
+                self.assertEqual(len(json.load(f)), 30)
+            # Reports and feeds are named per worker process, never shared
+            self.assertTrue(glob.glob(os.path.join(tmp, f"watts_specs_run_*_{workers[0].worker_name}.json")))
+            self.assertTrue(glob.glob(os.path.join(tmp, f"watts_specs_changes_*_{workers[0].worker_name}.jsonl")))
+
+    def test_existing_files_are_adopted(self):
+        """Test spec sheets already on disk without crawl state are stored, not downloaded again"""
+        with ReplayServer(ReplayCorpus()) as server, tempfile.TemporaryDirectory() as tmp:
+            first_dir, output_dir = os.path.join(tmp, "first"), os.path.join(tmp, "watts_specs")
+            scraper = build_replay_scraper(server, first_dir, rate=500)
+            try:
+                scraper.run(category_index=0)
+            finally:
+                scraper.__del__()
+            category_dir = os.path.join(output_dir, "Floor & Area Drains")
+            os.makedirs(category_dir)
+            for pdf in glob.glob(os.path.join(first_dir, "Floor & Area Drains", "*.pdf")):
+                shutil.copyfile(pdf, os.path.join(category_dir, os.path.basename(pdf)))
+
+            rerun = build_replay_scraper(server, output_dir, rate=500)
+            try:
+                rerun.run(category_index=0)
+            finally:
+                rerun.__del__()
+
+            self.assertEqual(server.corpus.served['pdf'], 30)
+            self.assertEqual(rerun.blobs.summary()['stored'], 1)
+            with open(os.path.join(category_dir, "manifest.json")) as f:
+                manifest = json.load(f)
+            self.assertEqual(len(manifest), 30)
+            self.assertTrue(all(entry.get('url') for entry in manifest.values()))
+
+    def test_queued_downloads_of_a_shared_spec_sheet(self):
+        """Test products sharing one spec URL each get a download job and their own file"""
+        with ReplayServer(ReplayCorpus()) as server, tempfile.TemporaryDirectory() as tmp:
+            output_dir = os.path.join(tmp, "watts_specs")
+            queue_path = os.path.join(tmp, "jobs.db")
+            scraper = build_replay_scraper(server, output_dir, rate=500)
+            scraper.get_spec_sheet_url = lambda product_url: f"{server.base_url}/dfsmedia/abc/es-wd-fd-100-pdf"
+            try:
+                scraper.run_worker(queue_path, 0)
+            finally:
+                scraper.__del__()
+
+            self.assertEqual(len(glob.glob(os.path.join(output_dir, "Floor & Area Drains", "*.pdf"))), 30)
+            queue = JobQueue(queue_path)
+            try:
+                self.assertEqual(queue.counts()['download'], {'done': 30})
+            finally:
+                queue.close()
+
+    def test_products_without_spec_sheets_are_finished(self):
+        """Test products whose page has no spec sheet are done, not failed and retried"""
+        with ReplayServer(ReplayCorpus()) as server, tempfile.TemporaryDirectory() as tmp:
+            output_dir = os.path.join(tmp, "watts_specs")
+            queue_path = os.path.join(tmp, "jobs.db")
+            scraper = build_replay_scraper(server, output_dir, rate=500)
+            scraper.get_spec_sheet_url = lambda product_url: None
+            try:
+                scraper.run(category_index=0)
+                self.assertEqual(scraper.checkpoint.summary()['items']['product'], {'done': 30})
+                scraper.run_worker(queue_path, 0)
+                # The next night's worker on the same queue crawls the category again
+                scraper.run_worker(queue_path, 0)
+            finally:
+                scraper.__del__()
+
+            self.assertEqual(scraper.listing_counts['api'], 3)
+            queue = JobQueue(queue_path)
+            try:
+                self.assertEqual(queue.run_id, 2)
+                self.assertEqual(queue.counts()['product'], {'done': 30})
+            finally:
+                queue.close()
+
+    def test_rerun_visits_only_changes(self):
+        """Test a second run only visits products whose listing changed"""
+        with ReplayServer(ReplayCorpus()) as server, tempfile.TemporaryDirectory() as tmp:
+            output_dir = os.path.join(tmp, "watts_specs")
+            scraper = build_replay_scraper(server, output_dir, rate=500, download_workers=4)
+            try:
+                scraper.run(category_index=0)
+                product_url = next(iter(scraper.state.get_catalog("Floor & Area Drains")))
+                scraper.state.replace_catalog("Floor & Area Drains", [
+                    (product_url, "FD-100", "Old description"),
+                    (f"{server.base_url}/products/drainage-solutions/fd-999", "FD-999", "Discontinued"),
+                ] + [(url, row['product_code'], row['description'])
+                     for url, row in scraper.state.get_catalog("Floor & Area Drains").items() if url != product_url])
+            finally:
+                scraper.__del__()
+
+            rerun = build_replay_scraper(server, output_dir, rate=500, download_workers=4)
+            try:
+                rerun.run(category_index=0)
+            finally:
+                rerun.__del__()
+
+            self.assertEqual(rerun.catalog.summary(), {'added': 0, 'removed': 1, 'changed': 1, 'unchanged': 29})
+            self.assertEqual(sum(rerun.resolution_counts.values()), 1)
+            feeds = sorted(glob.glob(os.path.join(tmp, "watts_specs_changes_*.jsonl")))
+            with open(feeds[-1]) as f:
+                changes = [json.loads(line) for line in f]
+            self.assertEqual({(change['change'], change['product_url']) for change in changes}, {
+                ('changed', product_url),
+                ('removed', f"{server.base_url}/products/drainage-solutions/fd-999"),
+            })
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import base64
+import hashlib
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from watts_blob_store import BlobStore
+from watts_crawl_state import CrawlState
+from watts_pdf_check import PdfCheckError
+from watts_resume import RangeError, ResumableDownload, expected_sha256, parse_content_range
+
+PDF_BYTES = b"%PDF-1.4\n" + bytes(range(256)) * 400 + b"\nstartxref\n9\n%%EOF\n"
+DIGEST = base64.b64encode(hashlib.sha256(PDF_BYTES).digest()).decode()
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Serves PDF_BYTES with Range support; /flaky drops the first response halfway"""
+    protocol_version = "HTTP/1.1"
+    ranges = []
+    dropped = set()
+    etag = '"v1"'
+
+    def do_GET(self):
+        requested = self.headers.get("Range")
+        type(self).ranges.append(requested)
+        start = 0
+        if requested and self.headers.get("If-Range") == self.etag:
+            start = int(requested.split("=")[1].rstrip("-"))
+
+        body = PDF_BYTES[start:]
+        self.send_response(206 if start else 200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", self.etag)
+        digest = DIGEST if "bad-digest" not in self.path else base64.b64encode(b"0" * 32).decode()
+        self.send_header("Repr-Digest", f"sha-256=:{digest}:")
+        if start:
+            self.send_header("Content-Range", f"bytes {start}-{len(PDF_BYTES) - 1}/{len(PDF_BYTES)}")
+        self.end_headers()
+
+        if self.path.startswith("/flaky") and self.path not in self.dropped:
+            type(self).dropped.add(self.path)
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHeaders(unittest.TestCase):
+    def test_content_range(self):
+        """Test Content-Range is parsed into first byte and total length"""
+        self.assertEqual(parse_content_range("bytes 100-199/200"), (100, 200))
+        self.assertEqual(parse_content_range("bytes 100-199/*"), (100, None))
+        self.assertEqual(parse_content_range(None), (None, None))
+
+    def test_digest_headers(self):
+        """Test both digest header forms give the hex SHA-256"""
+        expected = hashlib.sha256(PDF_BYTES).hexdigest()
+        self.assertEqual(expected_sha256({'Repr-Digest': f"sha-256=:{DIGEST}:"}), expected)
+        self.assertEqual(expected_sha256({'Digest': f"SHA-256={DIGEST}"}), expected)
+        self.assertIsNone(expected_sha256({}))
+
+
+class TestResumableDownload(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Serve PDFs with Range support from a local HTTP server"""
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """Create a blob store and crawl state in a scratch directory"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.blobs = BlobStore(self.tmp.name)
+        self.state = CrawlState(os.path.join(self.tmp.name, "crawl_state.db"))
+        RangeHandler.ranges = []
+        RangeHandler.etag = '"v1"'
+
+    def tearDown(self):
+        self.state.close()
+        self.tmp.cleanup()
+
+    def fetch(self, url):
+        with ResumableDownload(self.blobs, url, self.state) as download:
+            response = requests.get(url, stream=True, headers=download.request_headers())
+            download.begin(response.status_code, response.headers)
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=4096):
+                download.feed(chunk)
+            return download.finish(), download.resumed_from
+
+    def test_interrupted_download_resumes(self):
+        """Test a dropped transfer keeps its .part file and resumes with a Range request"""
+        url = f"{self.base}/flaky-1.pdf"
+        with self.assertRaises(requests.exceptions.RequestException):
+            self.fetch(url)
+        partial_size = os.path.getsize(self.blobs.partial_path(url))
+        self.assertGreater(partial_size, 0)
+        self.assertEqual(self.state.get_partial(url)['etag'], '"v1"')
+
+        digest, resumed_from = self.fetch(url)
+        self.assertEqual(digest, hashlib.sha256(PDF_BYTES).hexdigest())
+        self.assertEqual(resumed_from, partial_size)
+        self.assertEqual(RangeHandler.ranges[-1], f"bytes={partial_size}-")
+        self.assertFalse(os.path.exists(self.blobs.partial_path(url)))
+        self.assertIsNone(self.state.get_partial(url))
+
+    def test_changed_document_restarts(self):
+        """Test a .part file of an older version is replaced, not appended to"""
+        url = f"{self.base}/flaky-2.pdf"
+        with self.assertRaises(requests.exceptions.RequestException):
+            self.fetch(url)
+        RangeHandler.etag = '"v2"'
+
+        digest, resumed_from = self.fetch(url)
+        self.assertEqual(resumed_from, 0)
+        self.assertEqual(digest, hashlib.sha256(PDF_BYTES).hexdigest())
+
+    def test_checksum_mismatch_discards(self):
+        """Test a document whose SHA-256 does not match the server's digest is dropped"""
+        url = f"{self.base}/bad-digest.pdf"
+        with self.assertRaises(PdfCheckError):
+            self.fetch(url)
+        self.assertFalse(os.path.exists(self.blobs.partial_path(url)))
+        self.assertEqual(self.blobs.summary()['stored'], 0)
+
+    def test_misplaced_range_restarts(self):
+        """Test a 206 starting at the wrong byte drops the .part file and names the offset asked for"""
+        url = f"{self.base}/misplaced.pdf"
+        with open(self.blobs.partial_path(url), 'wb') as f:
+            f.write(PDF_BYTES[:100])
+        with ResumableDownload(self.blobs, url, self.state) as download:
+            with self.assertRaisesRegex(RangeError, "Asked for byte 100, got 50"):
+                download.begin(206, {'Content-Range': f"bytes 50-{len(PDF_BYTES) - 1}/{len(PDF_BYTES)}"})
+            self.assertEqual(download.writer.offset, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
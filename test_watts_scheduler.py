@@ -0,0 +1,125 @@
+import threading
+import time
+import unittest
+
+from watts_scheduler import TaskGroup, WorkStealingScheduler
+
+
+class TestWorkStealingScheduler(unittest.TestCase):
+    def test_spawned_tasks_run_before_run_returns(self):
+        """Test tasks spawned by running tasks are part of the same run"""
+        scheduler = WorkStealingScheduler(workers=3)
+        seen = []
+        lock = threading.Lock()
+
+        def visit(depth, name):
+            with lock:
+                seen.append(name)
+            if depth:
+                for n in range(3):
+                    scheduler.spawn(visit, depth - 1, f"{name}.{n}")
+
+        scheduler.spawn(visit, 2, "root")
+        scheduler.run()
+        self.assertEqual(len(seen), 1 + 3 + 9)
+        self.assertEqual(sum(scheduler.summary()['executed']), 13)
+
+    def test_idle_workers_steal_a_big_backlog(self):
+        """Test one worker's backlog is shared out instead of run by that worker alone"""
+        scheduler = WorkStealingScheduler(workers=4)
+        threads = set()
+        lock = threading.Lock()
+
+        def page():
+            time.sleep(0.01)
+            with lock:
+                threads.add(threading.current_thread().name)
+
+        def big_category():
+            for _ in range(20):
+                scheduler.spawn(page)
+
+        scheduler.spawn(big_category)
+        scheduler.run()
+        self.assertGreater(scheduler.stolen, 0)
+        self.assertGreater(len(threads), 1)
+
+    def test_small_category_is_not_stuck_behind_a_big_one(self):
+        """Test a short category finishes while a long one still has pages queued"""
+        scheduler = WorkStealingScheduler(workers=2)
+        finished = {}
+        start = time.monotonic()
+
+        def page(category, seconds):
+            time.sleep(seconds)
+
+        def done(category):
+            finished[category] = time.monotonic() - start
+
+        big = TaskGroup(scheduler, on_done=lambda: done('big'))
+        small = TaskGroup(scheduler, on_done=lambda: done('small'))
+        for _ in range(10):
+            big.spawn(page, 'big', 0.02)
+        small.spawn(page, 'small', 0.01)
+        scheduler.run()
+        self.assertLess(finished['small'], finished['big'])
+
+    def test_deferred_tasks_do_not_hold_a_worker(self):
+        """Test a task spawned with a delay lets other work run first and still finishes the run"""
+        scheduler = WorkStealingScheduler(workers=1)
+        order = []
+        group = TaskGroup(scheduler, on_done=lambda: order.append('done'))
+        start = time.monotonic()
+        group.spawn_after(0.2, order.append, 'retry')
+        for n in range(3):
+            group.spawn(order.append, n)
+        scheduler.run()
+        self.assertEqual(order, [2, 1, 0, 'retry', 'done'])
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+    def test_group_completes_after_its_subtree(self):
+        """Test on_done runs once, after nested group tasks, and what it spawns still runs"""
+        scheduler = WorkStealingScheduler(workers=2)
+        order = []
+
+        def listing(group, depth):
+            order.append(('list', depth))
+            if depth:
+                group.spawn(listing, group, depth - 1)
+
+        def listed():
+            order.append('listed')
+            scheduler.spawn(order.append, 'product')
+
+        group = TaskGroup(scheduler, on_done=listed)
+        group.spawn(listing, group, 2)
+        scheduler.run()
+        self.assertEqual(order, [('list', 2), ('list', 1), ('list', 0), 'listed', 'product'])
+
+    def test_errors_are_counted_not_raised(self):
+        """Test a failing task does not stop the rest"""
+        scheduler = WorkStealingScheduler(workers=1)
+        ran = []
+
+        def fail():
+            raise ValueError("boom")
+
+        scheduler.spawn(fail)
+        scheduler.spawn(ran.append, 1)
+        scheduler.run()
+        self.assertEqual(ran, [1])
+        self.assertEqual(scheduler.summary()['failed'], 1)
+
+    def test_no_worker_could_start(self):
+        """Test run() reports tasks left behind when every worker failed to start"""
+        def no_browser():
+            raise RuntimeError("chrome missing")
+
+        scheduler = WorkStealingScheduler(workers=2, worker_init=no_browser)
+        scheduler.spawn(print, "never")
+        with self.assertRaises(RuntimeError):
+            scheduler.run()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import json
+import os
+import stat
+import tempfile
+import time
+import unittest
+
+import httpx
+
+from watts_replay import ReplayCorpus, ReplayDriver
+from watts_session_bridge import CONSENT_COOKIE, TOKEN_HEADER, SessionBridge, find_token
+
+BASE_URL = "https://www.watts.com"
+
+
+class _Browser(ReplayDriver):
+    """Replay driver that reports a headless Chrome user agent"""
+
+    def execute_script(self, script, *args):
+        if 'navigator.userAgent' in script:
+            return "Mozilla/5.0 (X11; Linux x86_64) HeadlessChrome/126.0.0.0 Safari/537.36"
+        return super().execute_script(script, *args)
+
+
+class TestSessionBridge(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "session_state.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_browser_session_reaches_the_http_client(self):
+        """Test consent cookies, user agent and token go from a browser to the HTTP client"""
+        browser = _Browser(ReplayCorpus())
+        browser.page_source = '<input name="__RequestVerificationToken" type="hidden" value="tok-1" />'
+        browser.add_cookie({'name': CONSENT_COOKIE, 'value': '2026-10-17', 'domain': '.watts.com', 'path': '/'})
+        browser.add_cookie({'name': 'other', 'value': 'x', 'domain': '.example.com', 'path': '/'})
+
+        bridge = SessionBridge(self.path, BASE_URL)
+        bridge.capture_browser(browser)
+        client = httpx.Client()
+        bridge.apply_to_client(client)
+
+        self.assertTrue(bridge.consent)
+        self.assertEqual(client.cookies.get(CONSENT_COOKIE), '2026-10-17')
+        self.assertIsNone(client.cookies.get('other'))
+        self.assertEqual(client.headers[TOKEN_HEADER], 'tok-1')
+        self.assertEqual(client.headers['User-Agent'], "Mozilla/5.0 (X11; Linux x86_64) Chrome/126.0.0.0 Safari/537.36")
+
+        fresh = _Browser(ReplayCorpus())
+        self.assertEqual(bridge.apply_to_browser(fresh), 1)
+        self.assertEqual(fresh.get_cookies()[0]['name'], CONSENT_COOKIE)
+
+    def test_saved_session_expires(self):
+        """Test a saved session drops expired cookies and is ignored once too old"""
+        bridge = SessionBridge(self.path, BASE_URL)
+        client = httpx.Client()
+        client.cookies.set('ASP.NET_SessionId', 'abc', domain='www.watts.com')
+        bridge.capture_client(client, token='tok-2')
+        bridge._merge([{'name': 'stale', 'value': '1', 'domain': 'www.watts.com', 'expiry': int(time.time()) - 60}])
+        bridge.save()
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+
+        loaded = SessionBridge(self.path, BASE_URL)
+        self.assertTrue(loaded.load())
+        self.assertEqual([name for name, _, _ in loaded.cookies], ['ASP.NET_SessionId'])
+        self.assertEqual(loaded.token, 'tok-2')
+        self.assertFalse(loaded.consent)
+
+        with open(self.path) as f:
+            saved = json.load(f)
+        saved['saved_at'] -= 2 * 3600
+        with open(self.path, 'w') as f:
+            json.dump(saved, f)
+        self.assertFalse(SessionBridge(self.path, BASE_URL, max_age=3600).load())
+
+    def test_token_attribute_order(self):
+        """Test the token is found whichever attribute comes first"""
+        self.assertEqual(find_token('<input value="a" type="hidden" name="__RequestVerificationToken">'), 'a')
+        self.assertIsNone(find_token('<input name="q" value="b">'))
+
+
+if __name__ == '__main__':
+    unittest.main()
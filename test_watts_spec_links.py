@@ -0,0 +1,40 @@
+import unittest
+
+from watts_spec_links import find_spec_sheet_link
+
+
+class TestFindSpecSheetLink(unittest.TestCase):
+    base_url = "https://www.watts.com"
+
+    def test_captured_product_page(self):
+        """Test the spec sheet link is found in a saved product page"""
+        with open("debug_product_page_1744851443.html", encoding="utf-8") as f:
+            html = f.read()
+        self.assertEqual(
+            find_spec_sheet_link(html, self.base_url),
+            "https://www.watts.com/dfsmedia/0533dbba17714b1ab581ab07a4cbb521/14033-source/es-wd-fd-100-a-pdf"
+        )
+
+    def test_prefers_specification_sheet_label(self):
+        """Test a labelled spec sheet wins over other PDF downloads"""
+        html = """
+        <ul class="product-downloads">
+            <li><a class="product-download__link" href="/media/price-list.pdf">Price List</a></li>
+            <li><a class="product-download__link" href="/media/es-rd-100">Specification Sheet - RD-100</a></li>
+        </ul>
+        """
+        self.assertEqual(find_spec_sheet_link(html, self.base_url), "https://www.watts.com/media/es-rd-100")
+
+    def test_generic_spec_pdf_link(self):
+        """Test a plain PDF link mentioning a spec is used as a last resort"""
+        html = '<a href="https://cdn.example.com/co-200.pdf?v=2">CO-200 Spec</a>'
+        self.assertEqual(find_spec_sheet_link(html, self.base_url), "https://cdn.example.com/co-200.pdf?v=2")
+
+    def test_no_link(self):
+        """Test pages without download links fall through to the browser"""
+        html = '<div class="product-details"><a href="/products/fd-100">FD-100</a></div>'
+        self.assertIsNone(find_spec_sheet_link(html, self.base_url))
+
+
+if __name__ == '__main__':
+    unittest.main()
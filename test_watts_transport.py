@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from watts_rate_limiter import AdaptiveRateLimiter
+from watts_transport import ACCEPT_ENCODING, HttpTransport
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    failures = 0
+    seen = []
+
+    def do_GET(self):
+        type(self).seen.append((self.path, self.headers.get('Cookie'), self.headers.get('Accept-Encoding'),
+                                self.client_address[1]))
+        if self.path == '/flaky' and type(self).failures:
+            type(self).failures -= 1
+            status, body = 503, b'busy'
+        else:
+            status, body = 200, b'ok'
+        self.send_response(status)
+        if self.path == '/login':
+            self.send_header('Set-Cookie', 'session=abc; Path=/')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHttpTransport(unittest.TestCase):
+    def setUp(self):
+        """Serve a tiny site on localhost"""
+        _Handler.failures = 0
+        _Handler.seen = []
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.limiter = AdaptiveRateLimiter(min_delay=0.01, max_delay=1, initial_delay=0.01)
+        self.transport = HttpTransport(headers={'User-Agent': 'test'}, rate_limiter=self.limiter, backoff_factor=0.01)
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connections_are_kept_alive(self):
+        """Test repeated requests reuse one connection and advertise the decodable encodings"""
+        for _ in range(3):
+            self.transport.client.get(f"{self.base_url}/page")
+        self.assertEqual(len({port for *_, port in _Handler.seen}), 1)
+        self.assertEqual(_Handler.seen[0][2], ACCEPT_ENCODING)
+        self.assertEqual(self.limiter.responses, 3)
+
+    def test_throttled_responses_are_retried(self):
+        """Test 5xx responses are retried with back-off and fed to the rate limiter"""
+        _Handler.failures = 2
+        response = self.transport.client.get(f"{self.base_url}/flaky")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.limiter.throttled, 2)
+
+    def test_downloads_share_the_cookie_jar(self):
+        """Test the download pipeline's async client sends cookies set on the page client"""
+        self.transport.client.get(f"{self.base_url}/login")
+
+        async def download():
+            async with self.transport.async_client(2) as client:
+                await client.get(f"{self.base_url}/file.pdf")
+
+        asyncio.run(download())
+        self.assertEqual(_Handler.seen[-1][:2], ('/file.pdf', 'session=abc'))
+
+
+if __name__ == '__main__':
+    unittest.main()
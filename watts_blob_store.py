@@ -0,0 +1,292 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+BLOB_DIR = ".blobs"
+MANIFEST_NAME = "manifest.json"
+# Left in the blob directory once any output file had to be copied, not linked
+COPIES_MARKER = "copies"
+# Partial downloads nobody resumed for this long are removed by prune()
+PARTIAL_MAX_AGE = 7 * 24 * 3600
+
+
+class BlobWriter:
+    """Streams one download into the store's scratch space while hashing it
+
+    Without a key the scratch file is a fresh temporary file, removed if
+    the writer is not committed.  With a key (the download URL) it is that
+    key's .part file, opened for appending; it is kept when the download
+    fails so a later attempt can resume() it, and only discard() drops it.
+    """
+
+    def __init__(self, store: 'BlobStore', key: Optional[str] = None):
+        self.store = store
+        self.key = key
+        if key:
+            self.tmp_path = store.partial_path(key)
+            self._file = open(self.tmp_path, 'ab')
+        else:
+            fd, self.tmp_path = tempfile.mkstemp(dir=store.tmp_dir, suffix='.part')
+            self._file = os.fdopen(fd, 'wb')
+        self._hash = hashlib.sha256()
+        self.size = 0
+        self.digest = None
+        # Bytes left in the .part file by an earlier attempt
+        self.offset = self._file.tell()
+
+    def resume(self, sink: Optional[Callable[[bytes], None]] = None):
+        """Hash the bytes an earlier attempt left, passing each chunk to sink"""
+        self._file.flush()
+        with open(self.tmp_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                self._hash.update(chunk)
+                self.size += len(chunk)
+                if sink:
+                    sink(chunk)
+        self.offset = self.size
+
+    def restart(self):
+        """Drop any partial data and start again from byte zero"""
+        self._file.seek(0)
+        self._file.truncate()
+        self._hash = hashlib.sha256()
+        self.size = 0
+        self.offset = 0
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+    def write(self, chunk: bytes):
+        self._file.write(chunk)
+        self._hash.update(chunk)
+        self.size += len(chunk)
+
+    def commit(self) -> str:
+        """Move the data into the store (or drop it as a duplicate); returns its SHA-256"""
+        self._file.close()
+        self.digest = self._hash.hexdigest()
+        try:
+            self.store._commit(self.tmp_path, self.digest, self.size)
+        finally:
+            self.store._release(self.key)
+        return self.digest
+
+    def abort(self):
+        """Stop writing; a keyed .part file with data in it is kept for resuming"""
+        if self.key and self._file.tell():
+            self._file.close()
+            self.store._release(self.key)
+        else:
+            self.discard()
+
+    def discard(self):
+        """Stop writing and delete the scratch file"""
+        self._file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+        self.store._release(self.key)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.digest is None:
+            self.abort()
+
+
+class BlobStore:
+    """SHA-256 content-addressed store for downloaded spec sheets
+
+    Each distinct document is kept once under <root>/.blobs/ab/<sha256>.pdf.
+    The per-category files the scrapers expect are hard links to their blob
+    (copies where the filesystem cannot link), so the same PDF listed in
+    several categories costs one file's worth of disk.  Every linked file is
+    also recorded in its directory's manifest.json (file name -> sha256,
+    size, source URL), written out by write_manifests().
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.blob_dir = os.path.join(root, BLOB_DIR)
+        self.tmp_dir = os.path.join(self.blob_dir, "tmp")
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._manifests: Dict[str, Dict[str, Dict]] = {}
+        self._dirty = set()
+        self._writing = set()
+        self.stored = 0
+        self.duplicates = 0
+        self.bytes_saved = 0
+        self.copies = 0
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.blob_dir, digest[:2], f"{digest}.pdf")
+
+    def has(self, digest: Optional[str]) -> bool:
+        return bool(digest) and os.path.exists(self.blob_path(digest))
+
+    def partial_path(self, key: str) -> str:
+        return os.path.join(self.tmp_dir, f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.part")
+
+    def writer(self, key: Optional[str] = None) -> BlobWriter:
+        """Scratch writer; keyed by URL it resumes that URL's .part file
+
+        A key another writer is already using gets an anonymous writer, so
+        two downloads of the same URL never share a .part file.
+        """
+        if key:
+            with self._lock:
+                if key in self._writing:
+                    key = None
+                else:
+                    self._writing.add(key)
+        try:
+            return BlobWriter(self, key)
+        except BaseException:
+            self._release(key)
+            raise
+
+    def _release(self, key: Optional[str]):
+        if key:
+            with self._lock:
+                self._writing.discard(key)
+
+    def _commit(self, tmp_path: str, digest: str, size: int):
+        path = self.blob_path(digest)
+        with self._lock:
+            if os.path.exists(path):
+                os.remove(tmp_path)
+                self.duplicates += 1
+                self.bytes_saved += size
+                return
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+            self.stored += 1
+
+    def put_file(self, path: str, url: Optional[str] = None) -> str:
+        """Add an existing file to the store and link it back in place"""
+        with self.writer() as blob, open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                blob.write(chunk)
+            digest = blob.commit()
+        self.link(digest, path, url)
+        return digest
+
+    def link(self, digest: str, output_path: str, url: Optional[str] = None):
+        """Point output_path at a stored blob and record it in the manifest"""
+        blob = self.blob_path(digest)
+        directory = os.path.dirname(output_path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        if not (os.path.exists(output_path) and os.path.samefile(blob, output_path)):
+            tmp_path = os.path.join(directory, f".{os.path.basename(output_path)}.{threading.get_ident()}.link")
+            try:
+                os.link(blob, tmp_path)
+            except OSError:
+                shutil.copyfile(blob, tmp_path)
+                with self._lock:
+                    self.copies += 1
+                    if self.copies == 1:
+                        open(os.path.join(self.blob_dir, COPIES_MARKER), 'a').close()
+            os.replace(tmp_path, output_path)
+        self.record(output_path, digest, url)
+
+    def _manifest(self, directory: str) -> Dict[str, Dict]:
+        if directory not in self._manifests:
+            entries = {}
+            try:
+                with open(os.path.join(directory, MANIFEST_NAME), encoding='utf-8') as f:
+                    entries = json.load(f)
+            except (OSError, ValueError):
+                pass
+            self._manifests[directory] = entries
+        return self._manifests[directory]
+
+    def record(self, output_path: str, digest: str, url: Optional[str] = None):
+        directory, name = os.path.split(output_path)
+        entry = {'sha256': digest, 'size': os.path.getsize(self.blob_path(digest))}
+        if url:
+            entry['url'] = url
+        with self._lock:
+            self._manifest(directory or '.')[name] = entry
+            self._dirty.add(directory or '.')
+
+    def write_manifests(self):
+        """Write every changed directory's manifest.json
+
+        Entries another process wrote since the manifest was read are kept.
+        """
+        with self._lock:
+            dirty = [(directory, dict(self._manifests[directory])) for directory in self._dirty]
+            self._dirty.clear()
+        for directory, entries in dirty:
+            path = os.path.join(directory, MANIFEST_NAME)
+            try:
+                with open(path, encoding='utf-8') as f:
+                    entries = {**json.load(f), **entries}
+            except (OSError, ValueError):
+                pass
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(dict(sorted(entries.items())), f, indent=2)
+            os.replace(tmp_path, path)
+
+    def prune(self) -> int:
+        """Delete unused blobs and stale partial downloads; returns how many
+
+        Blobs are only pruned when every output file is a hard link, since
+        an unlinked blob is indistinguishable from one that was copied out:
+        not once any run made a copy, nor while a manifest lists a file that
+        is not a link to its blob.
+        """
+        removed = 0
+        cutoff = time.time() - PARTIAL_MAX_AGE
+        for name in os.listdir(self.tmp_dir):
+            path = os.path.join(self.tmp_dir, name)
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        if self._copies_exist():
+            return removed
+        for prefix in os.listdir(self.blob_dir):
+            directory = os.path.join(self.blob_dir, prefix)
+            if prefix == "tmp" or not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+                if os.stat(path).st_nlink == 1:
+                    os.remove(path)
+                    removed += 1
+        return removed
+
+    def _copies_exist(self) -> bool:
+        """Whether any output file, from this run or an earlier one, is a copy of its blob"""
+        if self.copies or os.path.exists(os.path.join(self.blob_dir, COPIES_MARKER)):
+            return True
+        for directory, subdirectories, files in os.walk(self.root):
+            subdirectories[:] = [name for name in subdirectories if name != BLOB_DIR]
+            if MANIFEST_NAME not in files:
+                continue
+            try:
+                with open(os.path.join(directory, MANIFEST_NAME), encoding='utf-8') as f:
+                    entries = json.load(f)
+            except (OSError, ValueError):
+                return True  # can't tell what it links, so keep every blob
+            for name, entry in entries.items():
+                output_path, blob = os.path.join(directory, name), self.blob_path(entry['sha256'])
+                if os.path.exists(output_path) and os.path.exists(blob) and not os.path.samefile(output_path, blob):
+                    return True
+        return False
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                'stored': self.stored,
+                'duplicates': self.duplicates,
+                'bytes_saved': self.bytes_saved,
+                'copies': self.copies,
+            }
@@ -0,0 +1,155 @@
+import logging
+from typing import Any, Callable, Optional
+
+import psutil
+from selenium.common.exceptions import InvalidSessionIdException, WebDriverException
+
+# Messages chromedriver uses when the browser behind a session has gone away
+CRASH_MARKERS = (
+    'chrome not reachable',
+    'session deleted',
+    'disconnected',
+    'tab crashed',
+    'target window already closed',
+    'no such window',
+    'invalid session id',
+)
+
+
+def is_browser_crash(error: Exception) -> bool:
+    """True when a WebDriver error means the browser itself is gone"""
+    if isinstance(error, InvalidSessionIdException):
+        return True
+    if isinstance(error, WebDriverException):
+        message = (error.msg or str(error)).lower()
+        return any(marker in message for marker in CRASH_MARKERS)
+    return False
+
+
+class ManagedBrowser:
+    """One warm Chrome session that is recycled and restarted as needed
+
+    The browser is launched lazily and passed to `warmup` (cookie consent,
+    URL blocking) once per launch, so that work is shared by every page it
+    loads.  before_navigation() recycles it after max_pages pages or when
+    the chromedriver + Chrome process tree grows past max_rss_mb.  run()
+    restarts a crashed browser and retries the same work item.
+    """
+
+    def __init__(self, factory: Callable[[], Any], warmup: Optional[Callable[[Any], None]] = None,
+                 max_pages: int = 200, max_rss_mb: float = 1536, check_every: int = 10,
+                 crash_retries: int = 1, driver=None):
+        self.factory = factory
+        self.warmup = warmup
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.check_every = max(1, check_every)
+        self.crash_retries = crash_retries
+        self.logger = logging.getLogger(__name__)
+
+        self._driver = driver
+        self.pages = 0
+        self.launches = 1 if driver is not None else 0
+        self.recycles = 0
+        self.restarts = 0
+        self.peak_rss_mb = 0.0
+
+    @property
+    def driver(self):
+        """The live WebDriver, launching (and warming) one if needed"""
+        if self._driver is None:
+            self._launch()
+        return self._driver
+
+    def _launch(self):
+        self._driver = self.factory()
+        self.launches += 1
+        self.pages = 0
+        if self.warmup:
+            try:
+                self.warmup(self._driver)
+            except Exception as e:
+                self.logger.warning(f"Browser warm-up failed: {str(e)}")
+
+    def quit(self):
+        """Shut the browser down; the next access launches a fresh one"""
+        driver, self._driver = self._driver, None
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception as e:
+                self.logger.debug(f"Error quitting browser: {str(e)}")
+
+    def rss_mb(self) -> float:
+        """Resident memory of chromedriver and every Chrome process under it"""
+        try:
+            root = psutil.Process(self._driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+        except Exception:
+            return 0.0
+
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                continue
+        rss = total / (1024 * 1024)
+        self.peak_rss_mb = max(self.peak_rss_mb, rss)
+        return rss
+
+    def is_alive(self) -> bool:
+        """Cheap round trip to check the session still answers"""
+        if self._driver is None:
+            return False
+        try:
+            self._driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def before_navigation(self):
+        """Count a page load, recycling the browser first if it is over budget"""
+        if self._driver is not None and self.pages >= self.max_pages:
+            self.recycle(f"{self.pages} pages loaded")
+        elif self._driver is not None and self.pages and self.pages % self.check_every == 0:
+            rss = self.rss_mb()
+            if rss > self.max_rss_mb:
+                self.recycle(f"{rss:.0f} MB resident")
+        self.pages += 1
+
+    def recycle(self, reason: str):
+        """Replace the browser with a fresh one"""
+        self.logger.info(f"Recycling browser after {reason}")
+        self.recycles += 1
+        self.quit()
+        self._launch()
+
+    def restart(self, reason: str):
+        """Relaunch after the browser crashed"""
+        self.logger.warning(f"Restarting browser: {reason}")
+        self.restarts += 1
+        self.quit()
+        self._launch()
+
+    def run(self, fn: Callable, *args):
+        """Call fn(*args), restarting the browser and retrying if it crashed
+
+        Scraper methods swallow their own errors, so a falsy result from a
+        browser that no longer answers is treated as a crash too.
+        """
+        result = None
+        for attempt in range(self.crash_retries + 1):
+            last_attempt = attempt == self.crash_retries
+            try:
+                result = fn(*args)
+            except WebDriverException as e:
+                if not is_browser_crash(e) or last_attempt:
+                    raise
+                self.restart(str(e).splitlines()[0])
+                continue
+
+            if result or self._driver is None or self.is_alive() or last_attempt:
+                return result
+            self.restart("browser stopped responding")
+        return result
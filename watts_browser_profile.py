@@ -0,0 +1,155 @@
+import logging
+import threading
+from typing import Dict, Iterable, Optional
+
+# Third-party hosts seen in debug_network_*.json that the scraper never needs.
+# jQuery/handlebars CDNs are deliberately absent: the product grid needs them.
+TRACKING_HOSTS = [
+    'assets.adobedtm.com',
+    'geolocation.onetrust.com',
+    'watts-privacy.my.onetrust.com',
+    'www.google-analytics.com',
+    'www.googletagmanager.com',
+    'stats.g.doubleclick.net',
+    'connect.facebook.net',
+    'bat.bing.com',
+    'snap.licdn.com',
+    'static.hotjar.com',
+    'script.hotjar.com',
+]
+FONT_HOSTS = ['fast.fonts.net', 'fonts.googleapis.com', 'fonts.gstatic.com']
+
+# Watts serves images from extension-less /dfsmedia/<site>/<id>-<rendition> URLs,
+# renditions numbered 500xx; documents are <id>-source/<name> and are never
+# loaded by the browser itself, only linked.
+IMAGE_PATTERNS = ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*/dfsmedia/*-500*']
+FONT_PATTERNS = ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot']
+MEDIA_PATTERNS = ['*.mp4', '*.webm', '*.mp3', '*.m4a', '*.mov']
+
+
+class LeanProfile:
+    """Resources a lean headless browser refuses to load
+
+    Images, fonts, media files and third-party hosts are blocked through
+    CDP Network.setBlockedURLs, which can be changed per category at
+    runtime, so a category crawled without a profile loads its images.
+    Hosts in allowed_hosts are never blocked.
+    """
+
+    def __init__(self, block_images: bool = True, block_media: bool = True,
+                 block_fonts: bool = True, blocked_hosts: Optional[Iterable[str]] = None,
+                 allowed_hosts: Optional[Iterable[str]] = None):
+        self.block_images = block_images
+        self.block_media = block_media
+        self.block_fonts = block_fonts
+        self.blocked_hosts = list(TRACKING_HOSTS if blocked_hosts is None else blocked_hosts)
+        if block_fonts:
+            self.blocked_hosts += FONT_HOSTS
+        self.allowed_hosts = set(allowed_hosts or [])
+
+    def apply_options(self, chrome_options):
+        """Launch-time settings (only the default profile's apply)"""
+        if self.block_media:
+            chrome_options.add_argument('--autoplay-policy=user-gesture-required')
+
+    def url_patterns(self):
+        """Patterns for Network.setBlockedURLs"""
+        patterns = []
+        if self.block_images:
+            patterns += IMAGE_PATTERNS
+        if self.block_fonts:
+            patterns += FONT_PATTERNS
+        if self.block_media:
+            patterns += MEDIA_PATTERNS
+        patterns += [f"*://{host}/*" for host in self.blocked_hosts if host not in self.allowed_hosts]
+        return patterns
+
+    def apply(self, driver):
+        """Install this profile's URL blocking on a running browser"""
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.url_patterns()})
+
+
+class NetworkStats:
+    """Per-page request, block and byte counts from Chrome's performance log
+
+    Fed by PageReadiness as it reads performance events; a page runs from
+    one start_page() call to the next on the same browser.  Pages loaded
+    with and without a lean profile are totalled separately, so a run that
+    leaves blocking off for one category reports what blocking saves.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._pages = {}
+        self.categories: Dict[str, Dict[str, float]] = {}
+        self.modes: Dict[str, Dict[str, float]] = {}
+
+    def start_page(self, driver, url: str, category: Optional[str] = None, lean: bool = True):
+        """Close out the browser's previous page and start counting a new one"""
+        self.finish_page(driver)
+        with self._lock:
+            self._pages[id(driver)] = {
+                'url': url, 'category': category or 'uncategorized',
+                'mode': 'lean' if lean else 'full',
+                'requests': 0, 'blocked': 0, 'bytes': 0,
+            }
+
+    def observe(self, driver, message: dict):
+        """Account for one DevTools Network event"""
+        method = message.get('method')
+        params = message.get('params', {})
+        with self._lock:
+            page = self._pages.get(id(driver))
+            if page is None:
+                return
+            if method == 'Network.requestWillBeSent':
+                page['requests'] += 1
+            elif method == 'Network.loadingFinished':
+                page['bytes'] += params.get('encodedDataLength', 0)
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                page['blocked'] += 1
+
+    def finish_page(self, driver):
+        """Log and aggregate the browser's current page"""
+        with self._lock:
+            page = self._pages.pop(id(driver), None)
+            if page is None:
+                return
+            for totals in (self.categories.setdefault(page['category'], self._empty()),
+                           self.modes.setdefault(page['mode'], self._empty())):
+                totals['pages'] += 1
+                for key in ('requests', 'blocked', 'bytes'):
+                    totals[key] += page[key]
+        self.logger.info(f"Network for {page['url']}: {page['requests']} requests, "
+                         f"{page['blocked']} blocked, {page['bytes'] / 1024:.0f} KB")
+
+    @staticmethod
+    def _empty():
+        return {'pages': 0, 'requests': 0, 'blocked': 0, 'bytes': 0}
+
+    @staticmethod
+    def _per_page(totals):
+        return {
+            'pages': totals['pages'],
+            'requests_per_page': round(totals['requests'] / totals['pages'], 1),
+            'blocked_per_page': round(totals['blocked'] / totals['pages'], 1),
+            'kb_per_page': round(totals['bytes'] / totals['pages'] / 1024, 1),
+        }
+
+    def summary(self) -> Dict:
+        """Per-category averages per page, plus lean-vs-full savings when both were seen"""
+        with self._lock:
+            report = {
+                'categories': {
+                    category: self._per_page(totals)
+                    for category, totals in self.categories.items() if totals['pages']
+                }
+            }
+            lean, full = self.modes.get('lean'), self.modes.get('full')
+            if lean and full:
+                lean, full = self._per_page(lean), self._per_page(full)
+                report['requests_saved_per_page'] = round(full['requests_per_page'] - lean['requests_per_page'], 1)
+                report['kb_saved_per_page'] = round(full['kb_per_page'] - lean['kb_per_page'], 1)
+            return report
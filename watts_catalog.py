@@ -0,0 +1,161 @@
+import json
+import logging
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from watts_product_codes import normalize_description
+
+LISTING_FIELDS = ('product_code', 'description')
+SPEC_FIELDS = ('spec_url', 'content_hash')
+
+
+def feed_path(output_dir: str, started: Optional[datetime] = None, worker: Optional[str] = None) -> str:
+    """Change feed path for a run, beside output_dir like the run report
+
+    Each queue worker writes the changes of the categories it listed to
+    its own feed, named after the worker.
+    """
+    stamp = (started or datetime.now()).strftime('%Y%m%d_%H%M%S')
+    suffix = f"_{worker}" if worker else ""
+    return f"{output_dir.rstrip('/')}_changes_{stamp}{suffix}.jsonl"
+
+
+class CatalogDiff:
+    """Compares each category's listing with the snapshot from the last crawl
+
+    compare() takes the (product URL, code, description) entries a category
+    page lists now and returns the ones worth visiting: products that were
+    added or whose code or description changed, plus unchanged products
+    refresh() asks for (e.g. never resolved, or not checked for a week).
+    Products no longer listed are recorded as removed.  Descriptions are
+    compared and stored normalized, so the listing API and the rendered
+    grid agree on the same text.
+
+    finish() runs once the visited products' spec sheets are downloaded and
+    adds spec URL and content hash changes, so the feed carries one event
+    per added, removed or changed product:
+
+        {"category", "change": "added|removed|changed", "product_url",
+         "product_code", "description", "spec_url", "content_hash",
+         "fields": [changed field names], "previous": {...}}
+
+    commit() makes the compared listings the categories' snapshots in the
+    crawl state once the feed is written; a run killed before then leaves
+    the old snapshots, so the next run reports the same changes again.
+    """
+
+    def __init__(self, state, started: Optional[datetime] = None):
+        self.state = state
+        self.started = started or datetime.now()
+        self.logger = logging.getLogger(__name__)
+        self.events: List[Dict] = []
+        self.unchanged = 0
+        # product URL -> (category, its event or None, previous snapshot row or None)
+        self._visited: Dict[str, Tuple[str, Optional[Dict], Optional[Dict]]] = {}
+        # category -> listing compared but not yet stored as its snapshot
+        self._listings: Dict[str, List[Tuple[str, str, str]]] = {}
+
+    def compare(self, category: str, listing: Iterable[Tuple[str, str, str]],
+                refresh: Callable[[str, Dict], bool] = lambda url, previous: False) -> List[Tuple[str, str, str]]:
+        listing = [(product_url, product_code, normalize_description(description))
+                   for product_url, product_code, description in listing]
+        previous = self.state.get_catalog(category)
+        if not listing and previous:
+            # An empty listing is far more likely a failed page load than an empty category
+            self.logger.warning(f"No products listed for {category}; keeping its previous snapshot")
+            return []
+
+        visit = []
+        listed = set()
+        for product_url, product_code, description in listing:
+            listed.add(product_url)
+            old = previous.get(product_url)
+            current = {'product_code': product_code, 'description': description}
+            if old is None:
+                event = self._event(category, 'added', product_url, current)
+            else:
+                # Snapshots stored before descriptions were normalized compare equal too
+                was = {'product_code': old['product_code'], 'description': normalize_description(old['description'])}
+                fields = [field for field in LISTING_FIELDS if (was[field] or '') != (current[field] or '')]
+                event = self._event(category, 'changed', product_url, current, old, fields) if fields else None
+
+            if event is None:
+                self.unchanged += 1
+            if event is not None or refresh(product_url, old):
+                visit.append((product_url, product_code, description))
+                self._visited[product_url] = (category, event, old)
+
+        for product_url, old in previous.items():
+            if product_url not in listed:
+                self._event(category, 'removed', product_url, old)
+
+        self._listings[category] = listing
+        self.logger.info(f"{category}: {len(listing)} listed, {len(visit)} to visit, "
+                         f"{len(previous) - len(listed & previous.keys())} removed")
+        return visit
+
+    def changed(self, product_url: str) -> bool:
+        """Whether compare() found the product added or changed (not just due a refresh)"""
+        visited = self._visited.get(product_url)
+        return bool(visited and visited[1] is not None)
+
+    def _event(self, category, change, product_url, current, previous=None, fields=()) -> Dict:
+        event = {
+            'category': category,
+            'change': change,
+            'product_url': product_url,
+            'product_code': current.get('product_code'),
+            'description': current.get('description'),
+            'spec_url': current.get('spec_url'),
+            'content_hash': current.get('content_hash'),
+            'fields': list(fields),
+        }
+        if previous is not None:
+            event['previous'] = {field: previous[field] for field in LISTING_FIELDS + SPEC_FIELDS}
+        self.events.append(event)
+        return event
+
+    def finish(self) -> List[Dict]:
+        """Fill in spec sheets of visited products and record the ones that changed"""
+        for product_url, (category, event, old) in self._visited.items():
+            product = self.state.get_product(product_url) or {}
+            spec_url = product.get('spec_url')
+            document = self.state.get_document(spec_url) if spec_url else None
+            content_hash = document['content_hash'] if document else None
+
+            if event is not None:
+                event['spec_url'], event['content_hash'] = spec_url, content_hash
+            if old is None or content_hash is None:
+                continue
+            fields = [field for field, value in zip(SPEC_FIELDS, (spec_url, content_hash)) if value != old[field]]
+            if not fields:
+                continue
+            if event is None:
+                current = {'product_code': old['product_code'], 'description': old['description'],
+                           'spec_url': spec_url, 'content_hash': content_hash}
+                event = self._event(category, 'changed', product_url, current, old)
+                self.unchanged -= 1
+            event['fields'].extend(fields)
+        self._visited.clear()
+        return self.events
+
+    def commit(self):
+        """Store the compared listings as their categories' snapshots"""
+        for category, listing in self._listings.items():
+            self.state.replace_catalog(category, listing)
+        self._listings.clear()
+
+    def summary(self) -> dict:
+        counts = {'added': 0, 'removed': 0, 'changed': 0}
+        for event in self.events:
+            counts[event['change']] += 1
+        counts['unchanged'] = self.unchanged
+        return counts
+
+    def write_feed(self, path: str):
+        """One JSON line per change, tagged with the run's start time"""
+        run = self.started.isoformat(timespec='seconds')
+        with open(path, 'w', encoding='utf-8') as f:
+            for event in self.events:
+                f.write(json.dumps({'run': run, **event}, ensure_ascii=False))
+                f.write('\n')
@@ -0,0 +1,168 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+PENDING = 'pending'
+IN_FLIGHT = 'in_flight'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class RunCheckpoint:
+    """A run's work queue, checkpointed to the crawl state so the run can be resumed
+
+    Work items are categories, products and downloads, keyed by category
+    name, product URL and spec URL.  Each moves pending -> in_flight ->
+    done or failed, counting its attempts; a failed item may be retried
+    max_attempts times in all, backoff * 2 ** (attempts - 1) seconds after
+    its last failure.  Transitions are kept in memory and written to the
+    state's work_items table at most every interval seconds (and on
+    flush()), so a crash loses at most that much bookkeeping, never work
+    that was done: the items are only re-run.
+
+    resume() reopens the latest run's checkpoint: done items stay done,
+    items that were in flight when the run stopped go back to pending,
+    and failed items are retried unless they used up their attempts.
+    """
+
+    def __init__(self, state, run_id: str, interval: float = 30, max_attempts: int = 3,
+                 backoff: float = 60):
+        self.state = state
+        self.run_id = run_id
+        self.interval = interval
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # keeps an older snapshot from overwriting a newer one
+        self._items: Dict[tuple, Dict] = {}
+        self._dirty = set()
+        self._flushed = time.monotonic()
+        self.flushes = 0
+
+    @classmethod
+    def start(cls, state, started: Optional[datetime] = None, **kwargs) -> 'RunCheckpoint':
+        """Checkpoint of a new run, named after its start time"""
+        run_id = (started or datetime.now()).strftime('%Y%m%d_%H%M%S')
+        state.start_run(run_id)
+        return cls(state, run_id, **kwargs)
+
+    @classmethod
+    def resume(cls, state, **kwargs) -> Optional['RunCheckpoint']:
+        """The latest run's checkpoint, or None when it has nothing left to run"""
+        run = state.latest_run()
+        if not run:
+            return None
+        checkpoint = cls(state, run['run_id'], **kwargs)
+        for item in state.get_work_items(run['run_id']):
+            if item['status'] == IN_FLIGHT:
+                item['status'] = PENDING
+            checkpoint._items[(item['kind'], item['key'])] = item
+        if not any(checkpoint.should_run(item['kind'], item['key']) for item in checkpoint.items()):
+            return None
+        return checkpoint
+
+    def add(self, kind: str, key: str, category: Optional[str] = None, payload: Optional[Dict] = None) -> Dict:
+        """Register a work item as pending; an item already known keeps its status"""
+        with self._lock:
+            item = self._items.get((kind, key))
+            if item is None:
+                item = {'kind': kind, 'key': key, 'category': category, 'payload': dict(payload or {}),
+                        'status': PENDING, 'attempts': 0, 'last_error': None, 'next_attempt': None}
+                self._items[(kind, key)] = item
+                self._dirty.add((kind, key))
+            elif payload:
+                item['payload'].update(payload)
+                self._dirty.add((kind, key))
+            result = dict(item)
+        self.maybe_flush()
+        return result
+
+    def begin(self, kind: str, key: str):
+        """An attempt at a work item started"""
+        with self._lock:
+            item = self._items[(kind, key)]
+            item['status'] = IN_FLIGHT
+            item['attempts'] += 1
+            self._dirty.add((kind, key))
+        self.maybe_flush()
+
+    def done(self, kind: str, key: str):
+        with self._lock:
+            item = self._items[(kind, key)]
+            item['status'] = DONE
+            item['last_error'] = None
+            item['next_attempt'] = None
+            self._dirty.add((kind, key))
+        self.maybe_flush()
+
+    def fail(self, kind: str, key: str, error: Optional[str] = None):
+        """An attempt failed; the item may be retried after a back-off"""
+        with self._lock:
+            item = self._items[(kind, key)]
+            item['status'] = FAILED
+            item['attempts'] = max(1, item['attempts'])
+            item['last_error'] = error
+            item['next_attempt'] = time.time() + self.backoff * 2 ** (item['attempts'] - 1)
+            self._dirty.add((kind, key))
+        self.maybe_flush()
+
+    def get(self, kind: str, key: str) -> Optional[Dict]:
+        with self._lock:
+            item = self._items.get((kind, key))
+            return dict(item) if item else None
+
+    def items(self, kind: Optional[str] = None, category: Optional[str] = None) -> List[Dict]:
+        """Work items in the order they were added"""
+        with self._lock:
+            return [dict(item) for item in self._items.values()
+                    if (kind is None or item['kind'] == kind) and (category is None or item['category'] == category)]
+
+    def should_run(self, kind: str, key: str) -> bool:
+        """Whether an item is unknown, unfinished, or failed with attempts left"""
+        item = self.get(kind, key)
+        if item is None:
+            return True
+        if item['status'] == DONE:
+            return False
+        return item['status'] != FAILED or item['attempts'] < self.max_attempts
+
+    def retry_delay(self, kind: str, key: str) -> float:
+        """Seconds left of a failed item's back-off"""
+        item = self.get(kind, key)
+        if not item or item['status'] != FAILED or not item['next_attempt']:
+            return 0.0
+        return max(0.0, item['next_attempt'] - time.time())
+
+    def maybe_flush(self):
+        if time.monotonic() - self._flushed >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """Write the items that changed since the last checkpoint"""
+        with self._flush_lock:
+            with self._lock:
+                items = [dict(self._items[key]) for key in self._dirty]
+                self._dirty.clear()
+                self._flushed = time.monotonic()
+            if items:
+                self.state.save_work_items(self.run_id, items)
+                self.flushes += 1
+
+    def finish(self):
+        """Flush and mark the run as having reached its end"""
+        self.flush()
+        self.state.finish_run(self.run_id)
+
+    def failures(self, kind: Optional[str] = None) -> List[Dict]:
+        return [item for item in self.items(kind) if item['status'] == FAILED]
+
+    def summary(self) -> dict:
+        """Item counts by kind and status"""
+        counts = {}
+        for item in self.items():
+            by_status = counts.setdefault(item['kind'], {})
+            by_status[item['status']] = by_status.get(item['status'], 0) + 1
+        return {'run': self.run_id, 'items': counts, 'flushes': self.flushes}
@@ -0,0 +1,268 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    product_url TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    product_code TEXT,
+    spec_url TEXT,
+    last_checked REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS products_category ON products (category);
+CREATE TABLE IF NOT EXISTS documents (
+    spec_url TEXT PRIMARY KEY,
+    output_path TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    content_hash TEXT,
+    last_checked REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS partials (
+    spec_url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    total_length INTEGER,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS catalog (
+    category TEXT NOT NULL,
+    product_url TEXT NOT NULL,
+    product_code TEXT,
+    description TEXT,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (category, product_url)
+);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started REAL NOT NULL,
+    finished REAL
+);
+CREATE TABLE IF NOT EXISTS work_items (
+    run_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    category TEXT,
+    payload TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    next_attempt REAL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (run_id, kind, item_key)
+);
+"""
+
+
+class CrawlState:
+    """SQLite record of what earlier runs resolved and downloaded
+
+    products maps category -> product URL -> spec URL; documents holds the
+    HTTP validators and content hash of each downloaded spec sheet, so a
+    re-run can skip fresh products and revalidate PDFs with conditional GETs.
+    partials holds the validators of interrupted downloads, so their .part
+    files can be resumed with If-Range requests.  catalog is the product
+    listing each category showed on its last crawl.  runs and work_items
+    are the checkpointed work queue of each run (see RunCheckpoint), so an
+    interrupted run can be resumed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # WAL and a long busy timeout let queue workers in other processes share it
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def get_product(self, product_url: str) -> Optional[Dict]:
+        """Return the stored row for a product page, if any"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM products WHERE product_url = ?", (product_url,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_document(self, spec_url: str) -> Optional[Dict]:
+        """Return the stored validators for a spec sheet URL, if any"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM documents WHERE spec_url = ?", (spec_url,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def record_product(self, category: str, product_url: str, product_code: str,
+                       spec_url: Optional[str]):
+        """Store the spec URL resolved for a product page"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO products (product_url, category, product_code, spec_url, last_checked) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(product_url) DO UPDATE SET category = excluded.category, "
+                "product_code = excluded.product_code, spec_url = excluded.spec_url, "
+                "last_checked = excluded.last_checked",
+                (product_url, category, product_code, spec_url, time.time())
+            )
+
+    def touch_product(self, product_url: str):
+        """Mark a product as checked now without changing what was resolved"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE products SET last_checked = ? WHERE product_url = ?",
+                (time.time(), product_url)
+            )
+
+    def record_document(self, spec_url: str, output_path: str, etag: Optional[str],
+                        last_modified: Optional[str], content_hash: Optional[str]):
+        """Store the validators and hash of a downloaded spec sheet"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO documents (spec_url, output_path, etag, last_modified, content_hash, last_checked) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(spec_url) DO UPDATE SET output_path = excluded.output_path, "
+                "etag = excluded.etag, last_modified = excluded.last_modified, "
+                "content_hash = excluded.content_hash, last_checked = excluded.last_checked",
+                (spec_url, output_path, etag, last_modified, content_hash, time.time())
+            )
+
+    def touch_document(self, spec_url: str):
+        """Mark a spec sheet as revalidated now"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE documents SET last_checked = ? WHERE spec_url = ?",
+                (time.time(), spec_url)
+            )
+
+    def get_partial(self, spec_url: str) -> Optional[Dict]:
+        """Return the validators of an unfinished download, if any"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM partials WHERE spec_url = ?", (spec_url,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def record_partial(self, spec_url: str, etag: Optional[str], last_modified: Optional[str],
+                       total_length: Optional[int]):
+        """Remember which version of a document a .part file holds"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO partials (spec_url, etag, last_modified, total_length, updated) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(spec_url) DO UPDATE SET etag = excluded.etag, "
+                "last_modified = excluded.last_modified, total_length = excluded.total_length, "
+                "updated = excluded.updated",
+                (spec_url, etag, last_modified, total_length, time.time())
+            )
+
+    def clear_partial(self, spec_url: str):
+        """Forget an unfinished download once it completed or was discarded"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM partials WHERE spec_url = ?", (spec_url,))
+
+    def get_catalog(self, category: str) -> Dict[str, Dict]:
+        """A category's last listing by product URL, with its spec URL and content hash"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT c.product_url, c.product_code, c.description, p.spec_url, "
+                "p.last_checked, d.content_hash FROM catalog c "
+                "LEFT JOIN products p ON p.product_url = c.product_url "
+                "LEFT JOIN documents d ON d.spec_url = p.spec_url "
+                "WHERE c.category = ?", (category,)
+            ).fetchall()
+        return {row['product_url']: dict(row) for row in rows}
+
+    def replace_catalog(self, category: str, listing: Iterable[Tuple[str, str, str]]):
+        """Store (product URL, code, description) as the category's current listing"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM catalog WHERE category = ?", (category,))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO catalog (category, product_url, product_code, description, last_seen) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(category, url, code, description, now) for url, code, description in listing]
+            )
+
+    def start_run(self, run_id: str):
+        """Register a new run whose work items will be checkpointed"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO runs (run_id, started, finished) VALUES (?, ?, NULL)",
+                (run_id, time.time())
+            )
+
+    def finish_run(self, run_id: str):
+        """Mark a run as having reached its end, whatever its items' outcome"""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE runs SET finished = ? WHERE run_id = ?", (time.time(), run_id))
+
+    def latest_run(self) -> Optional[Dict]:
+        """The most recently started run, if any"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM runs ORDER BY started DESC, rowid DESC LIMIT 1"
+            ).fetchone()
+        return dict(row) if row else None
+
+    def save_work_items(self, run_id: str, items: Iterable[Dict]):
+        """Upsert work items (kind, key, category, payload, status, attempts, ...) of a run"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO work_items (run_id, kind, item_key, category, payload, status, attempts, "
+                "last_error, next_attempt, updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(run_id, kind, item_key) DO UPDATE SET category = excluded.category, "
+                "payload = excluded.payload, status = excluded.status, attempts = excluded.attempts, "
+                "last_error = excluded.last_error, next_attempt = excluded.next_attempt, "
+                "updated = excluded.updated",
+                [(run_id, item['kind'], item['key'], item.get('category'), json.dumps(item.get('payload') or {}),
+                  item['status'], item.get('attempts', 0), item.get('last_error'), item.get('next_attempt'), now)
+                 for item in items]
+            )
+
+    def get_work_items(self, run_id: str) -> List[Dict]:
+        """A run's work items in the order they were first checkpointed"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, item_key, category, payload, status, attempts, last_error, next_attempt "
+                "FROM work_items WHERE run_id = ? ORDER BY rowid", (run_id,)
+            ).fetchall()
+        items = []
+        for row in rows:
+            item = dict(row)
+            item['key'] = item.pop('item_key')
+            item['payload'] = json.loads(item['payload'] or '{}')
+            items.append(item)
+        return items
+
+    def conditional_headers(self, spec_url: str, output_path: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a stored spec sheet
+
+        Only returned when the stored copy was written to output_path, so a
+        304 always means the file on disk is current.
+        """
+        document = self.get_document(spec_url)
+        if not document or document['output_path'] != output_path:
+            return {}
+
+        headers = {}
+        if document['etag']:
+            headers['If-None-Match'] = document['etag']
+        if document['last_modified']:
+            headers['If-Modified-Since'] = document['last_modified']
+        return headers
+
+    @staticmethod
+    def age(row: Optional[Dict]) -> float:
+        """Seconds since a stored row was last checked (inf when missing)"""
+        if not row:
+            return float('inf')
+        return time.time() - row['last_checked']
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,232 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from watts_pdf_check import NotPdfError, PdfStreamCheck, expected_length
+from watts_rate_limiter import parse_retry_after
+from watts_resume import ResumableDownload
+
+
+class DownloadPipeline:
+    """Asyncio PDF downloader that runs beside page discovery
+
+    Discovery threads call submit() and move on; a background event loop
+    drains the queue with a keep-alive httpx client, at most `workers`
+    downloads in flight and `per_host` per host, paced by the scraper's
+    shared rate limiter when one is given.  Files are streamed to a
+    temporary file in the target directory and renamed into place, so a
+    half-written PDF never appears under its final name.  With a blob
+    store the stream goes into the URL's resumable .part file in the store
+    instead, and the file is linked to its blob once complete.  Every body is checked as it streams (PDF header, trailer,
+    Content-Length) and discarded if it is not a complete PDF.  With
+    metrics, each download is recorded as a download span carrying the
+    tags given to submit().  With an HttpTransport the client comes from
+    it (same headers, cookies, TLS and HTTP/2 settings as page fetches)
+    instead of headers, cookies and verify.
+    """
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, cookies=None,
+                 workers: int = 4, per_host: int = 4, state=None,
+                 verify: bool = True, timeout: float = 60, max_retries: int = 3,
+                 rate_limiter=None, metrics=None, blobs=None, transport=None):
+        self.headers = dict(headers or {})
+        self.cookies = cookies
+        self.workers = max(1, workers)
+        self.per_host = max(1, per_host)
+        self.state = state
+        self.verify = verify
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.rate_limiter = rate_limiter
+        self.metrics = metrics
+        self.blobs = blobs
+        self.transport = transport
+        self.logger = logging.getLogger(__name__)
+
+        self.succeeded = 0
+        self.failed = []
+
+        self._loop = None
+        self._thread = None
+        self._host_slots = {}
+
+    def start(self):
+        """Start the event loop thread and its consumer tasks"""
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, args=(ready,),
+                                        name="pdf-downloader", daemon=True)
+        self._thread.start()
+        ready.wait()
+        self.logger.info(f"Download pipeline started with {self.workers} workers")
+        return self
+
+    def _run_loop(self, ready: threading.Event):
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        if self.transport is not None:
+            self._client = self.transport.async_client(self.workers, timeout=self.timeout)
+        else:
+            self._client = httpx.AsyncClient(
+                headers=self.headers,
+                cookies=self.cookies,
+                verify=self.verify,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.workers,
+                                    max_keepalive_connections=self.workers)
+            )
+        self._consumers = [self._loop.create_task(self._consume()) for _ in range(self.workers)]
+        ready.set()
+        self._loop.run_forever()
+
+    def submit(self, url: str, output_path: str,
+               tags: Optional[Dict[str, str]] = None) -> concurrent.futures.Future:
+        """Queue a download; the future resolves to True once the file is in place"""
+        future = concurrent.futures.Future()
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (url, output_path, future, tags or {}))
+        return future
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.per_host)
+        return self._host_slots[host]
+
+    async def _consume(self):
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+
+            url, output_path, future, tags = item
+            ok = False
+            start = time.monotonic()
+            for attempt in range(self.max_retries):
+                try:
+                    ok = await self._download(url, output_path)
+                    break
+                except NotPdfError as e:
+                    self.logger.warning(f"URL {url} did not return a PDF: {str(e)}")
+                    break
+                except Exception as e:
+                    if attempt < self.max_retries - 1:
+                        self.logger.warning(f"Attempt {attempt + 1} failed for {url}: {str(e)}")
+                        await asyncio.sleep(2 ** attempt)
+                    else:
+                        self.logger.error(f"Failed to download {url} after {self.max_retries} attempts: {str(e)}")
+
+            if self.metrics:
+                self.metrics.record('download', time.monotonic() - start, **tags)
+            if ok:
+                self.succeeded += 1
+            else:
+                self.failed.append((url, output_path))
+            future.set_result(ok)
+            self._queue.task_done()
+
+    async def _download(self, url: str, output_path: str) -> bool:
+        resumable = ResumableDownload(self.blobs, url, self.state) if self.blobs else None
+        with resumable or contextlib.nullcontext():
+            # Resume an interrupted download, else revalidate a stored copy
+            headers = resumable.request_headers() if resumable else {}
+            if not headers and self.state and os.path.exists(output_path):
+                headers = self.state.conditional_headers(url, output_path)
+
+            async with self._host_slot(url):
+                if self.rate_limiter:
+                    await self.rate_limiter.acquire_async()
+                start = time.monotonic()
+                async with self._client.stream('GET', url, headers=headers) as response:
+                    if self.rate_limiter:
+                        self.rate_limiter.record(
+                            status=response.status_code,
+                            elapsed=time.monotonic() - start,
+                            retry_after=parse_retry_after(response.headers.get('Retry-After'))
+                        )
+                    if response.status_code == 304:
+                        self.state.touch_document(url)
+                        self.logger.info(f"Not modified since last run: {url}")
+                        return True
+                    if resumable:
+                        resumable.begin(response.status_code, response.headers)
+                    response.raise_for_status()
+
+                    content_type = response.headers.get('content-type', '').lower()
+                    if 'pdf' not in content_type:
+                        self.logger.warning(f"URL {url} returned non-PDF content: {content_type}")
+                        return False
+
+                    if resumable:
+                        if resumable.resumed_from:
+                            self.logger.info(f"Resuming {url} from byte {resumable.resumed_from}")
+                        async for chunk in response.aiter_bytes(65536):
+                            resumable.feed(chunk)
+                        content_hash = resumable.finish()
+                    else:
+                        check = PdfStreamCheck(expected_length(response.headers))
+                        content_hash = await self._write_file(response, output_path, check)
+
+        if resumable:
+            self.blobs.link(content_hash, output_path, url)
+        if self.state:
+            self.state.record_document(
+                url,
+                output_path,
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified'),
+                content_hash
+            )
+        self.logger.info(f"Successfully downloaded {url} to {output_path}")
+        return True
+
+    async def _write_file(self, response, output_path: str, check: PdfStreamCheck) -> str:
+        """Stream a response to output_path via a temporary file; returns its SHA-256"""
+        directory = os.path.dirname(output_path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory, prefix=f".{os.path.basename(output_path)}.", suffix='.tmp'
+        )
+        content_hash = hashlib.sha256()
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                async for chunk in response.aiter_bytes(65536):
+                    check.feed(chunk)
+                    f.write(chunk)
+                    content_hash.update(chunk)
+            check.finish()
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return content_hash.hexdigest()
+
+    async def _shutdown(self):
+        for _ in self._consumers:
+            await self._queue.put(None)
+        await asyncio.gather(*self._consumers)
+        await self._client.aclose()
+
+    def close(self):
+        """Finish every queued download, then stop the event loop"""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+        self.logger.info(f"Download pipeline finished: {self.succeeded} downloaded, "
+                         f"{len(self.failed)} failed")
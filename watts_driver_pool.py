@@ -0,0 +1,168 @@
+import logging
+import queue
+import threading
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+from watts_browser_lifecycle import ManagedBrowser
+
+
+class DriverPool:
+    """Bounded pool of WebDriver workers that drain a shared work queue.
+
+    Every worker thread owns one browser and its own WebDriverWait, so the
+    scraper's existing `self.driver` / `self.wait` code can run unchanged on
+    any worker.  A semaphore caps how many workers talk to the site at once.
+    Browsers are ManagedBrowsers: warm across items, recycled by page count
+    or memory, and restarted when they crash without dropping the item.
+    """
+
+    def __init__(self, driver_factory: Callable[[], Any], size: int = 4,
+                 max_concurrency: Optional[int] = None, wait_timeout: int = 10,
+                 warmup: Optional[Callable[[Any], None]] = None,
+                 max_pages: int = 200, max_rss_mb: float = 1536):
+        self.driver_factory = driver_factory
+        self.size = max(1, size)
+        self.max_concurrency = max(1, min(max_concurrency or self.size, self.size))
+        self.wait_timeout = wait_timeout
+        self.warmup = warmup
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.logger = logging.getLogger(__name__)
+
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._local = threading.local()
+        self._idle = queue.LifoQueue()
+        self._browsers = []
+        self._lock = threading.Lock()
+
+    @property
+    def browser(self) -> Optional[ManagedBrowser]:
+        """ManagedBrowser owned by the calling worker thread, or None outside the pool"""
+        return getattr(self._local, 'browser', None)
+
+    @property
+    def driver(self):
+        """Driver owned by the calling worker thread, or None outside the pool"""
+        browser = self.browser
+        return browser.driver if browser else None
+
+    @property
+    def wait(self):
+        """WebDriverWait bound to the calling worker's current driver"""
+        browser = self.browser
+        if browser is None:
+            return None
+        # Rebuilt when the browser was recycled or restarted since the last call
+        if getattr(self._local, 'wait_driver', None) is not browser.driver:
+            self._local.wait_driver = browser.driver
+            self._local.wait = WebDriverWait(browser.driver, self.wait_timeout)
+        return self._local.wait
+
+    def _checkout_driver(self):
+        """Reuse an idle browser or launch a new one for this worker"""
+        try:
+            browser = self._idle.get_nowait()
+        except queue.Empty:
+            browser = ManagedBrowser(self.driver_factory, warmup=self.warmup,
+                                     max_pages=self.max_pages, max_rss_mb=self.max_rss_mb)
+            browser.driver  # launch now so a failed start is reported here
+            with self._lock:
+                self._browsers.append(browser)
+            self.logger.info(f"Launched pool browser {len(self._browsers)}/{self.size}")
+        self._local.browser = browser
+        return browser.driver
+
+    def _checkin_driver(self):
+        """Return this worker's browser to the idle stack"""
+        browser = self.browser
+        self._local.browser = None
+        self._local.wait = None
+        self._local.wait_driver = None
+        if browser is not None:
+            self._idle.put(browser)
+
+    def attach(self):
+        """Give the calling thread a pool browser until detach()"""
+        self._checkout_driver()
+
+    def detach(self):
+        self._checkin_driver()
+
+    def call(self, handler: Callable, *item):
+        """handler(*item) on the calling thread's browser, within the concurrency cap"""
+        with self._slots:
+            return self.browser.run(handler, *item)
+
+    def _worker(self, work: queue.Queue, handler: Callable, results: List):
+        try:
+            self._checkout_driver()
+        except Exception as e:
+            self.logger.error(f"Could not start pool browser: {str(e)}")
+            return
+
+        try:
+            while True:
+                try:
+                    index, item = work.get_nowait()
+                except queue.Empty:
+                    return
+
+                try:
+                    results[index] = self.call(handler, *item)
+                except Exception as e:
+                    self.logger.error(f"Worker failed on {item[0]}: {str(e)}")
+                    results[index] = None
+                finally:
+                    work.task_done()
+        finally:
+            self._checkin_driver()
+
+    def map(self, items: Sequence[Tuple], handler: Callable) -> List:
+        """Run handler(*item) for every item and return results in input order"""
+        items = list(items)
+        if not items:
+            return []
+
+        work = queue.Queue()
+        for index, item in enumerate(items):
+            work.put((index, item))
+
+        results = [None] * len(items)
+        threads = [
+            threading.Thread(target=self._worker, args=(work, handler, results),
+                             name=f"driver-worker-{n}", daemon=True)
+            for n in range(min(self.size, len(items)))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Every worker failed to launch a browser; surface it instead of silently
+        # reporting an empty category.
+        if not work.empty():
+            raise RuntimeError("No pool browsers could be started")
+
+        return results
+
+    def close(self):
+        """Quit every browser the pool has launched"""
+        with self._lock:
+            browsers, self._browsers = self._browsers, []
+        for browser in browsers:
+            browser.quit()
+        self._idle = queue.LifoQueue()
+
+    def summary(self) -> dict:
+        """Launch, recycle and restart counts across the pool's browsers"""
+        with self._lock:
+            browsers = list(self._browsers)
+        return {
+            'browsers': len(browsers),
+            'launches': sum(b.launches for b in browsers),
+            'recycles': sum(b.recycles for b in browsers),
+            'restarts': sum(b.restarts for b in browsers),
+            'peak_rss_mb': round(max([b.peak_rss_mb for b in browsers] or [0]), 1),
+        }
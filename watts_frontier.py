@@ -0,0 +1,110 @@
+import heapq
+import itertools
+import posixpath
+import re
+import threading
+from typing import Iterable, Optional, Tuple
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from watts_product_codes import PRODUCT_CODE_PATTERN
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+# Only pages under here can list drainage products
+LISTING_PATH = '/products/'
+
+
+def canonicalize(url: str, base: Optional[str] = None) -> str:
+    """One spelling per listing page: absolute, lower-case host, no query,
+    fragment, default port, dot segments, repeated or trailing slashes"""
+    parts = urlsplit(urljoin(base, url) if base else url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = posixpath.normpath('/' + re.sub(r'/{2,}', '/', parts.path).lstrip('/'))
+    return urlunsplit((scheme, host, path, '', ''))
+
+
+def is_product_page(url: str) -> bool:
+    """Whether a URL is a single product's page (fd-100-a) rather than a listing"""
+    slug = urlsplit(url).path.rstrip('/').rsplit('/', 1)[-1]
+    return PRODUCT_CODE_PATTERN.match(slug) is not None
+
+
+class Frontier:
+    """Listing pages left to load for one category, best first, within budgets
+
+    add() canonicalizes each discovered link and drops pages already seen,
+    other categories' own pages (crawled on their own), product pages and
+    links past max_depth.  pop() hands out the most promising page --
+    those under the category's own path first, then its siblings, then
+    anything else, shallow before deep -- until max_pages pages have been
+    handed out; what is left is counted as over budget.
+    """
+
+    def __init__(self, root_url: str, max_depth: int = 2, max_pages: int = 20,
+                 exclude: Iterable[str] = ()):
+        self.root = canonicalize(root_url)
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self._host = urlsplit(self.root).netloc
+        root_path = urlsplit(self.root).path.rstrip('/')
+        self._prefix = root_path + '/'
+        self._parent = posixpath.dirname(root_path).rstrip('/') + '/'
+        self._lock = threading.Lock()
+        self._heap = []
+        self._order = itertools.count()
+        self._seen = {canonicalize(url) for url in exclude}
+        self._seen.discard(self.root)
+        self.popped = 0
+        self.duplicates = 0
+        self.too_deep = 0
+        self.skipped = 0
+        self.add(self.root, 0)
+
+    def priority(self, url: str, depth: int) -> Tuple[int, int]:
+        path = urlsplit(url).path
+        if path.startswith(self._prefix):
+            rank = 0
+        elif path.startswith(self._parent):
+            rank = 1
+        else:
+            rank = 2
+        return rank, depth
+
+    def add(self, url: str, depth: int) -> bool:
+        """Queue a discovered listing page; False if it is not worth loading"""
+        url = canonicalize(url, self.root)
+        with self._lock:
+            if url in self._seen:
+                self.duplicates += 1
+                return False
+            self._seen.add(url)
+            if depth > self.max_depth:
+                self.too_deep += 1
+                return False
+            parts = urlsplit(url)
+            if parts.netloc != self._host or not parts.path.startswith(LISTING_PATH) or is_product_page(url):
+                self.skipped += 1
+                return False
+            heapq.heappush(self._heap, (self.priority(url, depth), next(self._order), url, depth))
+            return True
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        """(url, depth) of the next page to load, or None when empty or out of budget"""
+        with self._lock:
+            if not self._heap or self.popped >= self.max_pages:
+                return None
+            _, _, url, depth = heapq.heappop(self._heap)
+            self.popped += 1
+            return url, depth
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                'loaded': self.popped,
+                'over_budget': len(self._heap),
+                'duplicates': self.duplicates,
+                'too_deep': self.too_deep,
+                'skipped': self.skipped,
+            }
@@ -0,0 +1,90 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+# BeautifulSoup tree builders, fastest first.  lxml parses in C; html.parser
+# is pure Python and always available.
+BACKENDS = ('lxml', 'html.parser')
+
+
+def available_backends():
+    """Tree builders usable in this environment, fastest first"""
+    available = []
+    for backend in BACKENDS:
+        try:
+            BeautifulSoup('', backend)
+        except FeatureNotFound:
+            continue
+        available.append(backend)
+    return available
+
+
+DEFAULT_BACKEND = available_backends()[0]
+
+
+def parse_html(html, backend: Optional[str] = None) -> BeautifulSoup:
+    """Parse a document with the given (or fastest available) backend"""
+    return BeautifulSoup(html, backend or DEFAULT_BACKEND)
+
+
+class HtmlParser:
+    """Parses pages into BeautifulSoup trees, at most once per URL and content
+
+    Documents are memoized by (url, content hash), so a page that is read
+    again unchanged (a category page checked for subcategories, a product
+    page seen from two categories) reuses the tree built the first time.
+    Trees are shared between threads and must be treated as read-only.
+    """
+
+    def __init__(self, backend: Optional[str] = None, max_entries: int = 64, metrics=None):
+        self.backend = backend or DEFAULT_BACKEND
+        self.metrics = metrics
+        self.max_entries = max_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.parses = 0
+        self.hits = 0
+        self.parse_seconds = 0.0
+
+    @staticmethod
+    def _digest(html) -> str:
+        data = html.encode('utf-8', 'surrogatepass') if isinstance(html, str) else html
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def parse(self, html, url: Optional[str] = None) -> BeautifulSoup:
+        """Parsed tree for html, reusing an earlier parse of the same content"""
+        key = (url, self._digest(html))
+        with self._lock:
+            soup = self._cache.get(key)
+            if soup is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return soup
+
+        start = time.perf_counter()
+        soup = BeautifulSoup(html, self.backend)
+        elapsed = time.perf_counter() - start
+        if self.metrics:
+            self.metrics.record('html_parse', elapsed)
+
+        with self._lock:
+            self.parses += 1
+            self.parse_seconds += elapsed
+            self._cache[key] = soup
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return soup
+
+    def summary(self) -> dict:
+        """Parse and cache-hit counts for the run"""
+        with self._lock:
+            return {
+                'backend': self.backend,
+                'parses': self.parses,
+                'cache_hits': self.hits,
+                'parse_seconds': round(self.parse_seconds, 2),
+            }
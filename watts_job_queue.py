@@ -0,0 +1,261 @@
+import contextlib
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+from watts_checkpoint import DONE, FAILED, IN_FLIGHT, PENDING
+
+
+def worker_name() -> str:
+    """host-pid of this process, for the files each queue worker writes"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    run_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    job_key TEXT NOT NULL,
+    category TEXT,
+    payload TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,
+    lease_token TEXT,
+    lease_expires REAL,
+    not_before REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    updated REAL NOT NULL,
+    PRIMARY KEY (run_id, kind, job_key)
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (run_id, status, not_before);
+"""
+
+
+class JobQueue:
+    """Category, product and download jobs shared by scraper processes through SQLite
+
+    The queue is one SQLite database in WAL mode, so any number of
+    processes on the host holding it can put and lease jobs concurrently.
+    put() is idempotent: a job is keyed by kind and key (category name,
+    product URL, download output path) and queued once however many
+    processes or listing pages put it.  lease() hands the next due job to
+    one worker for lease seconds, inside a write transaction so no two
+    workers get the same job; keep_alive() heartbeats the lease while the
+    job runs.  A lease that expires (its process died or hung) counts as
+    a failed attempt.  Failed jobs are retried like checkpointed items: up
+    to max_attempts in all, backoff * 2 ** (attempts - 1) seconds after
+    the last failure.  complete() is idempotent too: the first completion
+    wins and later ones, e.g. from a worker whose lease was taken over,
+    change nothing.
+
+    Jobs belong to a run.  A queue opens the latest run; begin_run() joins
+    it while it has jobs left and otherwise starts a new one, so a queue
+    database reused the next night crawls everything again.
+
+    WAL relies on shared memory, so the database must not sit on a
+    network filesystem.  Spreading workers over several hosts needs a
+    server-backed queue (e.g. Redis) behind the same put/lease/heartbeat/
+    complete/fail methods.
+    """
+
+    def __init__(self, path: str, lease: float = 300, max_attempts: int = 3, backoff: float = 60,
+                 poll_interval: float = 5):
+        self.path = path
+        self.lease_seconds = lease
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        # Autocommit, so lease() can take the write lock up front with BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+        self.run_id = self._latest_run()
+        self.leased = 0
+        self.completed = 0
+        self.failed = 0
+        self.lost = 0
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _latest_run(self) -> int:
+        with self._transaction() as conn:
+            row = conn.execute("SELECT MAX(run_id) FROM runs").fetchone()
+            if row[0] is not None:
+                return row[0]
+            return conn.execute("INSERT INTO runs (started) VALUES (?)", (time.time(),)).lastrowid
+
+    def begin_run(self) -> bool:
+        """Join the latest run while it has jobs left, else start a new one; True when started"""
+        with self._transaction() as conn:
+            run_id = conn.execute("SELECT MAX(run_id) FROM runs").fetchone()[0]
+            jobs, left = conn.execute(
+                "SELECT COUNT(*), COUNT(CASE WHEN status IN (?, ?) OR (status = ? AND attempts < ?) THEN 1 END) "
+                "FROM jobs WHERE run_id = ?",
+                (PENDING, IN_FLIGHT, FAILED, self.max_attempts, run_id)
+            ).fetchone()
+            # A run nobody has queued anything in yet is joined too
+            if run_id is None or (jobs and not left):
+                self.run_id = conn.execute("INSERT INTO runs (started) VALUES (?)", (time.time(),)).lastrowid
+                return True
+            self.run_id = run_id
+            return False
+
+    def put(self, kind: str, key: str, category: Optional[str] = None, payload: Optional[Dict] = None) -> bool:
+        """Queue a job; False when it was already queued"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO jobs (run_id, kind, job_key, category, payload, status, updated) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.run_id, kind, key, category, json.dumps(payload or {}), PENDING, time.time())
+            )
+        return cursor.rowcount == 1
+
+    def lease(self) -> Optional[Dict]:
+        """The next due job, leased to the calling worker; None when nothing is due"""
+        now = time.time()
+        token = uuid.uuid4().hex
+        owner = f"{self.worker_id}:{threading.current_thread().name}"
+        with self._transaction() as conn:
+            # Leases nobody renewed in time are failed attempts
+            conn.execute(
+                "UPDATE jobs SET status = ?, lease_token = NULL, last_error = 'Lease expired', "
+                "not_before = ? + ? * (1 << (attempts - 1)), updated = ? "
+                "WHERE run_id = ? AND status = ? AND lease_expires < ?",
+                (FAILED, now, self.backoff, now, self.run_id, IN_FLIGHT, now)
+            )
+            row = conn.execute(
+                "SELECT * FROM jobs WHERE run_id = ? AND (status = ? OR (status = ? AND attempts < ?)) "
+                "AND not_before <= ? ORDER BY kind = 'category' DESC, rowid LIMIT 1",
+                (self.run_id, PENDING, FAILED, self.max_attempts, now)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, owner = ?, lease_token = ?, "
+                "lease_expires = ?, updated = ? WHERE run_id = ? AND kind = ? AND job_key = ?",
+                (IN_FLIGHT, owner, token, now + self.lease_seconds, now, self.run_id, row['kind'], row['job_key'])
+            )
+        self.leased += 1
+        return {'run': self.run_id, 'kind': row['kind'], 'key': row['job_key'], 'category': row['category'],
+                'payload': json.loads(row['payload'] or '{}'), 'attempts': row['attempts'] + 1, 'token': token}
+
+    def heartbeat(self, job: Dict) -> bool:
+        """Extend a job's lease; False when the lease was lost"""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated = ? "
+                "WHERE run_id = ? AND kind = ? AND job_key = ? AND lease_token = ? AND status = ?",
+                (now + self.lease_seconds, now, job['run'], job['kind'], job['key'], job['token'], IN_FLIGHT)
+            )
+        return cursor.rowcount == 1
+
+    @contextlib.contextmanager
+    def keep_alive(self, job: Dict):
+        """Heartbeat the job's lease every third of its length until the block exits"""
+        stop = threading.Event()
+
+        def renew():
+            while not stop.wait(self.lease_seconds / 3):
+                if not self.heartbeat(job):
+                    self.logger.warning(f"Lost the lease on {job['kind']} {job['key']}")
+                    self.lost += 1
+                    return
+
+        thread = threading.Thread(target=renew, name=f"heartbeat-{job['token'][:8]}", daemon=True)
+        thread.start()
+        try:
+            yield job
+        finally:
+            stop.set()
+            thread.join()
+
+    def complete(self, job: Dict) -> bool:
+        """Mark a job done; False when some worker already had"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, lease_token = NULL, last_error = NULL, updated = ? "
+                "WHERE run_id = ? AND kind = ? AND job_key = ? AND status != ?",
+                (DONE, time.time(), job['run'], job['kind'], job['key'], DONE)
+            )
+        if cursor.rowcount == 1:
+            self.completed += 1
+            return True
+        return False
+
+    def fail(self, job: Dict, error: Optional[str] = None) -> bool:
+        """Record a failed attempt on a job still leased to the caller"""
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, lease_token = NULL, last_error = ?, not_before = ?, updated = ? "
+                "WHERE run_id = ? AND kind = ? AND job_key = ? AND lease_token = ? AND status = ?",
+                (FAILED, error, now + self.backoff * 2 ** (job['attempts'] - 1), now,
+                 job['run'], job['kind'], job['key'], job['token'], IN_FLIGHT)
+            )
+        if cursor.rowcount == 1:
+            self.failed += 1
+            return True
+        return False
+
+    def outstanding(self) -> int:
+        """Jobs queued, running, or failed with attempts left"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE run_id = ? AND (status IN (?, ?) OR (status = ? AND attempts < ?))",
+                (self.run_id, PENDING, IN_FLIGHT, FAILED, self.max_attempts)
+            ).fetchone()[0]
+
+    def get(self, kind: str, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM jobs WHERE run_id = ? AND kind = ? AND job_key = ?", (self.run_id, kind, key)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """The run's job counts by kind and status, over every process"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, status, COUNT(*) AS jobs FROM jobs WHERE run_id = ? GROUP BY kind, status",
+                (self.run_id,)
+            ).fetchall()
+        counts = {}
+        for row in rows:
+            counts.setdefault(row['kind'], {})[row['status']] = row['jobs']
+        return counts
+
+    def summary(self) -> dict:
+        """What this process leased and finished, and the queue as a whole"""
+        return {'worker': self.worker_id, 'run': self.run_id, 'leased': self.leased,
+                'completed': self.completed, 'failed': self.failed, 'lost_leases': self.lost,
+                'queue': self.counts()}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
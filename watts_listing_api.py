@@ -0,0 +1,134 @@
+import html as html_lib
+import logging
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from watts_product_codes import PRODUCT_CODE_PATTERN, normalize_description
+
+# The product grid's results container names the search endpoint it pages
+# through and the Sitecore item (category) whose children it lists:
+# <div class="js-results results" data-pagenum="1"
+#      data-endpoint="/api/watts/series/search" data-parent="{243AB82C-...}">
+RESULTS_TAG_PATTERN = re.compile(r'<div\b[^>]*\bclass="[^"]*\bjs-results\b[^"]*"[^>]*>', re.IGNORECASE)
+ENDPOINT_ATTR_PATTERN = re.compile(r'\bdata-endpoint="([^"]+)"', re.IGNORECASE)
+PARENT_ATTR_PATTERN = re.compile(r'\bdata-parent="([^"]+)"', re.IGNORECASE)
+
+# Largest page size the grid's "Show" selector offers
+PAGE_SIZE = 60
+SORT_BY = 'ProductName'
+# Result count keys tried in order; without one, a short page ends the listing
+TOTAL_KEYS = ('TotalResults', 'Total', 'TotalCount', 'Count')
+
+ListingEntry = Tuple[str, str, str]
+
+
+class ListingApiError(Exception):
+    """The listing endpoint is missing, failed or answered something unexpected"""
+
+
+def find_listing_source(page: str) -> Optional[Tuple[str, str]]:
+    """(endpoint path, parent item ID) of the product grid on a category page"""
+    tag = RESULTS_TAG_PATTERN.search(page)
+    if not tag:
+        return None
+    endpoint = ENDPOINT_ATTR_PATTERN.search(tag.group(0))
+    parent = PARENT_ATTR_PATTERN.search(tag.group(0))
+    if not endpoint or not parent:
+        return None
+    return html_lib.unescape(endpoint.group(1)), html_lib.unescape(parent.group(1))
+
+
+class ListingApiClient:
+    """Lists category pages from the JSON behind their product grid
+
+    The grid is rendered client-side from the endpoint named on the page
+    (data-endpoint, data-parent).  Once a page's endpoint is known, listing
+    it is one request per PAGE_SIZE results instead of a browser page load
+    and its readiness waits.  Each result maps to the same (product URL,
+    model code, description) entries the rendered grid gives; results
+    without a model code are subcategory pages.
+    """
+
+    def __init__(self, session, base_url: str, page_size: int = PAGE_SIZE, timeout: float = 15):
+        self.session = session
+        self.base_url = base_url.rstrip('/')
+        self.page_size = page_size
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+        self._sources: Dict[str, Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def source(self, page_url: str) -> Tuple[str, str]:
+        """Endpoint and parent ID of a category page, read from its static HTML once"""
+        with self._lock:
+            source = self._sources.get(page_url)
+        if source is None:
+            try:
+                response = self.session.get(page_url, timeout=self.timeout)
+                response.raise_for_status()
+            except Exception as e:
+                raise ListingApiError(f"Could not load {page_url}: {str(e)}")
+            source = find_listing_source(response.text)
+            if source is None:
+                raise ListingApiError(f"No product grid endpoint on {page_url}")
+            with self._lock:
+                self._sources[page_url] = source
+        return source
+
+    def search(self, endpoint: str, parent: str, page: int) -> Dict:
+        """One page of the endpoint's JSON"""
+        params = {'parent': parent, 'pagenum': page, 'pagesize': self.page_size, 'sortby': SORT_BY}
+        headers = {'Accept': 'application/json', 'X-Requested-With': 'XMLHttpRequest'}
+        try:
+            response = self.session.get(urljoin(self.base_url, endpoint), params=params, headers=headers,
+                                        timeout=self.timeout)
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            raise ListingApiError(f"{endpoint} page {page} for {parent} failed: {str(e)}")
+        finally:
+            with self._lock:
+                self.requests += 1
+        if not isinstance(data, dict) or not isinstance(data.get('Results'), list):
+            raise ListingApiError(f"{endpoint} page {page} for {parent} has no Results")
+        return data
+
+    def entry(self, result: Dict) -> Tuple[Optional[ListingEntry], Optional[str]]:
+        """(product entry, None) for a product result, (None, URL) for a subcategory"""
+        href = result.get('Url')
+        if not href:
+            return None, None
+        url = urljoin(self.base_url, href)
+        match = PRODUCT_CODE_PATTERN.search(href) or PRODUCT_CODE_PATTERN.search(result.get('Name') or '')
+        if not match:
+            return None, url
+        return (url, match.group(0).upper(), normalize_description(html_lib.unescape(result.get('Description') or ''))), None
+
+    def list_page(self, page_url: str) -> Tuple[List[ListingEntry], List[str]]:
+        """Products and subcategory pages listed on a category page, every page of them"""
+        endpoint, parent = self.source(page_url)
+        products: Dict[str, ListingEntry] = {}
+        subcategories: List[str] = []
+        page = 1
+        while True:
+            data = self.search(endpoint, parent, page)
+            results = data['Results']
+            for result in results:
+                product, subcategory = self.entry(result)
+                if product:
+                    products.setdefault(product[0], product)
+                elif subcategory and subcategory not in subcategories:
+                    subcategories.append(subcategory)
+
+            total = next((data[key] for key in TOTAL_KEYS if isinstance(data.get(key), int)), None)
+            seen = (page - 1) * self.page_size + len(results)
+            if len(results) < self.page_size or (total is not None and seen >= total):
+                break
+            page += 1
+
+        self.logger.info(f"Listed {len(products)} products and {len(subcategories)} subcategories "
+                         f"of {page_url} in {page} API requests")
+        return list(products.values()), subcategories
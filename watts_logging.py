@@ -0,0 +1,178 @@
+import atexit
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+# Loggers that drown the scraper's own output at DEBUG
+QUIET_LOGGERS = {
+    'selenium': logging.WARNING,
+    'urllib3': logging.WARNING,
+    'httpx': logging.WARNING,
+    'httpcore': logging.WARNING,
+}
+
+CONSOLE_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_listener = None
+_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and any extras"""
+
+    RESERVED = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        for key, value in vars(record).items():
+            if key not in self.RESERVED and not key.startswith('_'):
+                entry[key] = value
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Passes every `every`-th DEBUG record from each call site
+
+    The first record from a line always gets through, so a new kind of
+    event is never hidden; only repeats (selector loops, per-element dumps)
+    are thinned.  INFO and above are never sampled.
+    """
+
+    def __init__(self, every: int = 10):
+        super().__init__()
+        self.every = max(1, every)
+        self.dropped = 0
+        self._seen = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.every == 1:
+            return True
+        with self._lock:
+            seen = self._seen[(record.pathname, record.lineno)]
+            self._seen[(record.pathname, record.lineno)] = seen + 1
+            if seen % self.every:
+                self.dropped += 1
+                return False
+        return True
+
+
+def _gzip_rotator(source: str, dest: str):
+    with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def compressing_file_handler(path: str, max_bytes: int, backups: int) -> logging.Handler:
+    """Size-rotated file handler whose rotated files are gzipped"""
+    handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backups, encoding='utf-8', delay=True
+    )
+    handler.namer = lambda name: f"{name}.gz"
+    handler.rotator = _gzip_rotator
+    return handler
+
+
+def parse_levels(spec: str) -> Tuple[int, Dict[str, int]]:
+    """Parse "INFO,watts_readiness=DEBUG" into a root level and per-logger levels"""
+    root = logging.INFO
+    levels = {}
+    for part in filter(None, (p.strip() for p in spec.split(','))):
+        name, _, level = part.rpartition('=')
+        value = logging.getLevelName(level.strip().upper())
+        if not isinstance(value, int):
+            raise ValueError(f"Unknown log level: {level}")
+        if name:
+            levels[name.strip()] = value
+        else:
+            root = value
+    return root, levels
+
+
+def setup_logging(log_file: Optional[str] = 'watts_scraper.log', levels: str = 'INFO',
+                  json_lines: bool = True, console: bool = True,
+                  max_bytes: int = 10 * 1024 * 1024, backups: int = 5,
+                  debug_sample_every: int = 10, force: bool = False):
+    """Route all logging through a queue to a rotating file and the console
+
+    Loggers only put records on an in-memory queue; a listener thread does
+    the formatting and disk writes, so a slow disk never stalls a crawl
+    thread.  levels is a root level plus optional per-logger overrides
+    (see parse_levels).  Like logging.basicConfig this leaves an already
+    configured root logger alone unless force is set, and later calls are
+    no-ops.  Returns the QueueListener, or None if nothing was set up.
+    """
+    global _listener
+    root_level, logger_levels = parse_levels(levels)
+    root = logging.getLogger()
+
+    with _lock:
+        if _listener is not None and not force:
+            return None
+        if root.handlers and not force:
+            return None
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+            handler.close()
+
+        handlers = []
+        if log_file:
+            file_handler = compressing_file_handler(log_file, max_bytes, backups)
+            file_handler.setFormatter(JsonFormatter() if json_lines else logging.Formatter(CONSOLE_FORMAT))
+            handlers.append(file_handler)
+        if console:
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+            handlers.append(console_handler)
+
+        records = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(records)
+        queue_handler.addFilter(SamplingFilter(debug_sample_every))
+        root.addHandler(queue_handler)
+        root.setLevel(root_level)
+        for name, level in {**QUIET_LOGGERS, **logger_levels}.items():
+            logging.getLogger(name).setLevel(level)
+
+        _listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logging)
+        return _listener
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            for handler in _listener.handlers:
+                handler.close()
+            _listener = None
+
+
+def dump_page(html: str, prefix: str) -> str:
+    """Write a page source to <prefix>_<epoch>.html for offline debugging"""
+    path = f"{prefix}_{int(time.time())}.html"
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html)
+    return path
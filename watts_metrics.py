@@ -0,0 +1,172 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+# Upper bounds (seconds) of the span histogram buckets; +Inf is implicit
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 60, 120)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram with count, sum, min and max"""
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, seconds: float):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Estimate, interpolating linearly inside the bucket that holds it"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                lower = max(lower, self.min)
+                upper = min(upper, self.max)
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'total_s': round(self.total, 3),
+            'mean_ms': round(self.total / self.count * 1000, 1) if self.count else 0.0,
+            'p50_ms': round(self.quantile(0.50) * 1000, 1),
+            'p95_ms': round(self.quantile(0.95) * 1000, 1),
+            'max_ms': round((self.max or 0.0) * 1000, 1),
+        }
+
+
+class RunMetrics:
+    """Span timings for one scraper run, aggregated into histograms
+
+    span() times a block and tags it with the calling thread's current
+    tags (set with tags(), e.g. category and product) plus any passed in.
+    Spans are kept per name, and per (name, category), never individually,
+    so memory stays flat however long the run is.
+    """
+
+    def __init__(self):
+        self.started = datetime.now()
+        self._start = time.monotonic()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.spans: Dict[str, Histogram] = {}
+        self.by_category: Dict[Tuple[str, str], Histogram] = {}
+        self.products = set()
+
+    def current_tags(self) -> Dict[str, str]:
+        return dict(getattr(self._local, 'tags', {}))
+
+    @contextmanager
+    def tags(self, **tags):
+        """Tag every span this thread records inside the block"""
+        previous = getattr(self._local, 'tags', {})
+        self._local.tags = {**previous, **{k: v for k, v in tags.items() if v is not None}}
+        try:
+            yield
+        finally:
+            self._local.tags = previous
+
+    @contextmanager
+    def span(self, name: str, **tags):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.record(name, time.monotonic() - start, **tags)
+
+    def record(self, name: str, seconds: float, **tags):
+        """Add one finished span"""
+        tags = {**self.current_tags(), **tags}
+        category = tags.get('category')
+        with self._lock:
+            self.spans.setdefault(name, Histogram()).observe(seconds)
+            if category:
+                self.by_category.setdefault((name, category), Histogram()).observe(seconds)
+            if tags.get('product'):
+                self.products.add((category, tags['product']))
+
+    def report(self) -> Dict:
+        """JSON-ready summary: totals per span, and per span within each category"""
+        with self._lock:
+            categories = {}
+            for (name, category), histogram in sorted(self.by_category.items()):
+                categories.setdefault(category, {})[name] = histogram.summary()
+            return {
+                'started': self.started.isoformat(timespec='seconds'),
+                'duration_s': round(time.monotonic() - self._start, 2),
+                'products': len(self.products),
+                'spans': {name: histogram.summary() for name, histogram in sorted(self.spans.items())},
+                'categories': categories,
+            }
+
+    def write_report(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+
+    @staticmethod
+    def _label(value: str) -> str:
+        return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    def openmetrics(self) -> str:
+        """Span histograms in OpenMetrics text format"""
+        lines = [
+            '# TYPE watts_span_seconds histogram',
+            '# UNIT watts_span_seconds seconds',
+            '# HELP watts_span_seconds Time spent in each scraper stage.',
+        ]
+        with self._lock:
+            series = [({'span': name}, histogram) for name, histogram in sorted(self.spans.items())]
+            series += [({'span': name, 'category': category}, histogram)
+                       for (name, category), histogram in sorted(self.by_category.items())]
+            for labels, histogram in series:
+                base = ','.join(f'{key}="{self._label(value)}"' for key, value in labels.items())
+                cumulative = 0
+                for bound, count in zip(list(histogram.buckets) + ['+Inf'], histogram.counts):
+                    cumulative += count
+                    lines.append(f'watts_span_seconds_bucket{{{base},le="{bound}"}} {cumulative}')
+                lines.append(f'watts_span_seconds_count{{{base}}} {histogram.count}')
+                lines.append(f'watts_span_seconds_sum{{{base}}} {histogram.total:.6f}')
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def write_openmetrics(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.openmetrics())
+
+
+def report_paths(output_dir: str, started: Optional[datetime] = None,
+                 worker: Optional[str] = None) -> Tuple[str, str]:
+    """(json, openmetrics) paths for a run report, beside output_dir
+
+    Queue workers started in the same second pass their worker name so
+    their reports do not overwrite each other.
+    """
+    stamp = (started or datetime.now()).strftime('%Y%m%d_%H%M%S')
+    base = f"{output_dir.rstrip('/')}_run_{stamp}"
+    if worker:
+        base = f"{base}_{worker}"
+    return f"{base}.json", f"{base}.prom"
@@ -0,0 +1,161 @@
+import concurrent.futures
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import PyPDF2
+
+PDF_MAGIC = b"%PDF-"
+# The header may follow up to this much junk, and %%EOF must fall in the
+# last this-many bytes (PDF 1.7, annex H)
+HEADER_WINDOW = 1024
+TAIL_WINDOW = 1024
+
+
+class PdfCheckError(ValueError):
+    """A downloaded spec sheet is not a complete PDF"""
+
+
+class NotPdfError(PdfCheckError):
+    """The response is something else entirely, e.g. an HTML error page"""
+
+
+def expected_length(headers) -> Optional[int]:
+    """Decoded body length promised by Content-Length, when it can be trusted
+
+    With a Content-Encoding the header counts compressed bytes, which the
+    HTTP clients decode away before the check sees them.
+    """
+    encoding = headers.get('Content-Encoding', 'identity').lower()
+    try:
+        length = int(headers.get('Content-Length'))
+    except (TypeError, ValueError):
+        return None
+    return length if encoding == 'identity' else None
+
+
+class PdfStreamCheck:
+    """Validates a PDF chunk by chunk, holding only its head and tail
+
+    feed() raises NotPdfError as soon as the start of the body shows it is
+    not a PDF, so error pages are dropped after their first chunk.  finish()
+    raises PdfCheckError if the body was cut short: fewer bytes than
+    Content-Length promised, or no startxref / %%EOF near the end.
+    """
+
+    def __init__(self, expected: Optional[int] = None):
+        self.expected = expected
+        self.size = 0
+        self._head = b""
+        self._header_seen = False
+        self._tail = b""
+
+    def feed(self, chunk: bytes):
+        self.size += len(chunk)
+        if not self._header_seen:
+            self._head = (self._head + chunk)[:HEADER_WINDOW + len(PDF_MAGIC)]
+            if PDF_MAGIC in self._head:
+                self._header_seen = True
+                self._head = b""
+            elif len(self._head) >= HEADER_WINDOW + len(PDF_MAGIC) or self._head.lstrip()[:1] == b"<":
+                raise NotPdfError(f"No {PDF_MAGIC.decode()} header: {self._head[:40]!r}")
+        self._tail = (self._tail + chunk)[-TAIL_WINDOW:]
+
+    def finish(self):
+        if not self._header_seen:
+            raise NotPdfError(f"No {PDF_MAGIC.decode()} header in {self.size} bytes")
+        if self.expected is not None and self.size != self.expected:
+            raise PdfCheckError(f"Got {self.size} of {self.expected} bytes")
+        if b"%%EOF" not in self._tail:
+            raise PdfCheckError("Missing %%EOF trailer, file is truncated")
+        if b"startxref" not in self._tail:
+            raise PdfCheckError("Missing startxref before %%EOF")
+
+
+def check_bytes(content: bytes, expected: Optional[int] = None):
+    """Run the stream check over an in-memory document"""
+    check = PdfStreamCheck(expected)
+    view = memoryview(content)
+    for start in range(0, len(content), 65536):
+        check.feed(bytes(view[start:start + 65536]))
+    check.finish()
+
+
+def check_file(path: str):
+    """Run the stream check on a saved file, reading only its head and tail"""
+    size = os.path.getsize(path)
+    check = PdfStreamCheck()
+    with open(path, 'rb') as f:
+        check.feed(f.read(HEADER_WINDOW + len(PDF_MAGIC)))
+        if size > check.size:
+            f.seek(max(check.size, size - TAIL_WINDOW))
+            check.feed(f.read())
+    check.finish()
+
+
+def parse_structure(path: str) -> Tuple[Optional[str], float]:
+    """Fully parse a PDF file; returns (error or None, seconds taken)
+
+    Runs in a worker process, reading the file itself so the document
+    never passes through the parent.
+    """
+    start = time.perf_counter()
+    try:
+        with open(path, 'rb') as f:
+            reader = PyPDF2.PdfReader(f)
+            for page in reader.pages:
+                page.get_contents()
+        return None, time.perf_counter() - start
+    except Exception as e:
+        return f"{type(e).__name__}: {e}", time.perf_counter() - start
+
+
+class PdfStructureChecker:
+    """Optional full PyPDF2 parse of downloaded files in a process pool
+
+    submit() returns at once; failures are collected in `invalid` as
+    (url, path, error) and returned by close().  Each parse is recorded
+    as a pdf_verify span when metrics is given.
+    """
+
+    def __init__(self, workers: int = 1, metrics=None):
+        self.workers = max(1, workers)
+        self.metrics = metrics
+        self.logger = logging.getLogger(__name__)
+        self.checked = 0
+        self.invalid: List[Tuple[str, str, str]] = []
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def submit(self, path: str, url: Optional[str] = None,
+               tags: Optional[Dict[str, str]] = None) -> concurrent.futures.Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+            future = self._executor.submit(parse_structure, path)
+        future.add_done_callback(lambda f: self._done(f, path, url, tags or {}))
+        return future
+
+    def _done(self, future, path, url, tags):
+        try:
+            error, seconds = future.result()
+        except Exception as e:
+            error, seconds = f"{type(e).__name__}: {e}", 0.0
+        if self.metrics:
+            self.metrics.record('pdf_verify', seconds, **tags)
+        with self._lock:
+            self.checked += 1
+            if error:
+                self.invalid.append((url, path, error))
+        if error:
+            self.logger.warning(f"PDF failed structural check: {path}: {error}")
+
+    def close(self) -> List[Tuple[str, str, str]]:
+        """Wait for outstanding parses and return the files that failed"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        return list(self.invalid)
@@ -0,0 +1,310 @@
+import concurrent.futures
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import PyPDF2
+
+from watts_blob_store import BLOB_DIR, MANIFEST_NAME
+
+# Bump when the patterns or the record layout change, so cached results
+# from an older extractor are redone
+EXTRACTOR_VERSION = 1
+CACHE_DIR = ".extract"
+
+# The same patterns as extractTabularData() in backend/api/process-pdf.js,
+# compiled once per worker instead of per upload
+TABLE_LINE_PATTERN = re.compile(r'^\s*([A-Z0-9-]+)\s*[\|:]\s*(.*?)$', re.M)
+OPTION_PATTERN = re.compile(r'-([0-9A-Z]+(?:-[0-9A-Z]+)?)\s+([^-\n].*?)(?=\n-[0-9A-Z]|\n\s*$|$)')
+PIPE_SIZE_PATTERN = re.compile(r'^[0-9]+"?$')
+STRAINER_PATTERN = re.compile(r'^[A-Z][0-9]+$')
+OUTLET_TYPE_PATTERN = re.compile(r'^[A-Z]+$')
+
+# Watts sheets lay their suffixes out as "<heading>" / "Suffix Description"
+# followed by "<code> <description>" rows; wrapped descriptions continue on
+# the next line after a trailing space
+SUFFIX_HEADER_PATTERN = re.compile(r'^\s*Suffix\s+Description\s*$', re.I)
+SUFFIX_ROW_PATTERN = re.compile(r'^(-?[A-Z0-9]+(?:-[A-Z0-9]+)*)\s+(\S.*?)\s*$')
+
+
+def suffix_type(code: str) -> str:
+    """Classify a suffix code the way the backend does"""
+    if PIPE_SIZE_PATTERN.match(code):
+        return 'Pipe Size'
+    if STRAINER_PATTERN.match(code):
+        return 'Strainer'
+    if OUTLET_TYPE_PATTERN.match(code):
+        return 'Outlet Type'
+    return 'Option'
+
+
+def extract_tabular_data(text: str) -> List[Dict[str, str]]:
+    """Python port of extractTabularData(): "CODE | description" lines and -option rows"""
+    results = []
+    for match in TABLE_LINE_PATTERN.finditer(text):
+        code, description = match.group(1).strip(), match.group(2).strip()
+        if code and description:
+            results.append({'name': f"{suffix_type(code)} Suffix: {code}", 'value': description})
+
+    for match in OPTION_PATTERN.finditer(text):
+        code, description = match.group(1).strip(), match.group(2).strip()
+        if code and description:
+            results.append({'name': f"Options Suffix: -{code}", 'value': description})
+    return results
+
+
+def extract_suffix_tables(text: str) -> List[Dict[str, str]]:
+    """Rows of the "Suffix Description" tables, named like extract_tabular_data()"""
+    results = []
+    lines = text.splitlines()
+    section = None
+    row = None
+    for index, line in enumerate(lines):
+        if SUFFIX_HEADER_PATTERN.match(line):
+            # The heading can share a line with the paragraph before it
+            heading = lines[index - 1].strip() if index else ''
+            section = heading.rsplit('.', 1)[-1].strip() or None
+            row = None
+            continue
+        if section is None:
+            continue
+
+        match = SUFFIX_ROW_PATTERN.match(line.strip())
+        if row is not None and row['wrapped']:
+            row['value'] = f"{row['value']} {line.strip()}".strip()
+            row['wrapped'] = line.endswith(' ')
+        elif match:
+            code = match.group(1)
+            name = f"Options Suffix: {code}" if code.startswith('-') else f"{suffix_type(code)} Suffix: {code}"
+            row = {'name': name, 'value': match.group(2), 'section': section, 'wrapped': line.endswith(' ')}
+            results.append(row)
+        else:
+            section = row = None
+
+    for row in results:
+        del row['wrapped']
+    return results
+
+
+def page_layout(page) -> Tuple[str, List[Dict]]:
+    """A page's text and its text runs with position and font size, top to bottom"""
+    runs = []
+
+    def visit(text, cm, tm, font_dict, font_size):
+        text = text.strip()
+        if text:
+            runs.append({
+                'x': round(tm[4], 1),
+                'y': round(tm[5], 1),
+                'size': round(abs(tm[3]) * font_size, 1),
+                'text': text,
+            })
+
+    text = page.extract_text(visitor_text=visit)
+    runs.sort(key=lambda run: (-run['y'], run['x']))
+    return text, runs
+
+
+def extract_file(path: str) -> Dict:
+    """Extract per-page text, layout and suffix attributes from one PDF
+
+    Runs in a worker process and only depends on the file's content, so
+    the result can be cached under its SHA-256.
+    """
+    start = time.perf_counter()
+    result = {'extractor': EXTRACTOR_VERSION, 'pages': [], 'attributes': [], 'error': None}
+    try:
+        with open(path, 'rb') as f:
+            reader = PyPDF2.PdfReader(f)
+            for number, page in enumerate(reader.pages, 1):
+                text, runs = page_layout(page)
+                result['pages'].append({
+                    'page': number,
+                    'width': float(page.mediabox.width),
+                    'height': float(page.mediabox.height),
+                    'text': text,
+                    'runs': runs,
+                })
+
+                # The backend's looser patterns also match addresses and
+                # footers, so they only read pages without suffix tables
+                attributes = extract_suffix_tables(text) or extract_tabular_data(text)
+                result['attributes'].extend(dict(attribute, page=number) for attribute in attributes)
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_spec_sheets(root: str) -> Iterator[Tuple[str, str]]:
+    """(path, sha256) of every PDF under root, outside the blob store
+
+    Hashes come from each directory's manifest.json where the recorded size
+    still matches the file; anything else is hashed here.
+    """
+    for directory, subdirs, files in os.walk(root):
+        subdirs[:] = sorted(d for d in subdirs if d not in (BLOB_DIR, CACHE_DIR))
+        manifest = {}
+        if MANIFEST_NAME in files:
+            try:
+                with open(os.path.join(directory, MANIFEST_NAME), encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                pass
+        for name in sorted(files):
+            if not name.lower().endswith('.pdf'):
+                continue
+            path = os.path.join(directory, name)
+            entry = manifest.get(name) or {}
+            if entry.get('sha256') and entry.get('size') == os.path.getsize(path):
+                yield path, entry['sha256']
+            else:
+                yield path, file_sha256(path)
+
+
+class ExtractionCache:
+    """Extraction results stored as <root>/.extract/<sha256>.json"""
+
+    def __init__(self, root: str):
+        self.directory = os.path.join(root, CACHE_DIR)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def get(self, digest: str) -> Optional[Dict]:
+        try:
+            with open(self.path(digest), encoding='utf-8') as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return result if result.get('extractor') == EXTRACTOR_VERSION else None
+
+    def put(self, digest: str, result: Dict):
+        path = self.path(digest)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        os.replace(tmp_path, path)
+
+
+class SpecExtractor:
+    """Batch extraction of every spec sheet under a watts_specs directory
+
+    Each distinct document (by SHA-256) is extracted once, in a process
+    pool, and cached; later runs only extract sheets whose content changed.
+    run() yields one record per PDF file with its category (directory) and
+    product (file name) attached.
+    """
+
+    def __init__(self, root: str = "watts_specs", workers: Optional[int] = None, use_cache: bool = True):
+        self.root = root
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = ExtractionCache(root) if use_cache else None
+        self.logger = logging.getLogger(__name__)
+        self.extracted = 0
+        self.cached = 0
+        self.failed = 0
+
+    def run(self) -> List[Dict]:
+        sheets = list(find_spec_sheets(self.root))
+        results: Dict[str, Dict] = {}
+        pending: Dict[str, str] = {}
+        for path, digest in sheets:
+            if digest in results or digest in pending:
+                continue
+            cached = self.cache.get(digest) if self.cache else None
+            if cached is not None:
+                results[digest] = cached
+                self.cached += 1
+            else:
+                pending[digest] = path
+
+        if pending:
+            self.logger.info(f"Extracting {len(pending)} spec sheets on {self.workers} workers "
+                             f"({self.cached} cached)")
+            results.update(self._extract(pending))
+
+        records = []
+        for path, digest in sheets:
+            result = results[digest]
+            relative = os.path.relpath(path, self.root)
+            records.append({
+                'path': relative,
+                'category': os.path.dirname(relative),
+                'product': os.path.splitext(os.path.basename(path))[0],
+                'sha256': digest,
+                'pages': result['pages'],
+                'attributes': result['attributes'],
+                'error': result['error'],
+            })
+        return records
+
+    def _extract(self, pending: Dict[str, str]) -> Dict[str, Dict]:
+        results = {}
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(extract_file, path): digest for digest, path in pending.items()}
+            for future in concurrent.futures.as_completed(futures):
+                digest = futures[future]
+                result = future.result()
+                results[digest] = result
+                self.extracted += 1
+                if result['error']:
+                    self.failed += 1
+                    self.logger.warning(f"Could not extract {pending[digest]}: {result['error']}")
+                # Failures may be transient, so they are tried again next run
+                elif self.cache:
+                    self.cache.put(digest, result)
+        return results
+
+    def summary(self) -> dict:
+        return {'extracted': self.extracted, 'cached': self.cached, 'failed': self.failed}
+
+
+def write_jsonl(records: Iterable[Dict], path: str, with_pages: bool = False):
+    """One line per PDF; per-page text and layout only when with_pages"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            if not with_pages:
+                record = dict(record, pages=len(record['pages']))
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write('\n')
+
+
+def attribute_rows(records: Iterable[Dict]) -> Iterator[Dict]:
+    """Flatten records into one row per (PDF, attribute)"""
+    for record in records:
+        for attribute in record['attributes']:
+            yield {
+                'path': record['path'],
+                'category': record['category'],
+                'product': record['product'],
+                'sha256': record['sha256'],
+                'page': attribute['page'],
+                'section': attribute.get('section'),
+                'name': attribute['name'],
+                'value': attribute['value'],
+            }
+
+
+def write_parquet(records: Iterable[Dict], path: str):
+    """Attribute rows as a Parquet table; needs pyarrow"""
+    import pyarrow
+    import pyarrow.parquet
+
+    rows = list(attribute_rows(records))
+    columns = ['path', 'category', 'product', 'sha256', 'page', 'section', 'name', 'value']
+    table = pyarrow.table({column: [row[column] for row in rows] for column in columns})
+    pyarrow.parquet.write_table(table, path)
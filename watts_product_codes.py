@@ -0,0 +1,176 @@
+import re
+from typing import Iterable, List, NamedTuple, Optional
+from urllib.parse import urljoin
+
+from bs4 import CData, NavigableString, Tag
+
+# Watts drainage model numbers: FD-100, RD-200A, GRD-110, ...
+PRODUCT_CODE_PATTERN = re.compile(r'(?:GRD|RD|FD|DS|FS|CO|TD)-\d+[A-Z]?', re.IGNORECASE)
+
+# Attributes checked, in order, for a product container's model number
+MODEL_ATTRS = ('data-model-number', 'data-product-id', 'data-item-number', 'id')
+GRID_DATA_ATTRS = ('data-product-id', 'data-model-number', 'data-item-number')
+CONTAINER_TERMS = ('product', 'item', 'card', 'tile')
+INTERCEPTOR_CONTAINER_TERMS = CONTAINER_TERMS + ('grid-item',)
+# Class of the one-line product description inside a grid card's link
+DESCRIPTION_CLASS = 'grid-item__paragraph'
+
+# Extraction methods, most to least trustworthy; the first method to find
+# a model decides its product URL.
+METHODS = ('container', 'url', 'script', 'text')
+# Methods that only see a bare model number and have to guess the URL
+GUESSED_URL_METHODS = ('script', 'text')
+
+
+class ProductHit(NamedTuple):
+    product_url: str
+    product_code: str
+    method: str
+    model: str
+    description: str = ''
+
+
+def normalize_description(description: Optional[str]) -> str:
+    """A grid card's description with whitespace collapsed, whichever way it was read"""
+    return ' '.join((description or '').split())
+
+
+def normalize_model(product_url: str, code: str) -> str:
+    """Full model of a product, e.g. FD-100-A for .../fd-100-a with code FD-100
+
+    Variants share a base code, so the product URL's last segment is used
+    when it starts with that code; otherwise the code itself.
+    """
+    slug = product_url.rstrip('/').rsplit('/', 1)[-1].upper()
+    code = code.upper()
+    return slug if slug.startswith(code) else code
+
+
+class _Container:
+    """A product card being walked: its model number and first product link"""
+
+    __slots__ = ('code', 'text_code', 'link')
+
+    def __init__(self, code: Optional[str]):
+        self.code = code
+        self.text_code = None
+        self.link = None
+
+
+class ProductCodeExtractor:
+    """Finds product model numbers on a category page in one tree walk
+
+    Replaces four separate scans (product containers, product hrefs, JSON
+    scripts and the page text) with a single depth-first walk that feeds
+    every method at once.  Hits are deduplicated on the normalized model,
+    keeping the one from the most trustworthy method; a bare model number
+    from a script or the page text is dropped once a product page of that
+    model family has been found.
+    """
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+
+    def product_url(self, code: str) -> str:
+        """Product page URL guessed from a bare model number"""
+        return f"{self.base_url}/products/drainage-solutions/{code.lower()}"
+
+    @staticmethod
+    def _is_container(tag: Tag, container_terms: Iterable[str]) -> bool:
+        attrs = tag.attrs
+        if all(attr in attrs for attr in GRID_DATA_ATTRS):
+            return True
+        if tag.name not in ('div', 'article') or 'data-product-id' not in attrs:
+            return False
+        classes = str(attrs.get('class', '')).lower()
+        return bool(classes) and any(term in classes for term in container_terms)
+
+    @staticmethod
+    def _attr_code(tag: Tag) -> Optional[str]:
+        for attr in MODEL_ATTRS:
+            value = tag.attrs.get(attr)
+            if value:
+                match = PRODUCT_CODE_PATTERN.search(value if isinstance(value, str) else ' '.join(value))
+                if match:
+                    return match.group(0)
+        return None
+
+    def extract(self, soup, container_terms: Iterable[str] = CONTAINER_TERMS,
+                methods: Iterable[str] = METHODS) -> List[ProductHit]:
+        """Every product the given methods find, in method then document order"""
+        container_terms = tuple(container_terms)
+        containers = []
+        found = {method: [] for method in METHODS}
+        text_parts = []
+        descriptions = {}
+
+        # Iterative pre-order walk; each entry carries the containers and
+        # the product link it sits in
+        stack = [(soup, (), None)]
+        while stack:
+            node, open_containers, link = stack.pop()
+
+            if isinstance(node, NavigableString):
+                node_type = type(node)
+                if open_containers:
+                    for container in open_containers:
+                        if container.text_code is None:
+                            match = PRODUCT_CODE_PATTERN.search(node)
+                            if match:
+                                container.text_code = match.group(0)
+                if node_type is NavigableString or node_type is CData:
+                    text_parts.append(node)
+                continue
+
+            if not isinstance(node, Tag):
+                continue
+
+            name = node.name
+            if name == 'a':
+                href = node.attrs.get('href')
+                if href:
+                    for container in open_containers:
+                        if container.link is None and '/products/' in href:
+                            container.link = href
+                    if '/products/' in href:
+                        link = urljoin(self.base_url, href)
+                    if '/products/' in href and '/drainage-solutions/' in href:
+                        match = PRODUCT_CODE_PATTERN.search(href)
+                        if match:
+                            found['url'].append((link, match.group(0)))
+            elif name == 'script' and node.attrs.get('type') == 'application/json':
+                if node.string:
+                    for code in PRODUCT_CODE_PATTERN.findall(node.string):
+                        found['script'].append((self.product_url(code), code))
+            elif link and link not in descriptions and DESCRIPTION_CLASS in node.attrs.get('class', ()):
+                descriptions[link] = normalize_description(node.get_text(' ', strip=True))
+
+            if self._is_container(node, container_terms):
+                container = _Container(self._attr_code(node))
+                containers.append(container)
+                open_containers = open_containers + (container,)
+
+            children = node.contents
+            for child in reversed(children):
+                stack.append((child, open_containers, link))
+
+        for container in containers:
+            code = container.code or container.text_code
+            if code and container.link:
+                found['container'].append((urljoin(self.base_url, container.link), code))
+
+        for code in PRODUCT_CODE_PATTERN.findall(''.join(text_parts)):
+            found['text'].append((self.product_url(code), code))
+
+        hits = {}
+        families = set()
+        for method in (m for m in METHODS if m in methods):
+            for product_url, code in found[method]:
+                code = code.upper()
+                if method in GUESSED_URL_METHODS and code in families:
+                    continue
+                model = normalize_model(product_url, code)
+                if model not in hits:
+                    hits[model] = ProductHit(product_url, code, method, model, descriptions.get(product_url, ''))
+                    families.add(code)
+        return list(hits.values())
@@ -0,0 +1,171 @@
+import asyncio
+import email.utils
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+import httpx
+
+BACKOFF_STATUSES = {429, 503}
+# Statuses worth sending the same request again for
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class AdaptiveRateLimiter:
+    """Token bucket whose refill rate is tuned with AIMD
+
+    Every healthy response nudges the rate up by `increase` requests/second
+    until it reaches 1/min_delay; a 429/503, a response slower than
+    `slow_after` seconds, or a Retry-After header cuts the rate by
+    `decrease_factor`, never going below 1/max_delay.  One instance is
+    shared by the browser, the HTTP transport and the download pipeline.
+    """
+
+    def __init__(self, min_delay: float = 0.5, max_delay: float = 15, initial_delay: float = 3,
+                 burst: int = 1, increase: float = 0.05, decrease_factor: float = 0.5,
+                 slow_after: float = 10):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_rate = 1.0 / min_delay
+        self.min_rate = 1.0 / max_delay
+        self.rate = min(self.max_rate, max(self.min_rate, 1.0 / initial_delay))
+        self.burst = max(1, burst)
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.slow_after = slow_after
+        self.logger = logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+        self.requests = 0
+        self.responses = 0
+        self.backoffs = 0
+        self.throttled = 0
+        self.slow_responses = 0
+        self.retry_after_waits = 0
+        self.total_wait = 0.0
+
+    @property
+    def current_delay(self) -> float:
+        """Seconds between requests at the current rate"""
+        return 1.0 / self.rate
+
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = max(0.0, -self._tokens / self.rate, self._blocked_until - now)
+            self.requests += 1
+            self.total_wait += wait
+        return wait
+
+    def acquire(self) -> float:
+        """Block until the next request may be sent"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Asyncio counterpart of acquire()"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def record(self, status: Optional[int] = None, elapsed: Optional[float] = None,
+               retry_after: Optional[float] = None):
+        """Feed back how a request went so the rate can adapt"""
+        with self._lock:
+            self.responses += 1
+            reason = None
+            if status in BACKOFF_STATUSES:
+                self.throttled += 1
+                reason = f"HTTP {status}"
+            elif elapsed is not None and elapsed > self.slow_after:
+                self.slow_responses += 1
+                reason = f"slow response ({elapsed:.1f}s)"
+
+            if retry_after:
+                self.retry_after_waits += 1
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+                reason = reason or "Retry-After"
+
+            if reason:
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                self._tokens = min(self._tokens, 0.0)
+                self.backoffs += 1
+                self.logger.warning(f"Backing off after {reason}: {self.current_delay:.2f}s between requests")
+            elif status is None or status < 400:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def metrics(self) -> Dict[str, float]:
+        """Snapshot of the limiter's rate and backoff counters"""
+        with self._lock:
+            return {
+                'rate_per_second': round(self.rate, 4),
+                'current_delay': round(self.current_delay, 3),
+                'requests': self.requests,
+                'responses': self.responses,
+                'backoffs': self.backoffs,
+                'throttled_responses': self.throttled,
+                'slow_responses': self.slow_responses,
+                'retry_after_waits': self.retry_after_waits,
+                'total_wait_seconds': round(self.total_wait, 2),
+            }
+
+
+class RateLimitedTransport(httpx.HTTPTransport):
+    """httpx transport that paces requests through an AdaptiveRateLimiter
+
+    Responses with a RETRY_STATUSES status are retried up to max_retries
+    times, backoff_factor * 1, 2, 4... seconds apart; a Retry-After header
+    holds back every request through the limiter as well.
+    """
+
+    def __init__(self, limiter: Optional[AdaptiveRateLimiter] = None, max_retries: int = 3,
+                 backoff_factor: float = 1, **kwargs):
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        super().__init__(**kwargs)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            if self.limiter:
+                self.limiter.acquire()
+            start = time.monotonic()
+            response = super().handle_request(request)
+            if self.limiter:
+                self.limiter.record(
+                    status=response.status_code,
+                    elapsed=time.monotonic() - start,
+                    retry_after=parse_retry_after(response.headers.get('Retry-After'))
+                )
+            if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                return response
+            response.close()
+            time.sleep(self.backoff_factor * 2 ** attempt)
+            attempt += 1
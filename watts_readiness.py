@@ -0,0 +1,173 @@
+import json
+import logging
+import threading
+import time
+
+from selenium.webdriver.common.by import By
+
+# Chrome only records these when the driver was started with
+# goog:loggingPrefs = {'performance': 'ALL'}.
+REQUEST_STARTED = 'Network.requestWillBeSent'
+REQUEST_FINISHED = ('Network.loadingFinished', 'Network.loadingFailed')
+
+
+def enable_performance_log(chrome_options):
+    """Ask Chrome to expose DevTools network events through get_log('performance')"""
+    chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+
+class PageReadiness:
+    """Condition-based page readiness waits for the scrapers
+
+    Each wait polls a concrete condition (network idle, a stable element
+    count, elements present) with its own timeout instead of sleeping for
+    a fixed time.  `replaces` is the fixed sleep a call stands in for; the
+    difference to the real wait is logged and totalled in saved_seconds.
+    Every performance event read is also passed to event_sink(driver, message),
+    and every wait is recorded as a readiness_wait span when metrics is given.
+    """
+
+    def __init__(self, poll: float = 0.25, event_sink=None, metrics=None):
+        self.poll = poll
+        self.event_sink = event_sink
+        self.metrics = metrics
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.timeouts = 0
+        self.waited_seconds = 0.0
+        self.saved_seconds = 0.0
+
+    def _finish(self, condition: str, start: float, ready: bool, replaces: float) -> bool:
+        elapsed = time.monotonic() - start
+        saved = replaces - elapsed
+        with self._lock:
+            self.waits += 1
+            self.waited_seconds += elapsed
+            self.saved_seconds += saved
+            if not ready:
+                self.timeouts += 1
+        if self.metrics:
+            self.metrics.record('readiness_wait', elapsed)
+        if ready:
+            self.logger.info(f"Ready: {condition} after {elapsed:.2f}s "
+                             f"(fixed wait was {replaces:.0f}s, saved {saved:.2f}s)")
+        else:
+            self.logger.debug(f"Timed out waiting for {condition} after {elapsed:.2f}s")
+        return ready
+
+    def _read_events(self, driver):
+        """Parsed DevTools messages buffered since the last read"""
+        messages = []
+        for entry in driver.get_log('performance'):
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, TypeError, ValueError):
+                continue
+            if self.event_sink:
+                self.event_sink(driver, message)
+            messages.append(message)
+        return messages
+
+    def discard_events(self, driver):
+        """Drain buffered performance events so the next wait only sees the new page"""
+        try:
+            self._read_events(driver)
+        except Exception:
+            pass
+
+    def document_ready(self, driver, timeout: float = 10, replaces: float = 0) -> bool:
+        """Wait for document.readyState == 'complete'"""
+        start = time.monotonic()
+        while time.monotonic() - start < timeout:
+            try:
+                if driver.execute_script("return document.readyState") == 'complete':
+                    return self._finish("document ready", start, True, replaces)
+            except Exception:
+                pass
+            time.sleep(self.poll)
+        return self._finish("document ready", start, False, replaces)
+
+    def network_idle(self, driver, timeout: float = 10, idle_time: float = 0.5,
+                     max_inflight: int = 0, replaces: float = 0) -> bool:
+        """Wait until at most max_inflight requests are pending for idle_time seconds
+
+        Falls back to document.readyState when the performance log is not
+        available on this driver.
+        """
+        start = time.monotonic()
+        inflight = set()
+        last_activity = start
+
+        while time.monotonic() - start < timeout:
+            try:
+                messages = self._read_events(driver)
+            except Exception:
+                return self.document_ready(driver, timeout=timeout - (time.monotonic() - start),
+                                           replaces=replaces)
+
+            now = time.monotonic()
+            for message in messages:
+                method = message.get('method')
+                request_id = message.get('params', {}).get('requestId')
+                if method == REQUEST_STARTED:
+                    inflight.add(request_id)
+                    last_activity = now
+                elif method in REQUEST_FINISHED:
+                    inflight.discard(request_id)
+                    last_activity = now
+
+            if len(inflight) <= max_inflight and now - last_activity >= idle_time:
+                return self._finish("network idle", start, True, replaces)
+            time.sleep(self.poll)
+
+        return self._finish("network idle", start, False, replaces)
+
+    def stable_count(self, driver, css_selector: str, timeout: float = 10,
+                     settle: float = 1.0, replaces: float = 0) -> int:
+        """Wait until at least one element matches and the count stops changing
+
+        Returns the last count seen (0 when nothing matched before timeout).
+        """
+        start = time.monotonic()
+        count = -1
+        changed = start
+
+        while time.monotonic() - start < timeout:
+            try:
+                current = len(driver.find_elements(By.CSS_SELECTOR, css_selector))
+            except Exception:
+                current = 0
+            now = time.monotonic()
+            if current != count:
+                count = current
+                changed = now
+            elif count > 0 and now - changed >= settle:
+                self._finish(f"{count} x '{css_selector}' stable", start, True, replaces)
+                return count
+            time.sleep(self.poll)
+
+        self._finish(f"stable '{css_selector}'", start, False, replaces)
+        return max(count, 0)
+
+    def present(self, driver, xpath: str, timeout: float = 10, replaces: float = 0) -> bool:
+        """Wait until at least one element matches the XPath"""
+        start = time.monotonic()
+        while time.monotonic() - start < timeout:
+            try:
+                if driver.find_elements(By.XPATH, xpath):
+                    return self._finish(f"'{xpath}' present", start, True, replaces)
+            except Exception:
+                pass
+            time.sleep(self.poll)
+        return self._finish(f"'{xpath}' present", start, False, replaces)
+
+    def summary(self) -> dict:
+        """Totals across every wait so far"""
+        with self._lock:
+            return {
+                'waits': self.waits,
+                'timeouts': self.timeouts,
+                'waited_seconds': round(self.waited_seconds, 2),
+                'saved_seconds': round(self.saved_seconds, 2),
+            }
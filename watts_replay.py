@@ -0,0 +1,438 @@
+import glob
+import hashlib
+import html as html_lib
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urljoin, urlparse
+
+import lxml.html
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from watts_listing_api import find_listing_source
+from watts_product_codes import PRODUCT_CODE_PATTERN
+
+LIVE_ORIGIN = "https://www.watts.com"
+
+# Pages saved from watts.com by earlier debugging runs
+SNAPSHOT_PATTERNS = (
+    'debug_page_source_*.html',
+    'debug_page*.html',
+    'debug_product_page_*.html',
+    'initial_page.html',
+    'final_page.html',
+)
+FIXTURE_PDF = os.path.join('watts_specs', 'test', 'fd-100-a.pdf')
+HOME_PAGE = 'initial_page.html'
+
+TITLE_PATTERN = re.compile(r'<title>([^<]*)</title>', re.IGNORECASE)
+LIVE_PRODUCT_HREF = re.compile(r'href="https://www\.watts\.com(/products/[^"#?]+)"')
+PRODUCT_HREF = re.compile(r'href="(?:https://www\.watts\.com)?/products/drainage-solutions/')
+
+
+class ReplayCorpus:
+    """Saved watts.com pages indexed by the URL path they were captured from
+
+    Category snapshots are matched to paths by their <title> through
+    add_category(); when several snapshots share a title the one with the
+    most product links (the most fully rendered) wins.  Product snapshots
+    carry their own URL in the hreflang links.  Product paths without a
+    snapshot are served from the first product page with the model number
+    swapped in, so a saved category grid replays every product in it.
+    Every /dfsmedia/ path serves the fixture PDF.  The product grid's
+    search endpoint answers from the served category snapshot with that
+    grid's data-parent, one JSON page of its grid cards at a time.
+    """
+
+    def __init__(self, root: str = '.', pdf_path: Optional[str] = None,
+                 origin: Optional[str] = None):
+        self.root = root
+        self.origin = origin
+        self.logger = logging.getLogger(__name__)
+        self._by_title: Dict[str, Tuple[int, str]] = {}
+        self.categories: Dict[str, str] = {}
+        self.products: Dict[str, str] = {}
+        self.product_template: Optional[Tuple[str, str]] = None
+        self.not_found = "<html><head><title>404 | Watts</title></head><body></body></html>"
+        self.served = Counter()
+        self._served_lock = threading.Lock()
+
+        with open(os.path.join(root, pdf_path or FIXTURE_PDF), 'rb') as f:
+            self.pdf = f.read()
+        self.pdf_etag = '"' + hashlib.sha256(self.pdf).hexdigest()[:16] + '"'
+
+        home_path = os.path.join(root, HOME_PAGE)
+        self.home = self._read(home_path) if os.path.exists(home_path) else self.not_found
+        self._load()
+
+    @staticmethod
+    def _read(path):
+        with open(path, encoding='utf-8', errors='replace') as f:
+            return f.read()
+
+    def _load(self):
+        seen = set()
+        for pattern in SNAPSHOT_PATTERNS:
+            for path in sorted(glob.glob(os.path.join(self.root, pattern))):
+                if path in seen:
+                    continue
+                seen.add(path)
+                page = self._read(path)
+                title_match = TITLE_PATTERN.search(page)
+                title = html_lib.unescape(title_match.group(1)).strip() if title_match else ''
+
+                if title.startswith('404'):
+                    self.not_found = page
+                    continue
+
+                product_path = LIVE_PRODUCT_HREF.search(page)
+                if 'product-download__link' in page and product_path:
+                    self.products[product_path.group(1).rstrip('/')] = page
+                    code = title.split(' - ')[0].strip()
+                    if self.product_template is None and PRODUCT_CODE_PATTERN.match(code):
+                        self.product_template = (code, page)
+                    continue
+
+                links = len(PRODUCT_HREF.findall(page))
+                if title and links >= self._by_title.get(title, (-1, ''))[0]:
+                    self._by_title[title] = (links, page)
+
+        self.logger.info(f"Replay corpus: {len(self._by_title)} category pages, "
+                         f"{len(self.products)} product pages")
+
+    def add_category(self, title: str, url: str):
+        """Serve the snapshot titled `title` at url's path"""
+        path = urlparse(url).path.rstrip('/')
+        if title in self._by_title:
+            self.categories[path] = self._by_title[title][1]
+
+    def _rewrite(self, page: str) -> str:
+        if self.origin:
+            page = page.replace(LIVE_ORIGIN, self.origin)
+        return page
+
+    def page(self, url_or_path: str) -> Tuple[int, str]:
+        """(status, html) for a page URL or path"""
+        path = urlparse(url_or_path).path.rstrip('/')
+        if not path:
+            return 200, self._rewrite(self.home)
+        if path in self.categories:
+            return 200, self._rewrite(self.categories[path])
+        if path in self.products:
+            return 200, self._rewrite(self.products[path])
+
+        slug = path.rsplit('/', 1)[-1]
+        if self.product_template and path.startswith('/products/') and PRODUCT_CODE_PATTERN.match(slug):
+            code, page = self.product_template
+            page = page.replace(code.lower(), slug.lower()).replace(code.upper(), slug.upper())
+            return 200, self._rewrite(page)
+        return 404, self._rewrite(self.not_found)
+
+    def search(self, path_and_query: str) -> Tuple[int, str]:
+        """(status, JSON) for a series search request, paged like the live endpoint"""
+        query = parse_qs(urlparse(path_and_query).query)
+        parent = query.get('parent', [''])[0]
+        page = int(query.get('pagenum', ['1'])[0])
+        size = int(query.get('pagesize', ['30'])[0])
+        for snapshot in self.categories.values():
+            source = find_listing_source(snapshot)
+            if source and source[1] == parent:
+                break
+        else:
+            return 404, json.dumps({'Message': 'An error has occurred.'})
+
+        results = []
+        for card in lxml.html.fromstring(snapshot).xpath('//a[contains(@class, "grid-item")]'):
+            href = card.get('href', '')
+            if '{{' in href:
+                continue
+            heading = card.xpath('.//*[contains(@class, "grid-item__heading")]')
+            paragraph = card.xpath('.//*[contains(@class, "grid-item__paragraph")]')
+            results.append({
+                'Url': href.replace(LIVE_ORIGIN, ''),
+                'Name': heading[0].text_content().strip() if heading else '',
+                'Description': paragraph[0].text_content().strip() if paragraph else '',
+            })
+        start = (page - 1) * size
+        return 200, json.dumps({'Results': results[start:start + size], 'TotalResults': len(results)})
+
+    @staticmethod
+    def is_search(url_or_path: str) -> bool:
+        return urlparse(url_or_path).path == '/api/watts/series/search'
+
+    @staticmethod
+    def is_pdf(url_or_path: str) -> bool:
+        return urlparse(url_or_path).path.startswith('/dfsmedia/')
+
+    def count(self, kind: str):
+        with self._served_lock:
+            self.served[kind] += 1
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    corpus: ReplayCorpus = None
+
+    def _respond(self, body_wanted: bool):
+        corpus = self.corpus
+        if corpus.is_pdf(self.path):
+            if self.headers.get('If-None-Match') == corpus.pdf_etag:
+                corpus.count('pdf_not_modified')
+                self.send_response(304)
+                self.end_headers()
+                return
+            corpus.count('pdf' if body_wanted else 'pdf_head')
+            status, body, content_type = 200, corpus.pdf, 'application/pdf'
+        elif corpus.is_search(self.path):
+            corpus.count('search')
+            status, data = corpus.search(self.path)
+            body, content_type = data.encode('utf-8'), 'application/json; charset=utf-8'
+        else:
+            corpus.count('page' if body_wanted else 'page_head')
+            status, page = corpus.page(self.path)
+            body, content_type = page.encode('utf-8'), 'text/html; charset=utf-8'
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if content_type == 'application/pdf':
+            self.send_header('ETag', corpus.pdf_etag)
+        self.end_headers()
+        if body_wanted:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond(True)
+
+    def do_HEAD(self):
+        self._respond(False)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReplayServer:
+    """Serves a ReplayCorpus over HTTP on localhost"""
+
+    def __init__(self, corpus: ReplayCorpus, host: str = '127.0.0.1', port: int = 0):
+        self.corpus = corpus
+        handler = type('ReplayHandler', (_ReplayHandler,), {'corpus': corpus})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self.base_url = f"http://{host}:{self.server.server_address[1]}"
+        corpus.origin = self.base_url
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name='replay-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+CSS_SIMPLE = re.compile(
+    r"""\.(?P<cls>[\w-]+)"""
+    r"""|#(?P<id>[\w-]+)"""
+    r"""|\[(?P<attr>[\w-]+)(?:(?P<op>[*^$]?=)['"]?(?P<val>[^'"\]]*)['"]?)?\]"""
+)
+CSS_TAG = re.compile(r'^(?P<tag>[\w-]+|\*)?')
+
+
+def css_to_xpath(selector: str) -> str:
+    """XPath for a group of simple CSS selectors (tag, .class, #id, [attr], [attr op value])
+
+    Descendant selectors and pseudo-classes are not needed by the scrapers
+    and are rejected rather than half-supported.
+    """
+    paths = []
+    for part in selector.split(','):
+        part = part.strip()
+        tag = CSS_TAG.match(part).group('tag') or '*'
+        rest = part[len(CSS_TAG.match(part).group(0)):]
+        conditions = []
+        position = 0
+        for match in CSS_SIMPLE.finditer(rest):
+            if match.start() != position:
+                break
+            position = match.end()
+            if match.group('cls'):
+                conditions.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {match.group('cls')} ')")
+            elif match.group('id'):
+                conditions.append(f"@id='{match.group('id')}'")
+            else:
+                attr, op, val = match.group('attr'), match.group('op'), match.group('val')
+                conditions.append({
+                    None: f"@{attr}",
+                    '=': f"@{attr}='{val}'",
+                    '*=': f"contains(@{attr}, '{val}')",
+                    '^=': f"starts-with(@{attr}, '{val}')",
+                    '$=': f"substring(@{attr}, string-length(@{attr}) - {len(val or '') - 1})='{val}'",
+                }[op])
+        if position != len(rest):
+            raise NotImplementedError(f"Replay driver cannot translate CSS selector {part!r}")
+        paths.append(f"descendant-or-self::{tag}" + ''.join(f"[{c}]" for c in conditions))
+    return ' | '.join(paths)
+
+
+class ReplayElement:
+    """The slice of WebElement the scrapers use, over an lxml element"""
+
+    def __init__(self, element):
+        self._element = element
+
+    @property
+    def text(self) -> str:
+        return ' '.join(self._element.text_content().split())
+
+    @property
+    def tag_name(self) -> str:
+        return self._element.tag
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        value = self._element.get(name)
+        if name in ('href', 'src') and value is not None:
+            return urljoin(self._element.base_url or '', value)
+        return value
+
+    def is_displayed(self) -> bool:
+        return True
+
+    def is_enabled(self) -> bool:
+        return True
+
+    def click(self):
+        pass
+
+    def find_elements(self, by: str, value: str) -> List['ReplayElement']:
+        return ReplayDriver.select(self._element, by, value)
+
+    def find_element(self, by: str, value: str) -> 'ReplayElement':
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"{by}={value}")
+        return elements[0]
+
+
+class ReplayDriver:
+    """Stands in for webdriver.Chrome, loading pages from a ReplayCorpus
+
+    Page loads are answered from the corpus directly, so no browser or
+    network is needed; scripts other than readyState checks are no-ops and
+    the performance log is always empty.
+    """
+
+    def __init__(self, corpus: ReplayCorpus, *args, **kwargs):
+        self.corpus = corpus
+        self.current_url = 'about:blank'
+        self.page_source = '<html><head></head><body></body></html>'
+        self.status = 200
+        self.pages_loaded = 0
+        self.closed = False
+        self.cookies = []
+        self._tree = None
+
+    @property
+    def title(self) -> str:
+        match = TITLE_PATTERN.search(self.page_source)
+        return html_lib.unescape(match.group(1)).strip() if match else ''
+
+    def get(self, url: str):
+        self.status, self.page_source = self.corpus.page(url)
+        self.current_url = url
+        self.pages_loaded += 1
+        self.corpus.count('browser_page')
+        self._tree = None
+
+    def _document(self):
+        if self._tree is None:
+            self._tree = lxml.html.fromstring(self.page_source, base_url=self.current_url)
+        return self._tree
+
+    @staticmethod
+    def select(root, by: str, value: str) -> List[ReplayElement]:
+        if by == By.XPATH:
+            matches = root.xpath(value)
+        else:
+            css = {
+                By.ID: f'[id="{value}"]',
+                By.CLASS_NAME: f'.{value}',
+                By.TAG_NAME: value,
+                By.NAME: f'[name="{value}"]',
+                By.CSS_SELECTOR: value,
+            }.get(by)
+            if css is None:
+                raise NotImplementedError(f"Replay driver does not support locating by {by}")
+            matches = root.xpath(css_to_xpath(css))
+        return [ReplayElement(match) for match in matches if hasattr(match, 'tag')]
+
+    def find_elements(self, by: str, value: str) -> List[ReplayElement]:
+        return self.select(self._document(), by, value)
+
+    def find_element(self, by: str, value: str) -> ReplayElement:
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"{by}={value}")
+        return elements[0]
+
+    def execute_script(self, script: str, *args):
+        if 'document.readyState' in script:
+            return 'complete'
+        return None
+
+    def execute_cdp_cmd(self, cmd: str, params: dict):
+        return {}
+
+    def get_log(self, log_type: str):
+        return []
+
+    def get_cookies(self):
+        return [dict(cookie) for cookie in self.cookies]
+
+    def add_cookie(self, cookie: dict):
+        self.cookies = [c for c in self.cookies if c['name'] != cookie['name']] + [dict(cookie)]
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def quit(self):
+        self.closed = True
+
+
+def build_replay_scraper(server: ReplayServer, output_dir: str, rate: Optional[float] = None, **kwargs):
+    """WattsSpecScraper wired to a running ReplayServer and ReplayDrivers
+
+    rate (requests per second) replaces the live-site pacing, which would
+    otherwise dominate an offline run.  Remaining kwargs go to the scraper.
+    """
+    from scrape_watts_specs_new import WattsSpecScraper
+
+    corpus = server.corpus
+    scraper = WattsSpecScraper(base_url=server.base_url, driver_factory=lambda: ReplayDriver(corpus), **kwargs)
+    for name, _ in scraper.drainage_categories:
+        corpus.add_category(name, scraper.get_category_url(name))
+
+    scraper.output_dir = output_dir
+    scraper.state_path = os.path.join(output_dir, 'crawl_state.db')
+    scraper.session_state_path = os.path.join(output_dir, 'session_state.json')
+    if rate:
+        limiter = scraper.rate_limiter
+        limiter.min_delay = 1.0 / rate
+        limiter.max_rate = limiter.rate = rate
+    return scraper
@@ -0,0 +1,130 @@
+import base64
+import re
+from typing import Dict, Optional, Tuple
+
+from watts_pdf_check import PdfCheckError, PdfStreamCheck, expected_length
+
+CONTENT_RANGE_PATTERN = re.compile(r'bytes\s+(\d+)-(\d+)/(\d+|\*)')
+
+
+class RangeError(IOError):
+    """The server's answer to a Range request does not continue the .part file"""
+
+
+def parse_content_range(value: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """(first byte, total length) from a Content-Range header"""
+    match = CONTENT_RANGE_PATTERN.match(value or '')
+    if not match:
+        return None, None
+    total = match.group(3)
+    return int(match.group(1)), None if total == '*' else int(total)
+
+
+def expected_sha256(headers) -> Optional[str]:
+    """Hex SHA-256 of the full document from Repr-Digest or Digest, if sent"""
+    repr_digest = headers.get('Repr-Digest') or ''
+    match = re.search(r'sha-256=:([A-Za-z0-9+/=]+):', repr_digest)
+    if not match:
+        match = re.search(r'(?i)sha-256=([A-Za-z0-9+/=]+)', headers.get('Digest') or '')
+    if not match:
+        return None
+    try:
+        return base64.b64decode(match.group(1)).hex()
+    except ValueError:
+        return None
+
+
+class ResumableDownload:
+    """One spec sheet download into the blob store, resumable across attempts
+
+    Bytes go to the URL's .part file.  When an earlier attempt (or run) left
+    one, request_headers() asks for the rest with Range and If-Range, so a
+    206 continues the file and a 200 (the document changed) starts it over.
+    finish() checks the whole document -- PDF header and trailer, the total
+    length and, when the server sends one, its SHA-256 digest -- before it
+    is committed to the store.  A failed transfer keeps the .part file for
+    the next attempt; a complete but invalid document is discarded.
+
+        with ResumableDownload(blobs, url, state) as download:
+            response = get(url, headers=download.request_headers())
+            download.begin(response.status_code, response.headers)
+            for chunk in response_body:
+                download.feed(chunk)
+            digest = download.finish()
+    """
+
+    def __init__(self, blobs, url: str, state=None):
+        self.url = url
+        self.state = state
+        self.writer = blobs.writer(key=url)
+        self.partial = state.get_partial(url) if state and self.writer.offset else None
+        self.check = None
+        self.expected_digest = None
+        self.resumed_from = 0
+
+    def request_headers(self) -> Dict[str, str]:
+        """Range headers to continue the .part file, or {} to start afresh"""
+        if not self.writer.offset:
+            return {}
+        etag = self.partial and self.partial['etag']
+        validator = etag if etag and not etag.startswith('W/') else self.partial and self.partial['last_modified']
+        if not validator:
+            # No way to tell whether the document changed since: start over
+            self.writer.restart()
+            return {}
+        return {
+            'Range': f'bytes={self.writer.offset}-',
+            'If-Range': validator,
+            'Accept-Encoding': 'identity',
+        }
+
+    def begin(self, status: int, headers):
+        """Set up for the response body; non-2xx answers are left to the caller"""
+        if status == 416:
+            self.writer.restart()
+            raise RangeError(f"Range not satisfiable for {self.url}, restarting")
+        if status == 206:
+            start, total = parse_content_range(headers.get('Content-Range'))
+            if start != self.writer.offset:
+                offset = self.writer.offset
+                self.writer.restart()
+                raise RangeError(f"Asked for byte {offset}, got {start}")
+            self.check = PdfStreamCheck(total)
+            self.writer.resume(self.check.feed)
+            self.resumed_from = start
+        elif 200 <= status < 300:
+            total = expected_length(headers)
+            self.writer.restart()
+            self.check = PdfStreamCheck(total)
+        else:
+            return
+        self.expected_digest = expected_sha256(headers)
+        if self.state:
+            self.state.record_partial(self.url, headers.get('ETag'), headers.get('Last-Modified'), total)
+
+    def feed(self, chunk: bytes):
+        self.check.feed(chunk)
+        self.writer.write(chunk)
+
+    def finish(self) -> str:
+        """Verify the complete document and commit it; returns its SHA-256"""
+        self.check.finish()
+        if self.expected_digest and self.writer.hexdigest() != self.expected_digest:
+            raise PdfCheckError(f"SHA-256 mismatch for {self.url}")
+        digest = self.writer.commit()
+        if self.state:
+            self.state.clear_partial(self.url)
+        return digest
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.writer.digest is not None:
+            return
+        if exc_type is not None and issubclass(exc_type, PdfCheckError):
+            self.writer.discard()
+            if self.state:
+                self.state.clear_partial(self.url)
+        else:
+            self.writer.abort()
@@ -0,0 +1,200 @@
+import collections
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Deque, List, Optional, Tuple
+
+Task = Tuple[Callable, tuple, Optional['TaskGroup']]
+
+
+class WorkStealingScheduler:
+    """Runs a task graph that grows while it runs, on N worker threads
+
+    Each worker has its own deque: tasks it spawns go on the back and it
+    takes its next task from the back too, so a category's pages are
+    crawled depth-first by the worker that found them.  A worker whose
+    deque is empty steals from the front of the fullest other deque, so
+    nobody sits idle while another worker still has a backlog.  Tasks
+    spawned from outside the workers are dealt out round-robin.
+
+    worker_init/worker_exit run on each worker thread around its tasks
+    (e.g. checking a browser out of a pool); execute(fn, *args) wraps every
+    task call.  spawn_after() holds a task back until a delay has passed
+    (e.g. a retry's back-off) without tying up a worker meanwhile; it
+    counts as pending, so run() waits for it.  A worker whose init fails
+    drops out; run() raises if every worker did while tasks were left.
+    Task errors are logged and counted, never propagated, so one bad page
+    cannot stop the graph.
+
+    With a single worker everything runs on the calling thread.
+    """
+
+    def __init__(self, workers: int = 1, worker_init: Optional[Callable[[], None]] = None,
+                 worker_exit: Optional[Callable[[], None]] = None,
+                 execute: Optional[Callable] = None, name: str = "task-worker"):
+        self.workers = max(1, workers)
+        self.worker_init = worker_init
+        self.worker_exit = worker_exit
+        self.execute = execute or (lambda fn, *args: fn(*args))
+        self.name = name
+        self.logger = logging.getLogger(__name__)
+
+        self._deques: List[Deque[Task]] = [collections.deque() for _ in range(self.workers)]
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._pending = 0
+        self._next = 0
+        self._deferred: List[Tuple[float, int, Task]] = []  # (due, order, task) heap
+        self._order = itertools.count()
+        self.executed = [0] * self.workers
+        self.stolen = 0
+        self.failed = 0
+
+    def spawn(self, fn: Callable, *args, group: Optional['TaskGroup'] = None):
+        """Queue fn(*args); from a worker it goes on that worker's own deque"""
+        if group is not None:
+            group._opened()
+        index = getattr(self._local, 'index', None)
+        with self._cond:
+            if index is None:
+                index = self._next
+                self._next = (self._next + 1) % self.workers
+            self._deques[index].append((fn, args, group))
+            self._pending += 1
+            self._cond.notify_all()
+
+    def spawn_after(self, delay: float, fn: Callable, *args, group: Optional['TaskGroup'] = None):
+        """Queue fn(*args) to run once delay seconds have passed"""
+        if delay <= 0:
+            self.spawn(fn, *args, group=group)
+            return
+        if group is not None:
+            group._opened()
+        with self._cond:
+            heapq.heappush(self._deferred, (time.monotonic() + delay, next(self._order), (fn, args, group)))
+            self._pending += 1
+            self._cond.notify_all()
+
+    def _take(self, index: int) -> Optional[Task]:
+        """Own newest task, else a deferred task now due, else the oldest task of the busiest other worker"""
+        own = self._deques[index]
+        if own:
+            return own.pop()
+        if self._deferred and self._deferred[0][0] <= time.monotonic():
+            return heapq.heappop(self._deferred)[2]
+        victim = max(self._deques, key=len)
+        if victim:
+            self.stolen += 1
+            return victim.popleft()
+        return None
+
+    def _wait_timeout(self) -> Optional[float]:
+        """How long an idle worker may sleep before a deferred task falls due"""
+        if not self._deferred:
+            return None
+        return max(0.0, self._deferred[0][0] - time.monotonic())
+
+    def _worker(self, index: int):
+        self._local.index = index
+        try:
+            if self.worker_init:
+                self.worker_init()
+        except Exception as e:
+            self.logger.error(f"Could not start {self.name} {index}: {str(e)}")
+            self._local.index = None
+            return
+
+        try:
+            while True:
+                with self._cond:
+                    task = self._take(index)
+                    while task is None and self._pending:
+                        self._cond.wait(self._wait_timeout())
+                        task = self._take(index)
+                    if task is None:
+                        return
+
+                fn, args, group = task
+                try:
+                    self.execute(fn, *args)
+                except Exception as e:
+                    self.logger.error(f"Task {getattr(fn, '__name__', fn)}{args[:1]} failed: {str(e)}")
+                    with self._cond:
+                        self.failed += 1
+                finally:
+                    # Before the task stops counting as pending, so whatever
+                    # the group's on_done spawns keeps the workers running
+                    if group is not None:
+                        group._closed()
+                    with self._cond:
+                        self.executed[index] += 1
+                        self._pending -= 1
+                        if not self._pending:
+                            self._cond.notify_all()
+        finally:
+            if self.worker_exit:
+                self.worker_exit()
+            self._local.index = None
+
+    def run(self):
+        """Run until every task, including those spawned meanwhile, is done"""
+        if self.workers == 1:
+            self._worker(0)
+        else:
+            threads = [
+                threading.Thread(target=self._worker, args=(n,), name=f"{self.name}-{n}", daemon=True)
+                for n in range(self.workers)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        if self._pending:
+            raise RuntimeError(f"No {self.name} could be started; {self._pending} tasks left")
+
+    def summary(self) -> dict:
+        with self._cond:
+            return {
+                'workers': self.workers,
+                'executed': list(self.executed),
+                'stolen': self.stolen,
+                'failed': self.failed,
+            }
+
+
+class TaskGroup:
+    """Tasks spawned on a scheduler that call on_done once all have finished
+
+    Tasks spawned through the group from inside a group task (e.g. the
+    subcategory pages a category page links to) belong to it as well, so
+    the group only completes once the whole subtree has run.
+    """
+
+    def __init__(self, scheduler: WorkStealingScheduler, on_done: Optional[Callable[[], None]] = None):
+        self.scheduler = scheduler
+        self.on_done = on_done
+        self._lock = threading.Lock()
+        self._open = 0
+
+    def spawn(self, fn: Callable, *args):
+        self.scheduler.spawn(fn, *args, group=self)
+
+    def spawn_after(self, delay: float, fn: Callable, *args):
+        self.scheduler.spawn_after(delay, fn, *args, group=self)
+
+    def _opened(self):
+        with self._lock:
+            self._open += 1
+
+    def _closed(self):
+        with self._lock:
+            self._open -= 1
+            done = not self._open
+        if done and self.on_done:
+            try:
+                self.on_done()
+            except Exception as e:
+                self.scheduler.logger.error(f"Task group completion failed: {str(e)}")
@@ -0,0 +1,157 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+# OneTrust records an accepted or dismissed banner in this cookie
+CONSENT_COOKIE = 'OptanonAlertBoxClosed'
+TOKEN_PATTERN = re.compile(
+    r'<input[^>]*name="__RequestVerificationToken"[^>]*value="([^"]*)"'
+    r'|<input[^>]*value="([^"]*)"[^>]*name="__RequestVerificationToken"',
+    re.IGNORECASE
+)
+TOKEN_HEADER = 'RequestVerificationToken'
+
+
+def find_token(page: str) -> Optional[str]:
+    """The anti-forgery token of a server-rendered page, if it has one"""
+    match = TOKEN_PATTERN.search(page)
+    return (match.group(1) or match.group(2)) if match else None
+
+
+class SessionBridge:
+    """One site session shared by the browsers and the HTTP client, kept between runs
+
+    The first browser to warm up handles the cookie banner; its cookies,
+    user agent (minus "Headless") and the page's anti-forgery token are
+    captured here and applied to the HTTP client, and every later browser
+    gets the same cookies instead of waiting for the banner again.  Cookies
+    the HTTP client picks up are captured the same way.  The state is saved
+    as JSON at path and reused by later runs for up to max_age seconds;
+    expired cookies are dropped when it is loaded.
+    """
+
+    def __init__(self, path: str, base_url: str, max_age: float = 12 * 3600):
+        self.path = path
+        self.host = urlsplit(base_url).hostname or ''
+        self.max_age = max_age
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self.cookies: Dict[tuple, Dict] = {}
+        self.user_agent: Optional[str] = None
+        self.token: Optional[str] = None
+        self.consent = False
+        self.saved_at: Optional[float] = None
+
+    def _for_site(self, cookie: Dict) -> bool:
+        domain = (cookie.get('domain') or self.host).lstrip('.')
+        return self.host == domain or self.host.endswith('.' + domain)
+
+    def _merge(self, cookies: List[Dict]):
+        for cookie in cookies:
+            if cookie.get('name') and self._for_site(cookie):
+                key = (cookie['name'], cookie.get('domain') or self.host, cookie.get('path') or '/')
+                self.cookies[key] = cookie
+                if cookie['name'] == CONSENT_COOKIE:
+                    self.consent = True
+
+    def load(self) -> bool:
+        """Read a saved session; False when there is none or it is too old"""
+        if self.max_age <= 0 or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable session state {self.path}: {str(e)}")
+            return False
+        now = time.time()
+        if now - saved.get('saved_at', 0) > self.max_age:
+            self.logger.info(f"Saved session from {self.path} has expired")
+            return False
+
+        with self._lock:
+            self._merge([cookie for cookie in saved.get('cookies', []) if cookie.get('expiry', now + 1) > now])
+            self.consent = self.consent or saved.get('consent', False)
+            self.user_agent = saved.get('user_agent')
+            self.token = saved.get('token')
+            self.saved_at = saved['saved_at']
+        return True
+
+    def save(self):
+        """Write the session to path atomically, readable by the owner only"""
+        with self._lock:
+            self.saved_at = time.time()
+            data = {
+                'saved_at': self.saved_at,
+                'user_agent': self.user_agent,
+                'token': self.token,
+                'consent': self.consent,
+                'cookies': list(self.cookies.values()),
+            }
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def capture_browser(self, driver, consent: bool = False):
+        """Take over a warmed-up browser's cookies, user agent and token"""
+        user_agent = driver.execute_script("return navigator.userAgent")
+        token = find_token(driver.page_source or '')
+        with self._lock:
+            self._merge(driver.get_cookies())
+            self.consent = self.consent or consent
+            if user_agent:
+                self.user_agent = user_agent.replace('HeadlessChrome', 'Chrome')
+            self.token = token or self.token
+
+    def apply_to_browser(self, driver) -> int:
+        """Give a browser the session's user agent and cookies; it must be on the site already"""
+        with self._lock:
+            cookies = list(self.cookies.values())
+            user_agent = self.user_agent
+        if user_agent:
+            try:
+                driver.execute_cdp_cmd('Network.setUserAgentOverride', {'userAgent': user_agent})
+            except Exception as e:
+                self.logger.debug(f"Could not set the browser's user agent: {str(e)}")
+        added = 0
+        for cookie in cookies:
+            try:
+                driver.add_cookie({key: value for key, value in cookie.items() if key != 'sameSite'})
+                added += 1
+            except Exception as e:
+                self.logger.debug(f"Could not add cookie {cookie.get('name')}: {str(e)}")
+        return added
+
+    def capture_client(self, client, token: Optional[str] = None):
+        """Take over cookies (and a token) the HTTP client received"""
+        cookies = []
+        for cookie in client.cookies.jar:
+            entry = {'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain,
+                     'path': cookie.path, 'secure': bool(cookie.secure)}
+            if cookie.expires:
+                entry['expiry'] = int(cookie.expires)
+            cookies.append(entry)
+        with self._lock:
+            self._merge(cookies)
+            self.token = token or self.token
+
+    def apply_to_client(self, client):
+        """Give the HTTP client the session's cookies, user agent and token"""
+        with self._lock:
+            cookies = list(self.cookies.values())
+            user_agent, token = self.user_agent, self.token
+        for cookie in cookies:
+            client.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain') or self.host,
+                               path=cookie.get('path') or '/')
+        if user_agent:
+            client.headers['User-Agent'] = user_agent
+        if token:
+            client.headers[TOKEN_HEADER] = token
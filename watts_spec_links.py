@@ -0,0 +1,55 @@
+import re
+from typing import Optional, Union
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from watts_html import parse_html
+
+# Watts serves spec sheets from /dfsmedia/... with either a real ".pdf"
+# extension or a "-pdf" slug suffix (e.g. es-wd-fd-100-a-pdf).
+PDF_HREF_PATTERN = re.compile(r'(?:\.pdf|-pdf)(?:$|[?#])', re.IGNORECASE)
+SPEC_TEXT_PATTERN = re.compile(r'spec', re.IGNORECASE)
+SPEC_SHEET_TEXT_PATTERN = re.compile(r'specification\s+sheet', re.IGNORECASE)
+
+
+def _has_class(tag, name):
+    return name in (tag.get('class') or [])
+
+
+def _is_pdf_href(href):
+    return bool(href and PDF_HREF_PATTERN.search(href))
+
+
+def find_spec_sheet_link(html: Union[str, BeautifulSoup], base_url: str) -> Optional[str]:
+    """Find the spec sheet link in server-rendered product page HTML
+
+    Mirrors the XPath order used by the Selenium path: a download link
+    labelled "Specification Sheet" first, then any PDF download link in the
+    product downloads lists, then any PDF link whose text mentions a spec.
+    Returns an absolute URL, or None when the static HTML has no match.
+    html may also be a tree already parsed by HtmlParser.
+    """
+    soup = html if isinstance(html, BeautifulSoup) else parse_html(html)
+    links = soup.find_all('a', href=True)
+
+    download_links = [a for a in links if _has_class(a, 'product-download__link')]
+
+    for link in download_links:
+        if SPEC_SHEET_TEXT_PATTERN.search(link.get_text(' ', strip=True)):
+            return urljoin(base_url, link['href'])
+
+    for link in download_links:
+        if _is_pdf_href(link['href']):
+            return urljoin(base_url, link['href'])
+
+    for container in soup.find_all(['div', 'ul'], class_='product-downloads'):
+        for link in container.find_all('a', href=True):
+            if _is_pdf_href(link['href']):
+                return urljoin(base_url, link['href'])
+
+    for link in links:
+        if _is_pdf_href(link['href']) and SPEC_TEXT_PATTERN.search(link.get_text(' ', strip=True)):
+            return urljoin(base_url, link['href'])
+
+    return None
@@ -0,0 +1,83 @@
+import importlib.util
+import logging
+from typing import Dict, Optional
+
+import httpx
+
+from watts_rate_limiter import AdaptiveRateLimiter, RateLimitedTransport
+
+# Optional extras (pip install httpx[http2,brotli]); without them the
+# transport speaks HTTP/1.1 and does not advertise Brotli
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+BROTLI_AVAILABLE = any(importlib.util.find_spec(name) is not None for name in ('brotli', 'brotlicffi'))
+ACCEPT_ENCODING = 'gzip, deflate, br' if BROTLI_AVAILABLE else 'gzip, deflate'
+
+
+class HttpTransport:
+    """The one HTTP client configuration behind every request the scraper sends
+
+    client is a thread-safe httpx.Client for page fetches, HEAD checks,
+    listing API calls and inline downloads: keep-alive connections pooled
+    up to max_connections (one per worker thread that uses it), HTTP/2
+    when h2 is installed, gzip/deflate (and Brotli when available)
+    decoding, TLS verification on, and pacing and retries through the
+    shared rate limiter.  async_client() gives the download pipeline an
+    AsyncClient with the same headers, TLS and HTTP/2 settings that shares
+    the client's cookie jar.
+    """
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, max_connections: int = 8,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None, verify=True, http2: bool = True,
+                 timeout: float = 30, keepalive_expiry: float = 30, max_retries: int = 3,
+                 backoff_factor: float = 1):
+        self.logger = logging.getLogger(__name__)
+        self.verify = verify
+        self.timeout = timeout
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2 and HTTP2_AVAILABLE
+        if http2 and not HTTP2_AVAILABLE:
+            self.logger.info("h2 is not installed; using HTTP/1.1")
+
+        self.client = httpx.Client(
+            headers={'Accept-Encoding': ACCEPT_ENCODING, **(headers or {})},
+            timeout=timeout,
+            follow_redirects=True,
+            transport=RateLimitedTransport(
+                rate_limiter,
+                max_retries=max_retries,
+                backoff_factor=backoff_factor,
+                verify=verify,
+                http2=self.http2,
+                limits=self.limits(max_connections)
+            )
+        )
+
+    def limits(self, max_connections: int) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+
+    @property
+    def headers(self) -> httpx.Headers:
+        return self.client.headers
+
+    @property
+    def cookies(self) -> httpx.Cookies:
+        return self.client.cookies
+
+    def async_client(self, max_connections: int, timeout: Optional[float] = None) -> httpx.AsyncClient:
+        """AsyncClient configured like client, sharing its cookie jar"""
+        return httpx.AsyncClient(
+            headers=self.client.headers,
+            cookies=self.client.cookies.jar,
+            verify=self.verify,
+            http2=self.http2,
+            timeout=timeout or self.timeout,
+            follow_redirects=True,
+            limits=self.limits(max_connections)
+        )
+
+    def close(self):
+        self.client.close()